@@ -0,0 +1,82 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import timeit
+
+from duniterpy.documents.crc_pubkey import CRCPubkey
+from duniterpy.key.base58 import Base58Encoder
+
+try:
+    import base58
+except ImportError:
+    base58 = None
+
+# CONFIG #######################################
+
+# Number of public keys, like the member list of the G1 currency
+PUBKEYS_COUNT = 10000
+
+# Number of runs for each benchmark
+RUNS = 5
+
+################################################
+
+
+def bench(label: str, function, count: int) -> None:
+    """
+    Print the mean time of function by item
+
+    :param label: Label of the benchmark
+    :param function: Function processing count items
+    :param count: Number of items processed by function
+    :return:
+    """
+    seconds = timeit.timeit(function, number=RUNS) / RUNS
+    print("{0}: {1:.2f} µs per key".format(label, seconds / count * 1000000))
+
+
+def main():
+    """
+    Main code
+    """
+    keys = [os.urandom(32) for _ in range(PUBKEYS_COUNT)]
+    pubkeys = [Base58Encoder.encode(key) for key in keys]
+    count = len(keys)
+
+    bench("encode", lambda: [Base58Encoder.encode(key) for key in keys], count)
+    bench("decode", lambda: [Base58Encoder.decode(p) for p in pubkeys], count)
+    bench(
+        "decode_pubkey",
+        lambda: [Base58Encoder.decode_pubkey(p) for p in pubkeys],
+        count,
+    )
+    bench("decode_many", lambda: Base58Encoder.decode_many(pubkeys), count)
+    bench("CRC check", lambda: [CRCPubkey.from_pubkey(p) for p in pubkeys], count)
+    if base58 is not None:
+        bench(
+            "base58 package encode", lambda: [base58.b58encode(k) for k in keys], count
+        )
+        bench(
+            "base58 package decode",
+            lambda: [base58.b58decode(p) for p in pubkeys],
+            count,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import timeit
+
+from duniterpy.documents import (
+    Certification,
+    Identity,
+    Membership,
+    MalformedDocumentError,
+    Revocation,
+    Transaction,
+)
+from duniterpy.documents.block import Block
+
+# CONFIG #######################################
+
+# Number of compact transactions in the transaction-heavy block
+TRANSACTIONS_COUNT = 500
+
+# Number of parsing runs for each block
+RUNS = 20
+
+################################################
+
+BLOCK_HEADER = """Version: 11
+Type: Block
+Currency: g1
+Number: 34436
+PoWMin: 5
+Time: 1443896211
+MedianTime: 1443881811
+UnitBase: 0
+Issuer: HnFcSms8jzwngtVomTTnzudZx7SHUQY8sVE1y8yBmULk
+IssuersFrame: 1
+IssuersFrameVar: 0
+DifferentIssuersCount: 0
+PreviousHash: 000002B06C990DEBD5C1D947289C2CF4F4396FB2
+PreviousIssuer: HnFcSms8jzwngtVomTTnzudZx7SHUQY8sVE1y8yBmULk
+MembersCount: 19
+Identities:
+Joiners:
+Actives:
+ATkjQPa4sn4LBF69jqEPzFtRdHYJs6MJQjvP8JdN7MtN:QTowsupV+uXrcomL44WCxbu3LQoJM2C2VPMet5Xg6gXGAHEtGRp47FfQLb2ok1+/588JiIHskCyazj3UOsmKDw==:34434-00000D21F80687248A8C02F16BB19A975B4F983D:34432-00000D21F80687248A8C02F16BB19A975B4F983D:urodelus
+Leavers:
+Revoked:
+Excluded:
+Certifications:
+5ocqzyDMMWf1V8bsoNhWb1iNwax1e9M7VTUN6navs8of:ATkjQPa4sn4LBF69jqEPzFtRdHYJs6MJQjvP8JdN7MtN:0:6TuxRcARnpo13l3cXtgPTkjJlv8DZOUvsAzmZJMbjHZbbZfDQ6MJpH9DIuH0eyG3WGc0EX/046mbMGBrKKg9DQ==
+ATkjQPa4sn4LBF69jqEPzFtRdHYJs6MJQjvP8JdN7MtN:2qwGeLWoPG7db72bKXPfJpAtj67FYDnPaJn2JB7tyXxJ:0:LusTbb7CgwrqqacDKjtldw60swwvDBH8wVUIJN4SWRb2pZPJSpDxgqaGyjC5P9i/DendfyQWc7cfzPDqSZmZAg==
+Transactions:
+"""
+
+COMPACT_TRANSACTION = """TX:10:1:3:3:2:1:0
+33363-000021C4B5BE2DA996F953DC09482F4FA2FA68774B1A38FAB03B2AAB4A08EBE0
+HsLShAtzXTVxeUtQd7yi5Z5Zh4zNvbu8sTEZ53nfKcqY
+5200:0:T:6991C993631BED4733972ED7538E41CCC33660F554E3C51963E2A0AC4D6453D3:0
+500:0:T:3A09A20E9014110FD224889F13357BAB4EC78A72F95CA03394D8CCA2936A7435:10
+20:0:D:HsLShAtzXTVxeUtQd7yi5Z5Zh4zNvbu8sTEZ53nfKcqY:88
+0:SIG(0)
+1:SIG(0)
+2:SIG(0)
+30:2:SIG(BYfWYFrsyjpvpFysgu19rGK3VHBkz4MqmQbNyEuVU64g)
+5690:0:SIG(HsLShAtzXTVxeUtQd7yi5Z5Zh4zNvbu8sTEZ53nfKcqY)
+benchmark
+42yQm4hGTJYWkPg39hQAUgP6S6EQ4vTfXdJuxKEHL1ih6YHiDL2hcwrFgBHjXLRgxRhj2VNVqqc6b4JayKqTE14r
+"""
+
+BLOCK_FOOTER = """InnerHash: DB30D958EE5CB75186972286ED3F4686B8A1C2CD
+Nonce: 581
+nY/MsFU2luiohLmSiOOimL1RIqbriOBgc22ua03Z2dhxtSJxKZeGNGDvl1jaXgmEBRnXU87yXbZ7ioOS/AAVCA==
+"""
+
+
+def build_signed_raw_block(transactions_count: int) -> str:
+    """
+    Return a signed raw block holding transactions_count compact transactions
+
+    :param transactions_count: Number of transactions in the block
+    :return:
+    """
+    return BLOCK_HEADER + COMPACT_TRANSACTION * transactions_count + BLOCK_FOOTER
+
+
+def baseline_from_signed_raw(signed_raw: str) -> Block:
+    """
+    Return a Block instance parsed like Block.from_signed_raw did before the single
+    pass parser, probing each section header in turn and joining the lines of each
+    compact transaction to split them again in Transaction.from_compact
+
+    Kept as the reference of the benchmark.
+
+    :param signed_raw: Signed raw block
+    :return:
+    """
+    lines = signed_raw.splitlines(True)
+    n = 0
+
+    version = int(Block.parse_field("Version", lines[n]))
+    n += 1
+
+    Block.parse_field("Type", lines[n])
+    n += 1
+
+    currency = Block.parse_field("Currency", lines[n])
+    n += 1
+
+    number = int(Block.parse_field("Number", lines[n]))
+    n += 1
+
+    powmin = int(Block.parse_field("PoWMin", lines[n]))
+    n += 1
+
+    time = int(Block.parse_field("Time", lines[n]))
+    n += 1
+
+    mediantime = int(Block.parse_field("MedianTime", lines[n]))
+    n += 1
+
+    ud_match = Block.re_universaldividend.match(lines[n])
+    ud = None
+    unit_base = 0
+    if ud_match is not None:
+        ud = int(Block.parse_field("UD", lines[n]))
+        n += 1
+
+    unit_base = int(Block.parse_field("UnitBase", lines[n]))
+    n += 1
+
+    issuer = Block.parse_field("Issuer", lines[n])
+    n += 1
+
+    issuers_frame = Block.parse_field("IssuersFrame", lines[n])
+    n += 1
+    issuers_frame_var = Block.parse_field("IssuersFrameVar", lines[n])
+    n += 1
+    different_issuers_count = Block.parse_field("DifferentIssuersCount", lines[n])
+    n += 1
+
+    prev_hash = None
+    prev_issuer = None
+    if number > 0:
+        prev_hash = str(Block.parse_field("PreviousHash", lines[n]))
+        n += 1
+
+        prev_issuer = str(Block.parse_field("PreviousIssuer", lines[n]))
+        n += 1
+
+    parameters = None
+    if number == 0:
+        try:
+            params_match = Block.re_parameters.match(lines[n])
+            if params_match is None:
+                raise MalformedDocumentError("Parameters")
+            parameters = params_match.groups()
+            n += 1
+        except AttributeError:
+            raise MalformedDocumentError("Parameters") from AttributeError
+
+    members_count = int(Block.parse_field("MembersCount", lines[n]))
+    n += 1
+
+    identities = []
+    joiners = []
+    actives = []
+    leavers = []
+    revoked = []
+    excluded = []
+    certifications = []
+    transactions = []
+
+    if Block.re_identities.match(lines[n]) is not None:
+        n += 1
+        while Block.re_joiners.match(lines[n]) is None:
+            selfcert = Identity.from_inline(version, currency, lines[n])
+            identities.append(selfcert)
+            n += 1
+
+    if Block.re_joiners.match(lines[n]):
+        n += 1
+        while Block.re_actives.match(lines[n]) is None:
+            membership = Membership.from_inline(version, currency, "IN", lines[n])
+            joiners.append(membership)
+            n += 1
+
+    if Block.re_actives.match(lines[n]):
+        n += 1
+        while Block.re_leavers.match(lines[n]) is None:
+            membership = Membership.from_inline(version, currency, "IN", lines[n])
+            actives.append(membership)
+            n += 1
+
+    if Block.re_leavers.match(lines[n]):
+        n += 1
+        while Block.re_revoked.match(lines[n]) is None:
+            membership = Membership.from_inline(version, currency, "OUT", lines[n])
+            leavers.append(membership)
+            n += 1
+
+    if Block.re_revoked.match(lines[n]):
+        n += 1
+        while Block.re_excluded.match(lines[n]) is None:
+            revokation = Revocation.from_inline(version, currency, lines[n])
+            revoked.append(revokation)
+            n += 1
+
+    if Block.re_excluded.match(lines[n]):
+        n += 1
+        while Block.re_certifications.match(lines[n]) is None:
+            exclusion_match = Block.re_exclusion.match(lines[n])
+            if exclusion_match is not None:
+                exclusion = exclusion_match.group(1)
+                excluded.append(exclusion)
+            n += 1
+
+    if Block.re_certifications.match(lines[n]):
+        n += 1
+        while Block.re_transactions.match(lines[n]) is None:
+            certification = Certification.from_inline(
+                version, currency, prev_hash, lines[n]
+            )
+            certifications.append(certification)
+            n += 1
+
+    if Block.re_transactions.match(lines[n]):
+        n += 1
+        while not Block.re_hash.match(lines[n]):
+            tx_lines = ""
+            header_data = Transaction.re_header.match(lines[n])
+            if header_data is None:
+                raise MalformedDocumentError(
+                    "Compact transaction ({0})".format(lines[n])
+                )
+            issuers_num = int(header_data.group(2))
+            inputs_num = int(header_data.group(3))
+            unlocks_num = int(header_data.group(4))
+            outputs_num = int(header_data.group(5))
+            has_comment = int(header_data.group(6))
+            sup_lines = 2
+            tx_max = (
+                n
+                + sup_lines
+                + issuers_num * 2
+                + inputs_num
+                + unlocks_num
+                + outputs_num
+                + has_comment
+            )
+            for index in range(n, tx_max):
+                tx_lines += lines[index]
+            n += tx_max - n
+            transaction = Transaction.from_compact(currency, tx_lines)
+            transactions.append(transaction)
+
+    inner_hash = Block.parse_field("InnerHash", lines[n])
+    n += 1
+
+    nonce = int(Block.parse_field("Nonce", lines[n]))
+    n += 1
+
+    signature = Block.parse_field("Signature", lines[n])
+
+    return Block(
+        version,
+        currency,
+        number,
+        powmin,
+        time,
+        mediantime,
+        ud,
+        unit_base,
+        issuer,
+        issuers_frame,
+        issuers_frame_var,
+        different_issuers_count,
+        prev_hash,
+        prev_issuer,
+        parameters,
+        members_count,
+        identities,
+        joiners,
+        actives,
+        leavers,
+        revoked,
+        excluded,
+        certifications,
+        transactions,
+        inner_hash,
+        nonce,
+        signature,
+    )
+
+
+def bench(label: str, signed_raw: str, lazy: bool = False) -> None:
+    """
+    Print the mean parsing time of signed_raw with the baseline parser and with
+    Block.from_signed_raw
+
+    :param label: Label of the benchmark
+    :param signed_raw: Signed raw block
+    :param lazy: True to only parse the block header with Block.from_signed_raw
+    :return:
+    """
+    baseline = timeit.timeit(lambda: baseline_from_signed_raw(signed_raw), number=RUNS)
+    seconds = timeit.timeit(
+        lambda: Block.from_signed_raw(signed_raw, lazy), number=RUNS
+    )
+    print(
+        "{0}: baseline {1:.3f} ms, from_signed_raw {2:.3f} ms per block".format(
+            label, baseline / RUNS * 1000, seconds / RUNS * 1000
+        )
+    )
+
+
+def main():
+    """
+    Main code
+    """
+    bench("empty block", build_signed_raw_block(0))
+    bench(
+        "block with {0} transactions".format(TRANSACTIONS_COUNT),
+        build_signed_raw_block(TRANSACTIONS_COUNT),
+    )
+    bench(
+        "header of block with {0} transactions".format(TRANSACTIONS_COUNT),
+        build_signed_raw_block(TRANSACTIONS_COUNT),
+        lazy=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
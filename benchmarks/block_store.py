@@ -0,0 +1,83 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import random
+import tempfile
+import time
+
+from duniterpy.helpers.block_store import BlockStore
+from benchmarks.block_parsing import build_signed_raw_block
+
+# CONFIG #######################################
+
+# Number of blocks written in the store
+BLOCKS_COUNT = 50000
+
+# Number of compact transactions in each block
+TRANSACTIONS_COUNT = 20
+
+# Number of blocks read at random
+READS = 1000
+
+################################################
+
+
+def main():
+    """
+    Main code
+    """
+    signed_raw = build_signed_raw_block(TRANSACTIONS_COUNT)
+    with tempfile.TemporaryDirectory() as path:
+        start = time.perf_counter()
+        with BlockStore(path) as store:
+            block_hash = None
+            for number in range(BLOCKS_COUNT):
+                new_hash = "{0:064X}".format(number)
+                store.append_signed_raw(number, new_hash, block_hash, signed_raw)
+                block_hash = new_hash
+        print(
+            "append {0} blocks of {1} bytes: {2:.2f} s".format(
+                BLOCKS_COUNT, len(signed_raw), time.perf_counter() - start
+            )
+        )
+
+        start = time.perf_counter()
+        store = BlockStore(path, readonly=True)
+        print("open: {0:.3f} ms".format((time.perf_counter() - start) * 1000))
+
+        numbers = [random.randrange(BLOCKS_COUNT) for _ in range(READS)]
+        start = time.perf_counter()
+        for number in numbers:
+            store.signed_raw(number)
+        print(
+            "random signed raw read: {0:.1f} µs per block".format(
+                (time.perf_counter() - start) / READS * 1000000
+            )
+        )
+        start = time.perf_counter()
+        for number in numbers:
+            store.block(number, lazy=True)
+        print(
+            "random lazy block read: {0:.1f} µs per block".format(
+                (time.perf_counter() - start) / READS * 1000000
+            )
+        )
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
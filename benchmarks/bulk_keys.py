@@ -0,0 +1,47 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import time
+
+from duniterpy.key import SigningKey
+
+# CONFIG #######################################
+
+# Number of keys to derive
+KEYS_COUNT = 200
+
+# Numbers of worker processes to compare
+WORKERS = (1, 2, 4)
+
+################################################
+
+
+def main():
+    """
+    Main code
+    """
+    credentials = [("salt{0}".format(i), "password") for i in range(KEYS_COUNT)]
+    for workers in WORKERS:
+        start = time.perf_counter()
+        for _ in SigningKey.bulk_from_credentials(credentials, workers=workers):
+            pass
+        seconds = time.perf_counter() - start
+        print("{0} processes: {1:.0f} keys/s".format(workers, KEYS_COUNT / seconds))
+
+
+if __name__ == "__main__":
+    main()
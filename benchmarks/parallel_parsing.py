@@ -0,0 +1,72 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import time
+
+from benchmarks.block_parsing import build_signed_raw_block
+from duniterpy.helpers.blockchain import (
+    RESULT_BLOCK,
+    RESULT_STRUCT,
+    RESULT_SUMMARY,
+    parse_blocks_parallel,
+)
+
+# CONFIG #######################################
+
+# Number of blocks to parse
+BLOCKS_COUNT = 2000
+
+# Number of compact transactions in each block
+TRANSACTIONS_COUNT = 5
+
+# Number of worker processes
+WORKERS = 4
+
+################################################
+
+
+def bench(label: str, signed_raws: list, workers: int, result: str) -> None:
+    """
+    Print the parsing rate of signed_raws with parse_blocks_parallel
+
+    :param label: Label of the benchmark
+    :param signed_raws: Signed raw blocks
+    :param workers: Number of processes
+    :param result: Result form
+    :return:
+    """
+    start = time.perf_counter()
+    for _ in parse_blocks_parallel(signed_raws, workers, result):
+        pass
+    seconds = time.perf_counter() - start
+    print("{0}: {1:.0f} blocks/s".format(label, len(signed_raws) / seconds))
+
+
+def main():
+    """
+    Main code
+    """
+    signed_raws = [build_signed_raw_block(TRANSACTIONS_COUNT)] * BLOCKS_COUNT
+    bench("1 process, blocks", signed_raws, 1, RESULT_BLOCK)
+    for result in (RESULT_BLOCK, RESULT_SUMMARY, RESULT_STRUCT):
+        bench(
+            "{0} processes, {1}".format(WORKERS, result), signed_raws, WORKERS, result
+        )
+
+
+if __name__ == "__main__":
+    main()
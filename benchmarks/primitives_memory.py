@@ -0,0 +1,79 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import sys
+import tracemalloc
+from typing import Callable, Any
+
+from duniterpy.documents import BlockUID
+from duniterpy.documents.transaction import (
+    InputSource,
+    OutputSource,
+    Unlock,
+    SIGParameter,
+    XHXParameter,
+)
+
+# CONFIG #######################################
+
+# Number of instances created for each class
+INSTANCES_COUNT = 100000
+
+################################################
+
+PUBKEY = "HsLShAtzXTVxeUtQd7yi5Z5Zh4zNvbu8sTEZ53nfKcqY"
+TX_HASH = "6991C993631BED4733972ED7538E41CCC33660F554E3C51963E2A0AC4D6453D3"
+BLOCK_HASH = "000002B06C990DEBD5C1D947289C2CF4F4396FB25E4EA2E2A7CEE23C04FE5C0F"
+
+
+def bench(label: str, factory: Callable[[int], Any]) -> None:
+    """
+    Print the mean memory used by an instance created by factory
+
+    The memory of the instance values, like the strings, is shared between instances
+    and not counted.
+
+    :param label: Label of the benchmark
+    :param factory: Function returning a new instance from an integer
+    :return:
+    """
+    indexes = list(range(INSTANCES_COUNT))
+    tracemalloc.start()
+    instances = [factory(index) for index in indexes]
+    # count the instances only, not the list holding them
+    size = tracemalloc.get_traced_memory()[0] - sys.getsizeof(instances)
+    tracemalloc.stop()
+    print("{0}: {1:.0f} bytes per instance".format(label, size / len(instances)))
+
+
+def main():
+    """
+    Main code
+    """
+    parameters = (SIGParameter(0),)
+    bench("InputSource", lambda index: InputSource(10, 0, "T", TX_HASH, index))
+    bench(
+        "OutputSource", lambda index: OutputSource(index, 0, "SIG({0})".format(PUBKEY))
+    )
+    bench("Unlock", lambda index: Unlock(index, parameters))
+    bench("SIGParameter", SIGParameter)
+    bench("XHXParameter", XHXParameter)
+    bench("BlockUID", lambda index: BlockUID(index, BLOCK_HASH))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import timeit
+
+import jsonschema
+
+from duniterpy.api.bma.blockchain import BLOCKS_SCHEMA
+from duniterpy.api.client import validate, VALIDATION_SAMPLE_SIZE
+
+# CONFIG #######################################
+
+# Number of blocks in the blockchain/blocks response
+BLOCKS_COUNT = 5000
+
+# Number of validation runs
+RUNS = 3
+
+################################################
+
+BLOCK = {
+    "version": 11,
+    "nonce": 10300000043648,
+    "number": 34436,
+    "powMin": 5,
+    "time": 1443896211,
+    "medianTime": 1443881811,
+    "membersCount": 19,
+    "monetaryMass": 1000000,
+    "unitbase": 0,
+    "issuersCount": 3,
+    "issuersFrame": 16,
+    "issuersFrameVar": 0,
+    "currency": "g1",
+    "issuer": "HnFcSms8jzwngtVomTTnzudZx7SHUQY8sVE1y8yBmULk",
+    "signature": "nY/MsFU2luiohLmSiOOimL1RIqbriOBgc22ua03Z2dhxtSJxKZeGNGDvl1jaXgmEBRnXU87yXbZ7ioOS/AAVCA==",
+    "hash": "000002B06C990DEBD5C1D947289C2CF4F4396FB2",
+    "parameters": "",
+    "previousHash": "000002B06C990DEBD5C1D947289C2CF4F4396FB2",
+    "previousIssuer": "HnFcSms8jzwngtVomTTnzudZx7SHUQY8sVE1y8yBmULk",
+    "inner_hash": "DB30D958EE5CB75186972286ED3F4686B8A1C2CD",
+    "dividend": None,
+    "identities": [],
+    "joiners": [],
+    "actives": [],
+    "leavers": [],
+    "revoked": [],
+    "excluded": [],
+    "certifications": [],
+    "transactions": [],
+}
+
+
+def bench(label: str, function) -> None:
+    """
+    Print the mean time of a validation function
+
+    :param label: Label of the benchmark
+    :param function: Function validating the response
+    :return:
+    """
+    seconds = timeit.timeit(function, number=RUNS)
+    print("{0}: {1:.1f} ms per response".format(label, seconds / RUNS * 1000))
+
+
+def main():
+    """
+    Main code
+    """
+    blocks = [dict(BLOCK, number=number) for number in range(BLOCKS_COUNT)]
+    bench("jsonschema.validate", lambda: jsonschema.validate(blocks, BLOCKS_SCHEMA))
+    bench("cached validator", lambda: validate(blocks, BLOCKS_SCHEMA))
+    bench(
+        "cached validator, {0} items sample".format(VALIDATION_SAMPLE_SIZE),
+        lambda: validate(blocks, BLOCKS_SCHEMA, VALIDATION_SAMPLE_SIZE),
+    )
+
+
+if __name__ == "__main__":
+    main()
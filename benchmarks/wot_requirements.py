@@ -0,0 +1,74 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import random
+import time
+
+from duniterpy.helpers.wot_graph import WotGraph
+
+# CONFIG #######################################
+
+# Number of members of the web of trust
+MEMBERS_COUNT = 5000
+
+# Number of certifications issued by each member
+CERTIFICATIONS_COUNT = 15
+
+# Number of pending identities checked, with their pending certifications
+PENDING_COUNT = 1000
+PENDING_CERTIFICATIONS_COUNT = 5
+
+################################################
+
+
+def main():
+    """
+    Main code
+    """
+    random.seed(0)
+    pubkeys = ["member{0}".format(index) for index in range(MEMBERS_COUNT)]
+    graph = WotGraph()
+    for pubkey in pubkeys:
+        graph.members[graph.node(pubkey)] = True
+    for pubkey in pubkeys:
+        for receiver in random.sample(pubkeys, CERTIFICATIONS_COUNT):
+            if receiver != pubkey:
+                graph.certify(pubkey, receiver, 0)
+    pending = {
+        "pending{0}".format(index): random.sample(pubkeys, PENDING_CERTIFICATIONS_COUNT)
+        for index in range(PENDING_COUNT)
+    }
+
+    start = time.perf_counter()
+    sentries_count = len(graph.sentries())
+    graph.reach(graph.step_max - 1)
+    print(
+        "{0} sentries reach bitsets: {1:.1f} ms".format(
+            sentries_count, (time.perf_counter() - start) * 1000
+        )
+    )
+    start = time.perf_counter()
+    graph.requirements(pending)
+    print(
+        "requirements of {0} pending identities: {1:.1f} ms".format(
+            PENDING_COUNT, (time.perf_counter() - start) * 1000
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
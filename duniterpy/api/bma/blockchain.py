@@ -16,7 +16,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import logging
-from typing import Union
+from typing import Union, AsyncIterator
 
 from aiohttp import ClientResponse
 
@@ -310,6 +310,21 @@ async def blocks(client: Client, count: int, start: int) -> list:
     )
 
 
+def iter_blocks(client: Client, count: int, start: int) -> AsyncIterator[dict]:
+    """
+    Iterate on blocks from the blockchain, decoded while the response is downloaded
+
+    :param client: Client to connect to the api
+    :param count: Number of blocks
+    :param start: First block number
+    :return:
+    """
+    assert type(count) is int
+    assert type(start) is int
+
+    return client.stream(MODULE + "/blocks/%d/%d" % (count, start), schema=BLOCK_SCHEMA)
+
+
 async def hardship(client: Client, pubkey: str) -> dict:
     """
     GET hardship level for given member's public key for writing next block
@@ -16,6 +16,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import logging
+from typing import AsyncIterator
 
 from aiohttp import ClientResponse
 
@@ -136,6 +137,33 @@ async def history(client: Client, pubkey: str) -> dict:
     return await client.get(MODULE + "/history/%s" % pubkey, schema=HISTORY_SCHEMA)
 
 
+def iter_history(
+    client: Client, pubkey: str, section: str = "sent"
+) -> AsyncIterator[dict]:
+    """
+    Iterate on the transactions of a section of the history of public key, decoded
+    while the response is downloaded
+
+    Usage:
+
+        async for tx in client(bma.tx.iter_history, pubkey, "received"):
+            print(tx["hash"])
+
+    :param client: Client to connect to the api
+    :param pubkey: Public key
+    :param section: "sent", "received", "sending", "receiving" or "pending"
+    :return:
+    """
+    definition = (
+        "transaction_data" if section in ("sent", "received") else "transactioning_data"
+    )
+    return client.stream(
+        MODULE + "/history/%s" % pubkey,
+        ("history", section),
+        schema=HISTORY_SCHEMA["definitions"][definition]["items"],  # type: ignore
+    )
+
+
 async def process(client: Client, transaction_signed_raw: str) -> ClientResponse:
     """
     POST a transaction raw document
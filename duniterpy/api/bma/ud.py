@@ -16,6 +16,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import logging
+from typing import AsyncIterator
 
 from duniterpy.api.client import Client
 
@@ -60,3 +61,21 @@ async def history(client: Client, pubkey: str) -> dict:
     :return:
     """
     return await client.get(MODULE + "/history/%s" % pubkey, schema=UD_SCHEMA)
+
+
+def iter_history(client: Client, pubkey: str) -> AsyncIterator[dict]:
+    """
+    Iterate on the UD history of a member account, decoded while the response is
+    downloaded
+
+    :param client: Client to connect to the api
+    :param pubkey:  Public key of the member
+    :return:
+    """
+    return client.stream(
+        MODULE + "/history/%s" % pubkey,
+        ("history", "history"),
+        schema=UD_SCHEMA["properties"]["history"]["properties"]["history"][  # type: ignore
+            "items"
+        ],
+    )
@@ -16,6 +16,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import logging
+from typing import AsyncIterator
 
 from aiohttp import ClientResponse
 
@@ -318,6 +319,21 @@ async def members(client: Client) -> dict:
     return await client.get(MODULE + "/members", schema=MEMBERS_SCHEMA)
 
 
+def iter_members(client: Client) -> AsyncIterator[dict]:
+    """
+    Iterate on the current members of the Web of Trust, decoded while the response is
+    downloaded
+
+    :param client: Client to connect to the api
+    :return:
+    """
+    return client.stream(
+        MODULE + "/members",
+        ("results",),
+        schema=MEMBERS_SCHEMA["properties"]["results"]["items"],  # type: ignore
+    )
+
+
 async def requirements(client: Client, search: str) -> dict:
     """
     GET list of requirements for a given UID/Public key
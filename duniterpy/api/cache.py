@@ -0,0 +1,326 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple, Sequence, Pattern, Dict
+from urllib.parse import urlencode
+
+# Cache lifetimes in seconds
+NO_CACHE = 0.0
+FOREVER = math.inf
+SHORT_TTL = 10.0
+
+# Number of blocks under which the blockchain can not fork anymore
+FORK_DEPTH = 100
+
+MEMORY_CACHE_SIZE = 4096
+
+# Lifetimes of the responses by path. The responses of the paths with a "block"
+# group are kept forever once the block is FORK_DEPTH blocks deep, "count" being
+# the number of blocks following "block" also returned. Other paths are not cached.
+CACHE_RULES = (
+    (re.compile(r"blockchain/parameters$"), FOREVER),
+    (re.compile(r"blockchain/block/(?P<block>\d+)$"), SHORT_TTL),
+    (re.compile(r"blockchain/blocks/(?P<count>\d+)/(?P<block>\d+)$"), SHORT_TTL),
+    (re.compile(r"tx/history/[^/]+/blocks/\d+/(?P<block>\d+)$"), SHORT_TTL),
+    (re.compile(r"blockchain/current$"), SHORT_TTL),
+    (re.compile(r"tx/sources/[^/]+$"), SHORT_TTL),
+    (re.compile(r"ud/history/[^/]+$"), SHORT_TTL),
+)  # type: Sequence[Tuple[Pattern, float]]
+
+CURRENT_PATH_PATTERN = re.compile(r"blockchain/(current|block/\d+)$")
+
+
+class MemoryBackend:
+    """
+    Least recently used entries kept in memory
+
+    The data are kept json encoded and decoded on each hit, so each hit returns a new
+    object that the caller can modify.
+    """
+
+    def __init__(self, maxsize: int = MEMORY_CACHE_SIZE) -> None:
+        """
+        Init an empty MemoryBackend instance
+
+        :param maxsize: Maximum number of entries
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # type: OrderedDict
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        """
+        Return the expiration time and the data of key, None if missing
+
+        :param key: Cache key
+        :return:
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0], json.loads(entry[1])
+
+    def set(self, key: str, expires: float, data: Any) -> None:
+        """
+        Store data under key until expires
+
+        :param key: Cache key
+        :param expires: Expiration timestamp
+        :param data: Decoded json data
+        :return:
+        """
+        self._entries[key] = (expires, json.dumps(data))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """
+        Remove the entry of key
+
+        :param key: Cache key
+        :return:
+        """
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskBackend:
+    """
+    Entries stored as json files in a directory, shared between processes
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Init DiskBackend instance, creating the directory if needed
+
+        :param path: Directory of the cache files
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _filename(self, key: str) -> str:
+        return os.path.join(
+            self.path, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json"
+        )
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        """
+        Return the expiration time and the data of key, None if missing
+
+        :param key: Cache key
+        :return:
+        """
+        try:
+            with open(self._filename(key), "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key:
+            return None
+        expires = FOREVER if entry["expires"] is None else entry["expires"]
+        return expires, entry["data"]
+
+    def set(self, key: str, expires: float, data: Any) -> None:
+        """
+        Store data under key until expires
+
+        :param key: Cache key
+        :param expires: Expiration timestamp
+        :param data: Decoded json data
+        :return:
+        """
+        filename = self._filename(key)
+        entry = {
+            "key": key,
+            "expires": None if expires == FOREVER else expires,
+            "data": data,
+        }
+        # write then rename, so readers never see a partial file
+        tmp_filename = "{0}.{1}.tmp".format(filename, os.getpid())
+        with open(tmp_filename, "w", encoding="utf-8") as file:
+            json.dump(entry, file)
+        os.replace(tmp_filename, filename)
+
+    def delete(self, key: str) -> None:
+        """
+        Remove the entry of key
+
+        :param key: Cache key
+        :return:
+        """
+        try:
+            os.remove(self._filename(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        for filename in os.listdir(self.path):
+            if filename.endswith(".json"):
+                os.remove(os.path.join(self.path, filename))
+
+    def __len__(self) -> int:
+        return sum(
+            1 for filename in os.listdir(self.path) if filename.endswith(".json")
+        )
+
+
+class ResponseCache:
+    """
+    Cache of the decoded json responses of the GET requests, by namespace, path and
+    parameters
+
+    The namespace isolates the responses of each node: clients sharing a cache use
+    their endpoint and proxy as namespace, so a node never gets the answers of
+    another node.
+
+    The lifetime of a response is given by the first rule matching its path. The
+    current block number of each namespace, needed to know if a block is deep enough
+    to be kept forever, is updated by the blockchain/current and blockchain/block
+    responses going through the cache.
+
+    Usage:
+
+        client = Client(endpoint, cache=ResponseCache(DiskBackend("/tmp/bma")))
+    """
+
+    def __init__(
+        self,
+        backend: Any = None,
+        rules: Sequence[Tuple[Pattern, float]] = CACHE_RULES,
+        fork_depth: int = FORK_DEPTH,
+    ) -> None:
+        """
+        Init ResponseCache instance
+
+        :param backend: Backend storing the entries, with get, set, delete and clear
+        methods (optional, default MemoryBackend())
+        :param rules: Sequence of (path regular expression, lifetime in seconds)
+        :param fork_depth: Number of blocks after which a block can not change
+        """
+        self.backend = MemoryBackend() if backend is None else backend
+        self.rules = rules
+        self.fork_depth = fork_depth
+        # current block number by namespace
+        self.current_numbers = {}  # type: Dict[str, int]
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(path: str, params: Optional[dict] = None, namespace: str = "") -> str:
+        """
+        Return the cache key of the request
+
+        :param path: Url path
+        :param params: Url query string parameters dictionary
+        :param namespace: Namespace of the node answering the request
+        :return:
+        """
+        key = namespace + " " + path.lstrip("/") if namespace else path.lstrip("/")
+        if not params:
+            return key
+        return key + "?" + urlencode(sorted(params.items()))
+
+    def ttl(self, path: str, namespace: str = "") -> float:
+        """
+        Return the lifetime in seconds of the response of path
+
+        :param path: Url path
+        :param namespace: Namespace of the node answering the request
+        :return:
+        """
+        path = path.lstrip("/")
+        current_number = self.current_numbers.get(namespace)
+        for pattern, ttl in self.rules:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            groups = match.groupdict()  # type: Dict[str, str]
+            if "block" in groups and current_number is not None:
+                last_block = int(groups["block"]) + int(groups.get("count", 1)) - 1
+                if last_block + self.fork_depth <= current_number:
+                    return FOREVER
+            return ttl
+        return NO_CACHE
+
+    def get(
+        self, path: str, params: Optional[dict] = None, namespace: str = ""
+    ) -> Optional[Any]:
+        """
+        Return the cached response of the request, None if missing or expired
+
+        :param path: Url path
+        :param params: Url query string parameters dictionary
+        :param namespace: Namespace of the node answering the request
+        :return:
+        """
+        key = self.key(path, params, namespace)
+        entry = self.backend.get(key)
+        if entry is not None:
+            if entry[0] > time.time():
+                self.hits += 1
+                return entry[1]
+            self.backend.delete(key)
+        self.misses += 1
+        return None
+
+    def set(
+        self, path: str, params: Optional[dict], data: Any, namespace: str = ""
+    ) -> None:
+        """
+        Store the response of the request, if its path is cached
+
+        :param path: Url path
+        :param params: Url query string parameters dictionary
+        :param data: Decoded json response
+        :param namespace: Namespace of the node answering the request
+        :return:
+        """
+        if CURRENT_PATH_PATTERN.search(path) and isinstance(data, dict):
+            number = data.get("number")
+            current_number = self.current_numbers.get(namespace)
+            if isinstance(number, int) and (
+                current_number is None or number > current_number
+            ):
+                self.current_numbers[namespace] = number
+
+        ttl = self.ttl(path, namespace)
+        if ttl > 0:
+            self.backend.set(self.key(path, params, namespace), time.time() + ttl, data)
+
+    def clear(self) -> None:
+        """
+        Remove all the entries and reset the statistics
+
+        :return:
+        """
+        self.backend.clear()
+        self.current_numbers.clear()
+        self.hits = 0
+        self.misses = 0
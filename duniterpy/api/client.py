@@ -15,15 +15,49 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import asyncio
+import codecs
 import json
 import logging
-from typing import Callable, Union, Any, Optional
+import math
+import random
+import re
+from collections import deque
+from typing import (
+    Callable,
+    Union,
+    Any,
+    Optional,
+    Dict,
+    Tuple,
+    AsyncIterator,
+    Sequence,
+    Deque,
+    List,
+)
 
 import jsonschema
-from aiohttp import ClientResponse, ClientSession, ClientWebSocketResponse
+from aiohttp import (
+    ClientConnectionError,
+    ClientError,
+    ClientResponse,
+    ClientSession,
+    ClientTimeout,
+    ClientWebSocketResponse,
+    TCPConnector,
+)
 from aiohttp.client import _WSRequestContextManager
 import duniterpy.api.endpoint as endpoint
-from .errors import DuniterError
+from .cache import ResponseCache
+from .errors import DuniterError, HTTP_LIMITATION
+
+try:
+    # faster json decoder, if installed
+    import orjson
+
+    json_loads = orjson.loads  # type: Callable[[Union[str, bytes]], Any]
+except ImportError:
+    json_loads = json.loads
 
 logger = logging.getLogger("duniter")
 
@@ -35,6 +69,33 @@ RESPONSE_AIOHTTP = "aiohttp"
 # Connection type constants
 CONNECTION_TYPE_AIOHTTP = 1
 
+# ClientPool connector settings
+POOL_CONNECTIONS_LIMIT = 100
+POOL_CONNECTIONS_LIMIT_PER_HOST = 4
+POOL_DNS_CACHE_TTL = 300
+POOL_KEEPALIVE_TIMEOUT = 30
+
+# RequestPolicy defaults
+REQUEST_TOTAL_TIMEOUT = 15
+REQUEST_RETRIES = 2
+REQUEST_BACKOFF_BASE = 0.1
+REQUEST_BACKOFF_MAX = 5.0
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RECOVERY_TIMEOUT = 30.0
+
+# MultiClient strategies
+STRATEGY_FIRST = "first"
+STRATEGY_HEDGED = "hedged"
+STRATEGY_QUORUM = "quorum"
+
+# MultiClient node statistics settings
+LATENCY_SAMPLES = 100
+HEDGE_PERCENTILE = 95
+HEDGE_DELAY = 1.0
+
+# Number of items of each array validated for trusted nodes
+VALIDATION_SAMPLE_SIZE = 10
+
 # jsonschema validator
 ERROR_SCHEMA = {
     "type": "object",
@@ -43,6 +104,66 @@ ERROR_SCHEMA = {
 }
 
 
+# validators of the schemas, by schema id, with the schema to keep its id in use
+_validators = {}  # type: Dict[int, Tuple[dict, Any]]
+
+
+def get_validator(schema: dict) -> Any:
+    """
+    Return the jsonschema validator of schema, checked and created on first call
+
+    :param schema: Json schema
+    :return:
+    """
+    entry = _validators.get(id(schema))
+    if entry is None or entry[0] is not schema:
+        validator_class = jsonschema.validators.validator_for(schema)
+        validator_class.check_schema(schema)
+        entry = (schema, validator_class(schema))
+        _validators[id(schema)] = entry
+    return entry[1]
+
+
+def sample(data: Any, sample_size: int) -> Any:
+    """
+    Return a copy of data where the arrays longer than sample_size are reduced to
+    sample_size items spread along the array, including the first and the last ones
+
+    Only the containers are copied, the other values are shared with data.
+
+    :param data: Decoded json data
+    :param sample_size: Maximum number of items kept in each array
+    :return:
+    """
+    if isinstance(data, list):
+        if len(data) > sample_size > 1:
+            step = (len(data) - 1) / (sample_size - 1)
+            data = [data[round(index * step)] for index in range(sample_size)]
+        elif len(data) > sample_size:
+            data = data[:sample_size]
+        return [sample(item, sample_size) for item in data]
+    if isinstance(data, dict):
+        return {key: sample(value, sample_size) for key, value in data.items()}
+    return data
+
+
+def validate(data: Any, schema: dict, sample_size: Optional[int] = None) -> None:
+    """
+    Validate data with the cached validator of schema
+
+    Raise jsonschema.ValidationError if data is not valid.
+
+    :param data: Decoded json data
+    :param schema: Json schema
+    :param sample_size: Number of items of each array to validate, None for all.
+    Constraints on the array lengths may fail when sampling.
+    :return:
+    """
+    if sample_size is not None:
+        data = sample(data, sample_size)
+    get_validator(schema).validate(data)
+
+
 def parse_text(text: str, schema: dict) -> Any:
     """
     Validate and parse the BMA answer from websocket
@@ -52,9 +173,9 @@ def parse_text(text: str, schema: dict) -> Any:
     :return: the json data
     """
     try:
-        data = json.loads(text)
-        jsonschema.validate(data, schema)
-    except (TypeError, json.decoder.JSONDecodeError) as e:
+        data = json_loads(text)
+        validate(data, schema)
+    except (TypeError, ValueError) as e:
         raise jsonschema.ValidationError("Could not parse json") from e
 
     return data
@@ -68,9 +189,9 @@ def parse_error(text: str) -> Any:
     :return: the json data
     """
     try:
-        data = json.loads(text)
-        jsonschema.validate(data, ERROR_SCHEMA)
-    except (TypeError, json.decoder.JSONDecodeError) as e:
+        data = json_loads(text)
+        validate(data, ERROR_SCHEMA)
+    except (TypeError, ValueError) as e:
         raise jsonschema.ValidationError(
             "Could not parse json : {0}".format(str(e))
         ) from e
@@ -78,24 +199,239 @@ def parse_error(text: str) -> Any:
     return data
 
 
-async def parse_response(response: ClientResponse, schema: dict) -> Any:
+async def parse_response(
+    response: ClientResponse, schema: Optional[dict], sample_size: Optional[int] = None
+) -> Any:
     """
     Validate and parse the BMA answer
 
+    The body is decoded once with json_loads, and the decoded data is validated.
+
     :param response: Response of aiohttp request
-    :param schema: The expected response structure
+    :param schema: The expected response structure, None to skip the validation
+    :param sample_size: Number of items of each array to validate, None for all
     :return: the json data
     """
+    body = await response.read()
     try:
-        data = await response.json()
-        response.close()
-        if schema is not None:
-            jsonschema.validate(data, schema)
-        return data
-    except (TypeError, json.decoder.JSONDecodeError) as e:
+        data = json_loads(body)
+    except (TypeError, ValueError) as e:
         raise jsonschema.ValidationError(
             "Could not parse json : {0}".format(str(e))
         ) from e
+    if schema is not None:
+        validate(data, schema, sample_size)
+    return data
+
+
+async def read_response(
+    response: ClientResponse,
+    rtype: str,
+    schema: Optional[dict],
+    sample_size: Optional[int] = None,
+) -> Any:
+    """
+    Return the response content in the rtype format, validated if schema is not None
+
+    :param response: Response of aiohttp request
+    :param rtype: Response type
+    :param schema: The expected json response structure (optional)
+    :param sample_size: Number of items of each array to validate, None for all
+    :return:
+    """
+    if rtype == RESPONSE_JSON:
+        return await parse_response(response, schema, sample_size)
+
+    if schema is not None:
+        # the body is kept by aiohttp, so the response is still readable
+        await parse_response(response, schema, sample_size)
+    if rtype == RESPONSE_TEXT:
+        return await response.text()
+    return response
+
+
+class JSONStream:
+    """
+    Incremental json reader on an async iterator of utf-8 bytes chunks
+
+    Only the text not consumed yet is kept in memory.
+    """
+
+    re_whitespace = re.compile("[ \t\n\r]*")
+    re_structural = re.compile('["\\[\\]{}]')
+    re_string_end = re.compile('[^"\\\\]*(?:\\\\.[^"\\\\]*)*"', re.DOTALL)
+
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        """
+        Init JSONStream instance
+
+        :param chunks: Async iterator of the document bytes chunks
+        """
+        self.chunks = chunks.__aiter__()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json_decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    async def read(self) -> bool:
+        """
+        Append the next chunk to the buffer, dropping the consumed text
+
+        :return: False at the end of the document
+        """
+        if self.eof:
+            return False
+        try:
+            chunk = await self.chunks.__anext__()
+        except StopAsyncIteration:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + self.text_decoder.decode(chunk)
+        self.pos = 0
+        return True
+
+    async def peek(self) -> str:
+        """
+        Skip the whitespaces and return the next character, without consuming it
+
+        :return:
+        """
+        while True:
+            self.pos = self.re_whitespace.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not await self.read():
+                raise ValueError("Unexpected end of json document")
+
+    async def expect(self, char: str) -> None:
+        """
+        Consume the next character, which must be char
+
+        :param char: Expected character
+        :return:
+        """
+        if await self.peek() != char:
+            raise ValueError(
+                "Expecting '{0}' at {1}".format(
+                    char, self.buffer[self.pos : self.pos + 20]
+                )
+            )
+        self.pos += 1
+
+    async def decode(self) -> Any:
+        """
+        Consume and return the next json value
+
+        :return:
+        """
+        await self.peek()
+        while True:
+            try:
+                value, end = self.json_decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not await self.read():
+                    raise
+                continue
+            # a number, like "1" of "1.5e3", may continue in the next chunk
+            if (
+                end == len(self.buffer)
+                or (
+                    isinstance(value, (int, float))
+                    and self.buffer[end] not in " \t\n\r,]}"
+                )
+            ) and await self.read():
+                continue
+            self.pos = end
+            return value
+
+    async def skip(self) -> None:
+        """
+        Consume the next json value without decoding it
+
+        :return:
+        """
+        if await self.peek() not in "[{":
+            await self.decode()
+            return
+
+        depth = 0
+        while True:
+            match = self.re_structural.search(self.buffer, self.pos)
+            if match is None:
+                self.pos = len(self.buffer)
+            elif match.group() == '"':
+                string_end = self.re_string_end.match(self.buffer, match.end())
+                if string_end is not None:
+                    self.pos = string_end.end()
+                    continue
+                self.pos = match.start()
+            else:
+                self.pos = match.end()
+                depth += 1 if match.group() in "[{" else -1
+                if depth == 0:
+                    return
+                continue
+            if not await self.read():
+                raise ValueError("Unexpected end of json document")
+
+    async def find(self, json_path: Sequence[str]) -> None:
+        """
+        Consume the document until the value at json_path
+
+        :param json_path: Keys of the nested objects holding the value
+        :return:
+        """
+        for key in json_path:
+            await self.expect("{")
+            while True:
+                if await self.peek() == "}":
+                    raise ValueError("Key {0} not found".format(key))
+                name = await self.decode()
+                await self.expect(":")
+                if name == key:
+                    break
+                await self.skip()
+                if await self.peek() == ",":
+                    self.pos += 1
+
+    async def items(self) -> AsyncIterator[Any]:
+        """
+        Consume the next json array, yielding its items one by one
+
+        :return:
+        """
+        await self.expect("[")
+        if await self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield await self.decode()
+            char = await self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError("Expecting ',' or ']' in json array")
+
+
+async def iter_json_array(
+    chunks: AsyncIterator[bytes], json_path: Sequence[str] = ()
+) -> AsyncIterator[Any]:
+    """
+    Yield the items of the json array at json_path in a document read by chunks
+
+    Raise ValueError if the document is not valid json or json_path is not found.
+
+    :param chunks: Async iterator of the document bytes chunks
+    :param json_path: Keys of the nested objects holding the array, empty for a
+    top level array
+    :return:
+    """
+    stream = JSONStream(chunks)
+    await stream.find(json_path)
+    async for item in stream.items():
+        yield item
 
 
 class WSConnection:
@@ -192,6 +528,221 @@ class WSConnection:
         await self.connection.close()
 
 
+class CircuitOpenError(ClientConnectionError):
+    """
+    Raised instead of requesting a node whose circuit breaker is open
+    """
+
+
+class CircuitBreaker:
+    """
+    Stop requesting a node after consecutive failures
+
+    The circuit opens after failure_threshold consecutive failures, then requests
+    fail at once with CircuitOpenError. After recovery_timeout seconds, a single
+    trial request is let through: its success closes the circuit, its failure opens
+    it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        recovery_timeout: float = CIRCUIT_RECOVERY_TIMEOUT,
+    ) -> None:
+        """
+        Init a closed CircuitBreaker instance
+
+        :param failure_threshold: Number of consecutive failures opening the circuit
+        :param recovery_timeout: Seconds before a trial request on an open circuit
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.opened_at = None  # type: Optional[float]
+        self.trial = False
+
+    @property
+    def closed(self) -> bool:
+        return self.opened_at is None
+
+    def check(self) -> None:
+        """
+        Raise CircuitOpenError if the circuit does not let a request through
+
+        :return:
+        """
+        if self.opened_at is None:
+            return
+        now = asyncio.get_event_loop().time()
+        if self.trial or now - self.opened_at < self.recovery_timeout:
+            raise CircuitOpenError(
+                "Circuit open after {0} failures".format(self.failures)
+            )
+        self.trial = True
+
+    def success(self) -> None:
+        """
+        Record a successful request and close the circuit
+
+        :return:
+        """
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    def failure(self) -> None:
+        """
+        Record a failed request, open the circuit at failure_threshold
+
+        :return:
+        """
+        self.failures += 1
+        if self.trial or self.failures >= self.failure_threshold:
+            self.opened_at = asyncio.get_event_loop().time()
+        self.trial = False
+
+
+class RequestPolicy:
+    """
+    Timeouts, retries and circuit breakers of the requests of the API instances
+
+    GET requests failing on a connection error, a timeout or a Duniter error whose
+    ucode is in retry_ucodes are retried after a jittered exponential backoff.
+    POST requests are only retried if retry_post is True.
+
+    Each node has its own circuit breaker, shared by the clients using the policy.
+
+    Usage:
+
+        policy = RequestPolicy(total_timeout=5, connect_timeout=1, retries=3)
+        client = Client(endpoint, policy=policy)
+    """
+
+    def __init__(
+        self,
+        total_timeout: Optional[float] = REQUEST_TOTAL_TIMEOUT,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        retries: int = REQUEST_RETRIES,
+        backoff_base: float = REQUEST_BACKOFF_BASE,
+        backoff_max: float = REQUEST_BACKOFF_MAX,
+        retry_ucodes: Sequence[int] = (HTTP_LIMITATION,),
+        retry_post: bool = False,
+        failure_threshold: Optional[int] = CIRCUIT_FAILURE_THRESHOLD,
+        recovery_timeout: float = CIRCUIT_RECOVERY_TIMEOUT,
+    ) -> None:
+        """
+        Init RequestPolicy instance
+
+        :param total_timeout: Seconds allowed to each request attempt, None for no
+        limit
+        :param connect_timeout: Seconds allowed to get a connection, None for no limit
+        :param read_timeout: Seconds allowed between two reads of the response, None
+        for no limit
+        :param retries: Number of retries after the first attempt
+        :param backoff_base: Maximum delay in seconds before the first retry, doubled
+        at each retry
+        :param backoff_max: Maximum delay in seconds before a retry
+        :param retry_ucodes: Duniter error codes retried
+        :param retry_post: True to retry the POST requests
+        :param failure_threshold: Consecutive failures opening the circuit of a node,
+        None to disable the circuit breakers
+        :param recovery_timeout: Seconds before a trial request on an open circuit
+        """
+        self.timeout = ClientTimeout(
+            total=total_timeout, connect=connect_timeout, sock_read=read_timeout
+        )
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_ucodes = frozenset(retry_ucodes)
+        self.retry_post = retry_post
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.breakers = {}  # type: Dict[str, CircuitBreaker]
+
+    def breaker(self, node: str) -> Optional[CircuitBreaker]:
+        """
+        Return the circuit breaker of the node, None if they are disabled
+
+        :param node: Node address
+        :return:
+        """
+        if self.failure_threshold is None:
+            return None
+        breaker = self.breakers.get(node)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+            self.breakers[node] = breaker
+        return breaker
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Return the delay in seconds before the retry following attempt, with full
+        jitter to spread the retries of concurrent requests
+
+        :param attempt: Number of the failed attempt, from 0
+        :return:
+        """
+        return random.uniform(
+            0, min(self.backoff_max, self.backoff_base * 2**attempt)
+        )
+
+    async def call(
+        self,
+        node: str,
+        request: Callable[[], Any],
+        idempotent: bool = True,
+    ) -> Any:
+        """
+        Await request() with the retries and the circuit breaker of the node
+
+        :param node: Node address
+        :param request: Function returning the request coroutine
+        :param idempotent: False if the request must not be retried
+        :return:
+        """
+        breaker = self.breaker(node)
+        retries = self.retries if idempotent or self.retry_post else 0
+        attempt = 0
+        while True:
+            if breaker is not None:
+                breaker.check()
+            try:
+                result = await request()
+            except DuniterError as e:
+                # the node answered
+                if breaker is not None:
+                    breaker.success()
+                if e.ucode not in self.retry_ucodes or attempt >= retries:
+                    raise
+            except (ClientError, asyncio.TimeoutError):
+                if breaker is not None:
+                    breaker.failure()
+                if attempt >= retries:
+                    raise
+            except ValueError:
+                # unexpected response, not retried
+                if breaker is not None:
+                    breaker.failure()
+                raise
+            except asyncio.CancelledError:
+                # a trial request cancelled is neither a success nor a failure
+                if breaker is not None:
+                    breaker.trial = False
+                raise
+            else:
+                if breaker is not None:
+                    breaker.success()
+                return result
+            await asyncio.sleep(self.backoff(attempt))
+            attempt += 1
+
+
+# default policy of the clients
+default_policy = RequestPolicy(retries=0, failure_threshold=None)
+
+
 class API:
     """
     API is a class used as an abstraction layer over the request library (AIOHTTP).
@@ -201,15 +752,19 @@ class API:
         self,
         connection_handler: endpoint.ConnectionHandler,
         headers: Optional[dict] = None,
+        policy: Optional[RequestPolicy] = None,
     ) -> None:
         """
         Asks a module in order to create the url used then by derivated classes.
 
         :param connection_handler: Connection handler
         :param headers: Headers dictionary (optional, default None)
+        :param policy: Request policy (optional, default default_policy)
         """
         self.connection_handler = connection_handler
         self.headers = {} if headers is None else headers
+        self.policy = default_policy if policy is None else policy
+        self.node = "{0}:{1}".format(connection_handler.server, connection_handler.port)
 
     def reverse_url(self, scheme: str, path: str) -> str:
         """
@@ -244,16 +799,28 @@ class API:
         :param path: the request path
         :return:
         """
+        return await self.policy.call(
+            self.node, lambda: self._requests_get(path, kwargs)
+        )
+
+    async def _requests_get(self, path: str, params: dict) -> ClientResponse:
+        """
+        Send a GET request, raise DuniterError or ValueError if the status is not 200
+
+        :param path: the request path
+        :param params: the query string parameters
+        :return:
+        """
         logging.debug(
             "Request : %s", self.reverse_url(self.connection_handler.http_scheme, path)
         )
         url = self.reverse_url(self.connection_handler.http_scheme, path)
         response = await self.connection_handler.session.get(
             url,
-            params=kwargs,
+            params=params,
             headers=self.headers,
             proxy=self.connection_handler.proxy,
-            timeout=15,
+            timeout=self.policy.timeout,
         )
         if response.status != 200:
             try:
@@ -278,14 +845,17 @@ class API:
             kwargs["self"] = kwargs.pop("self_")
 
         logging.debug("POST : %s", kwargs)
-        response = await self.connection_handler.session.post(
-            self.reverse_url(self.connection_handler.http_scheme, path),
-            data=kwargs,
-            headers=self.headers,
-            proxy=self.connection_handler.proxy,
-            timeout=15,
+        return await self.policy.call(
+            self.node,
+            lambda: self.connection_handler.session.post(
+                self.reverse_url(self.connection_handler.http_scheme, path),
+                data=kwargs,
+                headers=self.headers,
+                proxy=self.connection_handler.proxy,
+                timeout=self.policy.timeout,
+            ),
+            idempotent=False,
         )
-        return response
 
     async def connect_ws(self, path: str) -> WSConnection:
         """
@@ -323,6 +893,9 @@ class Client:
         _endpoint: Union[str, endpoint.Endpoint],
         session: ClientSession = None,
         proxy: str = None,
+        trusted: bool = False,
+        policy: Optional[RequestPolicy] = None,
+        cache: Optional[ResponseCache] = None,
     ) -> None:
         """
         Init Client instance
@@ -330,6 +903,12 @@ class Client:
         :param _endpoint: Endpoint string in duniter format
         :param session: Aiohttp client session (optional, default None)
         :param proxy: Proxy server as hostname:port
+        :param trusted: True to only validate VALIDATION_SAMPLE_SIZE items of each
+        array of the responses (optional, default False)
+        :param policy: Timeouts, retries and circuit breaker of the requests
+        (optional, default default_policy)
+        :param cache: Cache of the json responses of the GET requests (optional,
+        default None)
         """
         if isinstance(_endpoint, str):
             # Endpoint Protocol detection
@@ -349,6 +928,42 @@ class Client:
         else:
             self.session = session
         self.proxy = proxy
+        self.trusted = trusted
+        self.policy = default_policy if policy is None else policy
+        self.cache = cache
+        # False for the clients of a ClientPool, which closes the shared session
+        self.close_session = True
+        self._api = None  # type: Optional[API]
+
+    @property
+    def cache_namespace(self) -> str:
+        """
+        Return the namespace of the responses of the node in the cache, which may be
+        shared by several clients
+
+        :return:
+        """
+        if self.proxy is None:
+            return self.endpoint.inline()
+        return "{0} {1}".format(self.endpoint.inline(), self.proxy)
+
+    def api(self) -> API:
+        """
+        Return the API instance of the endpoint, created on first call
+
+        :return:
+        """
+        if (
+            self._api is None
+            or self._api.connection_handler.session is not self.session
+            or self._api.connection_handler.proxy != self.proxy
+            or self._api.policy is not self.policy
+        ):
+            self._api = API(
+                self.endpoint.conn_handler(self.session, self.proxy),
+                policy=self.policy,
+            )
+        return self._api
 
     async def get(
         self,
@@ -360,6 +975,9 @@ class Client:
         """
         GET request on self.endpoint + url_path
 
+        Json responses are read from and stored into the cache of the client, if any.
+        Each call returns a new object, changing it does not change the cache.
+
         :param url_path: Url encoded path following the endpoint
         :param params: Url query string parameters dictionary
         :param rtype: Response type
@@ -369,24 +987,21 @@ class Client:
         if params is None:
             params = dict()
 
-        client = API(self.endpoint.conn_handler(self.session, self.proxy))
+        cache = self.cache if rtype == RESPONSE_JSON else None
+        if cache is not None:
+            data = cache.get(url_path, params, self.cache_namespace)
+            if data is not None:
+                return data
 
         # get aiohttp response
-        response = await client.requests_get(url_path, **params)
-
-        # if schema supplied...
-        if schema is not None:
-            # validate response
-            await parse_response(response, schema)
+        response = await self.api().requests_get(url_path, **params)
 
-        # return the chosen type
-        result = response  # type: Any
-        if rtype == RESPONSE_TEXT:
-            result = await response.text()
-        elif rtype == RESPONSE_JSON:
-            result = await response.json()
-
-        return result
+        data = await read_response(
+            response, rtype, schema, VALIDATION_SAMPLE_SIZE if self.trusted else None
+        )
+        if cache is not None:
+            cache.set(url_path, params, data, self.cache_namespace)
+        return data
 
     async def post(
         self,
@@ -407,24 +1022,55 @@ class Client:
         if params is None:
             params = dict()
 
-        client = API(self.endpoint.conn_handler(self.session, self.proxy))
-
         # get aiohttp response
-        response = await client.requests_post(url_path, **params)
+        response = await self.api().requests_post(url_path, **params)
 
-        # if schema supplied...
-        if schema is not None:
-            # validate response
-            await parse_response(response, schema)
+        return await read_response(
+            response, rtype, schema, VALIDATION_SAMPLE_SIZE if self.trusted else None
+        )
 
-        # return the chosen type
-        result = response  # type: Any
-        if rtype == RESPONSE_TEXT:
-            result = await response.text()
-        elif rtype == RESPONSE_JSON:
-            result = await response.json()
+    async def stream(
+        self,
+        url_path: str,
+        json_path: Sequence[str] = (),
+        params: dict = None,
+        schema: dict = None,
+    ) -> AsyncIterator[Any]:
+        """
+        GET request on self.endpoint + url_path, yielding the items of a json array of
+        the response while the body is downloaded
 
-        return result
+        Usage:
+
+            async for tx in client.stream("tx/history/" + pubkey, ("history", "sent")):
+                print(tx["hash"])
+
+        :param url_path: Url encoded path following the endpoint
+        :param json_path: Keys of the nested objects holding the array, empty for a
+        top level array
+        :param params: Url query string parameters dictionary
+        :param schema: Json Schema to validate each item (optional, default None)
+        :return:
+        """
+        if params is None:
+            params = dict()
+
+        response = await self.api().requests_get(url_path, **params)
+        try:
+            async for item in iter_json_array(response.content.iter_any(), json_path):
+                if schema is not None:
+                    validate(item, schema)
+                yield item
+        except ValueError as e:
+            raise jsonschema.ValidationError(
+                "Could not parse json : {0}".format(str(e))
+            ) from e
+        finally:
+            if response.content.at_eof():
+                response.release()
+            else:
+                # the rest of the body is not read, the connection can not be reused
+                response.close()
 
     async def connect_ws(self, path: str = "") -> WSConnection:
         """
@@ -433,16 +1079,16 @@ class Client:
         :param path: the url path
         :return:
         """
-        client = API(self.endpoint.conn_handler(self.session, self.proxy))
-        return await client.connect_ws(path)
+        return await self.api().connect_ws(path)
 
     async def close(self):
         """
-        Close aiohttp session
+        Close aiohttp session, unless the client belongs to a ClientPool
 
         :return:
         """
-        await self.session.close()
+        if self.close_session:
+            await self.session.close()
 
     def __call__(self, _function: Callable, *args: Any, **kwargs: Any) -> Any:
         """
@@ -455,3 +1101,468 @@ class Client:
         :return:
         """
         return _function(self, *args, **kwargs)
+
+
+class ClientPool:
+    """
+    Client instances sharing a single aiohttp session, by endpoint and proxy
+
+    The session connector keeps the connections alive and caches the DNS resolutions,
+    so the requests to the same nodes reuse their sockets and TLS sessions.
+
+    Usage:
+
+        pool = ClientPool()
+        for endpoint in endpoints:
+            print(await pool.client(endpoint)(bma.node.summary))
+        await pool.close()
+    """
+
+    def __init__(
+        self,
+        limit: int = POOL_CONNECTIONS_LIMIT,
+        limit_per_host: int = POOL_CONNECTIONS_LIMIT_PER_HOST,
+        ttl_dns_cache: Optional[int] = POOL_DNS_CACHE_TTL,
+        keepalive_timeout: float = POOL_KEEPALIVE_TIMEOUT,
+        policy: Optional[RequestPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        """
+        Init an empty ClientPool instance
+
+        :param limit: Maximum number of connections, 0 for no limit
+        :param limit_per_host: Maximum number of connections by node, 0 for no limit
+        :param ttl_dns_cache: Lifetime in seconds of the DNS cache entries
+        :param keepalive_timeout: Seconds an idle connection is kept open
+        :param policy: Request policy of the clients (optional, default default_policy)
+        :param cache: Response cache of the clients, each client using its own
+        namespace (optional, default None)
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.ttl_dns_cache = ttl_dns_cache
+        self.keepalive_timeout = keepalive_timeout
+        self.policy = policy
+        self.cache = cache
+        self._session = None  # type: Optional[ClientSession]
+        self._loop = None  # type: Optional[asyncio.AbstractEventLoop]
+        self._clients = {}  # type: Dict[Tuple[str, Optional[str]], Client]
+
+    @property
+    def session(self) -> ClientSession:
+        """
+        Return the shared session, opened on first use in the running event loop
+
+        The session of a previous event loop is closed, see _close_previous_session.
+
+        :return:
+        """
+        loop = asyncio.get_event_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._close_previous_session()
+            # clients keep the session they were created with
+            self._clients.clear()
+            connector = TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.ttl_dns_cache,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = ClientSession(connector=connector)
+            self._loop = loop
+        return self._session
+
+    def _close_previous_session(self) -> None:
+        """
+        Close the session opened in another event loop
+
+        The session can only be closed in its own loop: the close is scheduled in that
+        loop, and runs when it runs again. The connections of a loop already closed
+        can not be released anymore, close the pool before closing its loop.
+
+        :return:
+        """
+        if self._session is None or self._session.closed or self._loop is None:
+            return
+        if self._loop.is_closed():
+            logger.warning("Session of a closed event loop left unclosed")
+            return
+        asyncio.run_coroutine_threadsafe(self._session.close(), self._loop)
+
+    def client(
+        self, _endpoint: Union[str, endpoint.Endpoint], proxy: Optional[str] = None
+    ) -> Client:
+        """
+        Return the Client instance of the endpoint, created on first call
+
+        The client must not be closed, use ClientPool.close instead.
+
+        :param _endpoint: Endpoint string in duniter format or Endpoint instance
+        :param proxy: Proxy server as hostname:port
+        :return:
+        """
+        if isinstance(_endpoint, str):
+            _endpoint = endpoint.endpoint(_endpoint)
+        session = self.session
+        key = (_endpoint.inline(), proxy)
+        client = self._clients.get(key)
+        if client is None:
+            client = Client(
+                _endpoint, session, proxy, policy=self.policy, cache=self.cache
+            )
+            client.close_session = False
+            self._clients[key] = client
+        return client
+
+    async def close(self) -> None:
+        """
+        Close the shared session and forget the clients
+
+        :return:
+        """
+        self._clients.clear()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._loop = None
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+# shared pool of the process
+client_pool = ClientPool()
+
+
+class NodeStats:
+    """
+    Latencies of the last requests to a node and its count of consecutive failures
+    """
+
+    def __init__(self, maxlen: int = LATENCY_SAMPLES) -> None:
+        """
+        Init an empty NodeStats instance
+
+        :param maxlen: Number of latencies kept
+        """
+        self.latencies = deque(maxlen=maxlen)  # type: Deque[float]
+        self.failures = 0
+        # requests cancelled since the last completed one
+        self.cancelled = 0
+
+    def record(self, latency: float) -> None:
+        """
+        Record the latency of a successful request
+
+        :param latency: Request duration in seconds
+        :return:
+        """
+        self.latencies.append(latency)
+        self.failures = 0
+        self.cancelled = 0
+
+    def record_failure(self, latency: float) -> None:
+        """
+        Record a failed request
+
+        :param latency: Request duration in seconds
+        :return:
+        """
+        self.latencies.append(latency)
+        self.failures += 1
+        self.cancelled = 0
+
+    def record_cancelled(self) -> None:
+        """
+        Record a request cancelled before its end, its duration is not a latency
+
+        :return:
+        """
+        self.cancelled += 1
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Return the latency under which percent % of the requests answered, None if
+        there is no latency recorded
+
+        :param percent: Percentage between 0 and 100
+        :return:
+        """
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        index = max(0, math.ceil(len(latencies) * percent / 100) - 1)
+        return latencies[index]
+
+    def score(self) -> Tuple[int, float]:
+        """
+        Return the ranking score of the node, lower is better
+
+        Failing nodes come last, then the nodes are sorted by median latency. Nodes
+        without statistics come first, so they are measured, unless their requests
+        were cancelled because other nodes answered first.
+
+        :return:
+        """
+        median = self.percentile(50)
+        if median is None:
+            median = math.inf if self.cancelled else 0.0
+        return self.failures, median
+
+
+class MultiClient:
+    """
+    Read requests sent to several nodes, to not wait for the slowest one
+
+    Strategies:
+
+    - STRATEGY_HEDGED: request the fastest node, then the next one each time the
+      pending requests failed or outlasted the hedge_percentile latency of the node
+    - STRATEGY_FIRST: request all the nodes, return the first response
+    - STRATEGY_QUORUM: request the quorum_size fastest nodes, return the response
+      when quorum of them returned equal results
+
+    The latencies of the nodes drive their order of use. The late requests are
+    cancelled as soon as the result is known.
+
+    Usage:
+
+        multi_client = MultiClient(endpoints, STRATEGY_HEDGED)
+        current = await multi_client(bma.blockchain.current)
+    """
+
+    def __init__(
+        self,
+        clients: Sequence[Union[Client, str, endpoint.Endpoint]],
+        strategy: str = STRATEGY_HEDGED,
+        quorum: Optional[int] = None,
+        quorum_size: Optional[int] = None,
+        hedge_percentile: float = HEDGE_PERCENTILE,
+        hedge_delay: float = HEDGE_DELAY,
+        pool: Optional[ClientPool] = None,
+    ) -> None:
+        """
+        Init MultiClient instance
+
+        :param clients: Client instances, endpoints or endpoint strings in duniter
+        format, the endpoints get their client from the pool
+        :param strategy: STRATEGY_HEDGED, STRATEGY_FIRST or STRATEGY_QUORUM
+        :param quorum: Number of equal results required, default is the majority of
+        quorum_size
+        :param quorum_size: Number of nodes requested by STRATEGY_QUORUM, default is
+        all the nodes
+        :param hedge_percentile: Percentile of the node latencies waited before
+        requesting the next node
+        :param hedge_delay: Seconds waited before requesting the next node, while the
+        node has no statistics
+        :param pool: ClientPool of the endpoints (optional, default client_pool)
+        """
+        if strategy not in (STRATEGY_HEDGED, STRATEGY_FIRST, STRATEGY_QUORUM):
+            raise ValueError("Unknown strategy {0}".format(strategy))
+        if not clients:
+            raise ValueError("MultiClient requires at least one node")
+        if pool is None:
+            pool = client_pool
+
+        self.clients = [
+            _client if isinstance(_client, Client) else pool.client(_client)
+            for _client in clients
+        ]  # type: List[Client]
+        self.strategy = strategy
+        self.quorum_size = len(self.clients) if quorum_size is None else quorum_size
+        self.quorum = self.quorum_size // 2 + 1 if quorum is None else quorum
+        if not 0 < self.quorum <= self.quorum_size <= len(self.clients):
+            raise ValueError(
+                "Quorum {0} of {1} nodes impossible with {2} nodes".format(
+                    self.quorum, self.quorum_size, len(self.clients)
+                )
+            )
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self.stats = {
+            _client: NodeStats() for _client in self.clients
+        }  # type: Dict[Client, NodeStats]
+
+    def ranked(self) -> List[Client]:
+        """
+        Return the clients sorted from the fastest node to the slowest one
+
+        :return:
+        """
+        return sorted(self.clients, key=lambda _client: self.stats[_client].score())
+
+    async def _timed(
+        self, _client: Client, _function: Callable, args: tuple, kwargs: dict
+    ) -> Any:
+        """
+        Call _function with _client and record the latency of the node
+
+        Cancelled requests record nothing, their duration is not the latency of the
+        node.
+
+        :param _client: Client of the node
+        :param _function: The function to call
+        :param args: The parameters
+        :param kwargs: The key/value parameters
+        :return:
+        """
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+        try:
+            result = await _function(_client, *args, **kwargs)
+        except asyncio.CancelledError:
+            # an Exception before python 3.8, not a failure of the node
+            self.stats[_client].record_cancelled()
+            raise
+        except Exception:
+            self.stats[_client].record_failure(loop.time() - start)
+            raise
+        self.stats[_client].record(loop.time() - start)
+        return result
+
+    def _start(
+        self, _client: Client, _function: Callable, args: tuple, kwargs: dict
+    ) -> asyncio.Future:
+        return asyncio.ensure_future(self._timed(_client, _function, args, kwargs))
+
+    async def first(self, _function: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call _function on all the nodes and return the first successful result
+
+        Raise the error of the last node if all of them failed.
+
+        :param _function: The function to call
+        :param args: The parameters
+        :param kwargs: The key/value parameters
+        :return:
+        """
+        pending = {
+            self._start(_client, _function, args, kwargs) for _client in self.ranked()
+        }
+        try:
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                if not pending:
+                    raise task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def hedged(self, _function: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call _function on the fastest node, then on the next one each time the
+        pending requests failed or lasted the hedge percentile latency of their node
+
+        Raise the error of the last node if all of them failed.
+
+        :param _function: The function to call
+        :param args: The parameters
+        :param kwargs: The key/value parameters
+        :return:
+        """
+        clients = deque(self.ranked())
+        pending = set()  # type: set
+        try:
+            while True:
+                timeout = None
+                if clients:
+                    _client = clients.popleft()
+                    pending.add(self._start(_client, _function, args, kwargs))
+                    if clients:
+                        timeout = self.stats[_client].percentile(self.hedge_percentile)
+                        if timeout is None:
+                            timeout = self.hedge_delay
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                if not pending and not clients:
+                    raise task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def quorum_result(
+        self, _function: Callable, *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Call _function on the quorum_size fastest nodes and return the first result
+        returned by quorum nodes
+
+        Raise ValueError if the quorum can not be reached.
+
+        :param _function: The function to call
+        :param args: The parameters
+        :param kwargs: The key/value parameters
+        :return:
+        """
+        pending = {
+            self._start(_client, _function, args, kwargs)
+            for _client in self.ranked()[: self.quorum_size]
+        }
+        # distinct results with their count of nodes
+        results = []  # type: List[List[Any]]
+        errors = []  # type: List[BaseException]
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        errors.append(task.exception())
+                        continue
+                    result = task.result()
+                    for entry in results:
+                        if entry[0] == result:
+                            entry[1] += 1
+                            break
+                    else:
+                        entry = [result, 1]
+                        results.append(entry)
+                    if entry[1] >= self.quorum:
+                        return entry[0]
+                best = max((entry[1] for entry in results), default=0)
+                if best + len(pending) < self.quorum:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise ValueError(
+            "Quorum of {0} nodes not reached: {1} distinct results, {2} errors".format(
+                self.quorum, len(results), len(errors)
+            )
+        ) from (errors[-1] if errors else None)
+
+    async def close(self) -> None:
+        """
+        Close the clients, except the ones of a ClientPool
+
+        :return:
+        """
+        for _client in self.clients:
+            await _client.close()
+
+    def __call__(self, _function: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call the _function given with the args given, on the nodes selected by the
+        strategy
+
+        :param _function: The function to call
+        :param args: The parameters
+        :param kwargs: The key/value parameters
+        :return:
+        """
+        if self.strategy == STRATEGY_FIRST:
+            return self.first(_function, *args, **kwargs)
+        if self.strategy == STRATEGY_QUORUM:
+            return self.quorum_result(_function, *args, **kwargs)
+        return self.hedged(_function, *args, **kwargs)
@@ -15,9 +15,9 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from .block import Block
+from .block import Block, MalformedSectionError
 from .block_uid import BlockUID, block_uid
-from .document import Document, MalformedDocumentError
+from .document import Document, MalformedDocumentError, Memoized
 from .certification import Certification
 from .revocation import Revocation
 from .identity import Identity
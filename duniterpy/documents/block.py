@@ -18,12 +18,12 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import base64
 import hashlib
 import re
-from typing import TypeVar, Type, Optional, List, Sequence
+from typing import TypeVar, Type, Optional, List, Sequence, Dict, Any
 from .block_uid import BlockUID
 from .certification import Certification
 from .revocation import Revocation
 from .identity import Identity
-from .document import Document, MalformedDocumentError
+from .document import Document, MalformedDocumentError, memoized
 from .membership import Membership
 from .transaction import Transaction
 from ..constants import PUBKEY_REGEX, BLOCK_HASH_REGEX
@@ -33,6 +33,15 @@ from ..constants import PUBKEY_REGEX, BLOCK_HASH_REGEX
 BlockType = TypeVar("BlockType", bound="Block")
 
 
+class MalformedSectionError(MalformedDocumentError, AttributeError):
+    """
+    Malformed section of a lazy block, raised on the first access to its attribute
+
+    It is also an AttributeError, so hasattr and getattr with a default value do not
+    raise.
+    """
+
+
 class Block(Document):
     """
     The class Block handles Block documents.
@@ -112,6 +121,29 @@ class Block(Document):
     re_exclusion = re.compile("({pubkey_regex})\n".format(pubkey_regex=PUBKEY_REGEX))
     re_certifications = re.compile("Certifications:\n")
     re_transactions = re.compile("Transactions:\n")
+    re_section = re.compile(
+        "(Identities|Joiners|Actives|Leavers|Revoked|Excluded|Certifications|Transactions):\n"
+    )
+    # sections of documents, in the order of the block
+    sections = (
+        "Identities",
+        "Joiners",
+        "Actives",
+        "Leavers",
+        "Revoked",
+        "Excluded",
+        "Certifications",
+        "Transactions",
+    )
+    # format of the inline documents lines, checked when a lazy block is split
+    sections_lines = {
+        "Identities": Identity.re_inline,
+        "Joiners": Membership.re_inline,
+        "Actives": Membership.re_inline,
+        "Leavers": Membership.re_inline,
+        "Revoked": Revocation.re_inline,
+        "Certifications": Certification.re_inline,
+    }
     re_hash = re.compile(
         "InnerHash: ({block_hash_regex})\n".format(block_hash_regex=BLOCK_HASH_REGEX)
     )
@@ -247,13 +279,32 @@ class Block(Document):
         self.transactions = transactions
         self.inner_hash = inner_hash
         self.nonce = nonce
+        # lines of the sections not parsed yet, by section name, for lazy blocks
+        self._lazy_sections = None  # type: Optional[Dict[str, Sequence[str]]]
 
     @property
+    @memoized
     def blockUID(self) -> BlockUID:
         return BlockUID(self.number, self.proof_of_work())
 
     @classmethod
-    def from_signed_raw(cls: Type[BlockType], signed_raw: str) -> BlockType:
+    def from_signed_raw(
+        cls: Type[BlockType], signed_raw: str, lazy: bool = False
+    ) -> BlockType:
+        """
+        Return Block instance from signed raw format
+
+        In lazy mode, only the header fields are parsed: the lines of each section are
+        kept and parsed into documents on the first access to the section attribute,
+        like block.transactions. The format of the inline documents lines and the
+        headers and versions of the compact transactions are still checked here. The
+        errors found when decoding the documents raise MalformedSectionError on the
+        first access to the attribute.
+
+        :param signed_raw: Signed raw format string
+        :param lazy: True to parse the sections on first access
+        :return:
+        """
         lines = signed_raw.splitlines(True)
         n = 0
 
@@ -321,97 +372,49 @@ class Block(Document):
         members_count = int(Block.parse_field("MembersCount", lines[n]))
         n += 1
 
-        identities = []
-        joiners = []
-        actives = []
-        leavers = []
-        revoked = []
-        excluded = []
-        certifications = []
-        transactions = []
-
-        if Block.re_identities.match(lines[n]) is not None:
-            n += 1
-            while Block.re_joiners.match(lines[n]) is None:
-                selfcert = Identity.from_inline(version, currency, lines[n])
-                identities.append(selfcert)
+        # walk the sections with a single cursor, recording the lines of each section
+        # until the next header
+        sections = {}  # type: Dict[str, Sequence[str]]
+        # the inline documents of the other sections take the block version
+        transactions_version = 1
+        section = None
+        section_start = n
+        while Block.re_hash.match(lines[n]) is None:
+            section_match = Block.re_section.match(lines[n])
+            if section_match is not None:
+                if section is not None:
+                    sections[section] = lines[section_start:n]
+                section = section_match.group(1)
                 n += 1
-
-        if Block.re_joiners.match(lines[n]):
-            n += 1
-            while Block.re_actives.match(lines[n]) is None:
-                membership = Membership.from_inline(version, currency, "IN", lines[n])
-                joiners.append(membership)
-                n += 1
-
-        if Block.re_actives.match(lines[n]):
-            n += 1
-            while Block.re_leavers.match(lines[n]) is None:
-                membership = Membership.from_inline(version, currency, "IN", lines[n])
-                actives.append(membership)
-                n += 1
-
-        if Block.re_leavers.match(lines[n]):
-            n += 1
-            while Block.re_revoked.match(lines[n]) is None:
-                membership = Membership.from_inline(version, currency, "OUT", lines[n])
-                leavers.append(membership)
-                n += 1
-
-        if Block.re_revoked.match(lines[n]):
-            n += 1
-            while Block.re_excluded.match(lines[n]) is None:
-                revokation = Revocation.from_inline(version, currency, lines[n])
-                revoked.append(revokation)
-                n += 1
-
-        if Block.re_excluded.match(lines[n]):
-            n += 1
-            while Block.re_certifications.match(lines[n]) is None:
-                exclusion_match = Block.re_exclusion.match(lines[n])
-                if exclusion_match is not None:
-                    exclusion = exclusion_match.group(1)
-                    excluded.append(exclusion)
-                n += 1
-
-        if Block.re_certifications.match(lines[n]):
-            n += 1
-            while Block.re_transactions.match(lines[n]) is None:
-                certification = Certification.from_inline(
-                    version, currency, prev_hash, lines[n]
-                )
-                certifications.append(certification)
-                n += 1
-
-        if Block.re_transactions.match(lines[n]):
-            n += 1
-            while not Block.re_hash.match(lines[n]):
-                tx_lines = ""
+                section_start = n
+            elif section == "Transactions":
                 header_data = Transaction.re_header.match(lines[n])
                 if header_data is None:
                     raise MalformedDocumentError(
                         "Compact transaction ({0})".format(lines[n])
                     )
-                issuers_num = int(header_data.group(2))
-                inputs_num = int(header_data.group(3))
-                unlocks_num = int(header_data.group(4))
-                outputs_num = int(header_data.group(5))
-                has_comment = int(header_data.group(6))
-                sup_lines = 2
-                tx_max = (
-                    n
-                    + sup_lines
-                    + issuers_num * 2
-                    + inputs_num
-                    + unlocks_num
-                    + outputs_num
-                    + has_comment
+                transactions_version = max(
+                    transactions_version, int(header_data.group(1))
+                )
+                n += Transaction.compact_lines_count(header_data)
+            elif section is None:
+                raise MalformedDocumentError("Block section ({0})".format(lines[n]))
+            else:
+                if lazy:
+                    line_regex = Block.sections_lines.get(section)
+                    if line_regex is not None and line_regex.match(lines[n]) is None:
+                        raise MalformedDocumentError(
+                            "{0} ({1})".format(section, lines[n])
+                        )
+                n += 1
+        if section is not None:
+            sections[section] = lines[section_start:n]
+        if version < transactions_version:
+            raise MalformedDocumentError(
+                "Block version is too low : {0} < {1}".format(
+                    version, transactions_version
                 )
-                for index in range(n, tx_max):
-                    tx_lines += lines[index]
-                n += tx_max - n
-                transaction = Transaction.from_compact(currency, tx_lines)
-                transactions.append(transaction)
+            )
 
         inner_hash = Block.parse_field("InnerHash", lines[n])
         n += 1
@@ -421,6 +424,49 @@ class Block(Document):
 
         signature = Block.parse_field("Signature", lines[n])
 
+        if lazy:
+            block = cls(
+                version,
+                currency,
+                number,
+                powmin,
+                time,
+                mediantime,
+                ud,
+                unit_base,
+                issuer,
+                issuers_frame,
+                issuers_frame_var,
+                different_issuers_count,
+                prev_hash,
+                prev_issuer,
+                parameters,
+                members_count,
+                [],
+                [],
+                [],
+                [],
+                [],
+                [],
+                [],
+                [],
+                inner_hash,
+                nonce,
+                signature,
+            )
+            # drop the section attributes, __getattr__ parses them on first access
+            for section in Block.sections:
+                delattr(block, section.lower())
+            block._lazy_sections = sections
+            return block
+
+        section_documents = {
+            section: Block.parse_section(
+                version, currency, prev_hash, section, sections.get(section, [])
+            )
+            for section in Block.sections
+        }
+
         return cls(
             version,
             currency,
@@ -438,19 +484,199 @@ class Block(Document):
             prev_issuer,
             parameters,
             members_count,
-            identities,
-            joiners,
-            actives,
-            leavers,
-            revoked,
-            excluded,
-            certifications,
-            transactions,
+            section_documents["Identities"],
+            section_documents["Joiners"],
+            section_documents["Actives"],
+            section_documents["Leavers"],
+            section_documents["Revoked"],
+            section_documents["Excluded"],
+            section_documents["Certifications"],
+            section_documents["Transactions"],
             inner_hash,
             nonce,
             signature,
         )
 
+    @staticmethod
+    def parse_section(
+        version: int,
+        currency: str,
+        prev_hash: Optional[str],
+        section: str,
+        lines: Sequence[str],
+    ) -> List[Any]:
+        """
+        Return the documents of the lines of a block section
+
+        :param version: Version of the block
+        :param currency: Name of the currency
+        :param prev_hash: Hash of the previous block, used by the inline certifications
+        :param section: Name of the section, like "Identities" or "Transactions"
+        :param lines: Lines of the section, without the section header
+        :return:
+        """
+        documents = []  # type: List[Any]
+        n = 0
+        while n < len(lines):
+            if section == "Transactions":
+                header_data = Transaction.re_header.match(lines[n])
+                if header_data is None:
+                    raise MalformedDocumentError(
+                        "Compact transaction ({0})".format(lines[n])
+                    )
+                tx_end = n + Transaction.compact_lines_count(header_data)
+                documents.append(
+                    Transaction.from_compact_lines(currency, lines[n:tx_end])
+                )
+                n = tx_end
+                continue
+
+            if section == "Identities":
+                documents.append(Identity.from_inline(version, currency, lines[n]))
+            elif section == "Joiners" or section == "Actives":
+                documents.append(
+                    Membership.from_inline(version, currency, "IN", lines[n])
+                )
+            elif section == "Leavers":
+                documents.append(
+                    Membership.from_inline(version, currency, "OUT", lines[n])
+                )
+            elif section == "Revoked":
+                documents.append(Revocation.from_inline(version, currency, lines[n]))
+            elif section == "Excluded":
+                exclusion_match = Block.re_exclusion.match(lines[n])
+                if exclusion_match is not None:
+                    documents.append(exclusion_match.group(1))
+            elif section == "Certifications":
+                documents.append(
+                    Certification.from_inline(version, currency, prev_hash, lines[n])
+                )
+            else:
+                raise MalformedDocumentError("Block section ({0})".format(section))
+            n += 1
+        return documents
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Parse the section of a lazy block on the first access to its attribute
+
+        Raise MalformedSectionError if the documents of the section can not be decoded.
+
+        :param name: Name of the attribute
+        :return:
+        """
+        # only called when name is not found, so after the parsing of the section
+        # the documents are read from the instance attribute
+        lazy_sections = self.__dict__.get("_lazy_sections")
+        section = name.capitalize()
+        if lazy_sections is None or section not in Block.sections:
+            raise AttributeError(
+                "'{0}' object has no attribute '{1}'".format(type(self).__name__, name)
+            )
+        try:
+            documents = Block.parse_section(
+                self.version,
+                self.currency,
+                self.prev_hash,
+                section,
+                lazy_sections.get(section, []),
+            )
+        except MalformedDocumentError as error:
+            raise MalformedSectionError(section) from error
+        # the lines are kept on error, so each access raises again
+        lazy_sections.pop(section, None)
+        setattr(self, name, documents)
+        return documents
+
+    @classmethod
+    def from_parsed_json(
+        cls: Type[BlockType], parsed_json_block: dict, lazy: bool = False
+    ) -> BlockType:
+        """
+        Return a Block instance from the python dict of a BMA or WS2P json block
+
+        :param parsed_json_block: Block as a python dict
+        :param lazy: True to parse the sections on first access, see from_signed_raw
+        :return:
+        """
+        return cls.from_signed_raw(
+            cls.signed_raw_from_parsed_json(parsed_json_block), lazy
+        )
+
+    @staticmethod
+    def signed_raw_from_parsed_json(parsed_json_block: dict) -> str:
+        """
+        Return the signed raw document of a BMA or WS2P json block, without parsing it
+
+        :param parsed_json_block: Block as a python dict
+        :return:
+        """
+        b = parsed_json_block  # alias for readability
+        lines = [
+            "Version: {0}".format(b["version"]),
+            "Type: Block",
+            "Currency: {0}".format(b["currency"]),
+            "Number: {0}".format(b["number"]),
+            "PoWMin: {0}".format(b["powMin"]),
+            "Time: {0}".format(b["time"]),
+            "MedianTime: {0}".format(b["medianTime"]),
+        ]
+        if b.get("dividend"):
+            lines.append("UniversalDividend: {0}".format(b["dividend"]))
+        lines += [
+            "UnitBase: {0}".format(b["unitbase"]),
+            "Issuer: {0}".format(b["issuer"]),
+            "IssuersFrame: {0}".format(b["issuersFrame"]),
+            "IssuersFrameVar: {0}".format(b["issuersFrameVar"]),
+            "DifferentIssuersCount: {0}".format(b["issuersCount"]),
+        ]
+        if b["number"] == 0:
+            lines.append("Parameters: {0}".format(b["parameters"]))
+        else:
+            lines.append("PreviousHash: {0}".format(b["previousHash"]))
+            lines.append("PreviousIssuer: {0}".format(b["previousIssuer"]))
+        lines.append("MembersCount: {0}".format(b["membersCount"]))
+
+        for field, section in (
+            ("identities", "Identities"),
+            ("joiners", "Joiners"),
+            ("actives", "Actives"),
+            ("leavers", "Leavers"),
+            ("revoked", "Revoked"),
+            ("excluded", "Excluded"),
+            ("certifications", "Certifications"),
+        ):
+            lines.append("{0}:".format(section))
+            lines += b.get(field, [])
+
+        lines.append("Transactions:")
+        for tx in b["transactions"]:
+            lines.append(
+                "TX:{0}:{1}:{2}:{3}:{4}:{5}:{6}".format(
+                    tx["version"],
+                    len(tx["issuers"]),
+                    len(tx["inputs"]),
+                    len(tx["unlocks"]),
+                    len(tx["outputs"]),
+                    "1" if tx["comment"] else "0",
+                    tx["locktime"],
+                )
+            )
+            lines.append(tx["blockstamp"])
+            lines += tx["issuers"] + tx["inputs"] + tx["unlocks"] + tx["outputs"]
+            if tx["comment"]:
+                lines.append(tx["comment"])
+            lines += tx["signatures"]
+
+        lines += [
+            "InnerHash: {0}".format(b["inner_hash"]),
+            "Nonce: {0}".format(b["nonce"]),
+            b["signature"],
+        ]
+
+        return "\n".join(lines) + "\n"
+
+    @memoized
     def raw(self) -> str:
         doc = """Version: {version}
 Type: Block
@@ -530,6 +756,7 @@ PreviousIssuer: {1}\n".format(
 
         return doc
 
+    @memoized
     def proof_of_work(self) -> str:
         doc_str = """InnerHash: {inner_hash}
 Nonce: {nonce}
@@ -539,6 +766,21 @@ Nonce: {nonce}
         )
         return hashlib.sha256(doc_str.encode("ascii")).hexdigest().upper()
 
+    @staticmethod
+    def proof_of_work_from_signed_raw(signed_raw: str) -> str:
+        """
+        Return the hash of a signed raw block, without parsing it
+
+        The hash covers the InnerHash and Nonce lines and the signature, the last
+        lines of the document, see proof_of_work.
+
+        :param signed_raw: Signed raw document of the block
+        :return:
+        """
+        doc_str = "\n".join(signed_raw.rsplit("\n", 4)[-4:])
+        return hashlib.sha256(doc_str.encode("ascii")).hexdigest().upper()
+
+    @memoized
     def computed_inner_hash(self) -> str:
         doc = self.signed_raw()
         inner_doc = "\n".join(doc.split("\n")[:-2]) + "\n"
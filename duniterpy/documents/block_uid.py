@@ -16,16 +16,16 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import re
-from typing import Union, TypeVar, Type
+from typing import Union, TypeVar, Type, Tuple, Any
 
-from .document import MalformedDocumentError
+from .document import MalformedDocumentError, Immutable
 from ..constants import EMPTY_HASH, BLOCK_ID_REGEX, BLOCK_HASH_REGEX
 
 # required to type hint cls in classmethod
 BlockUIDType = TypeVar("BlockUIDType", bound="BlockUID")
 
 
-class BlockUID:
+class BlockUID(Immutable):
     """
     A simple block id
     """
@@ -39,11 +39,13 @@ class BlockUID:
         "({block_hash_regex})".format(block_hash_regex=BLOCK_HASH_REGEX)
     )
 
+    __slots__ = ("number", "sha_hash")
+
     def __init__(self, number: int, sha_hash: str) -> None:
         assert type(number) is int
         assert BlockUID.re_hash.match(sha_hash) is not None
-        self.number = number
-        self.sha_hash = sha_hash
+        object.__setattr__(self, "number", number)
+        object.__setattr__(self, "sha_hash", sha_hash)
 
     @classmethod
     def empty(cls: Type[BlockUIDType]) -> BlockUIDType:
@@ -97,8 +99,10 @@ class BlockUID:
             return NotImplemented
         return self.number >= other.number
 
-    def __hash__(self) -> int:
-        return hash((self.number, self.sha_hash))
+    __hash__ = Immutable.__hash__
+
+    def _hash_key(self) -> Tuple[Any, ...]:
+        return self.number, self.sha_hash
 
     def __bool__(self) -> bool:
         return self != BlockUID.empty()
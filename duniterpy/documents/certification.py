@@ -29,7 +29,7 @@ from ..constants import (
     BLOCK_UID_REGEX,
     UID_REGEX,
 )
-from .document import Document, MalformedDocumentError
+from .document import Document, MalformedDocumentError, memoized
 
 
 # required to type hint cls in classmethod
@@ -201,6 +201,7 @@ class Certification(Document):
         signature = cert_data.group(4)
         return cls(version, currency, pubkey_from, pubkey_to, timestamp, signature)
 
+    @memoized
     def raw(self) -> str:
         """
         Return a raw document of the certification
@@ -249,6 +250,7 @@ CertTimestamp: {timestamp}
             logging.debug("Signature : \n%s", signing.decode("ascii"))
             self.signatures.append(signing.decode("ascii"))
 
+    @memoized
     def signed_raw(self) -> str:
         """
         Return signed raw document of the certification for the certified Identity instance
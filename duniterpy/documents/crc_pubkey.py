@@ -17,11 +17,10 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from typing import TypeVar, Type
 
-import base58
 import re
 import hashlib
 from ..constants import PUBKEY_REGEX
-from ..tools import ensure_str
+from ..key.base58 import Base58Encoder
 
 # required to type hint cls in classmethod
 CRCPubkeyType = TypeVar("CRCPubkeyType", bound="CRCPubkey")
@@ -70,10 +69,10 @@ class CRCPubkey:
         :return:
         """
         hash_root = hashlib.sha256()
-        hash_root.update(base58.b58decode(pubkey))
+        hash_root.update(Base58Encoder.decode(pubkey))
         hash_squared = hashlib.sha256()
         hash_squared.update(hash_root.digest())
-        b58_checksum = ensure_str(base58.b58encode(hash_squared.digest()))
+        b58_checksum = Base58Encoder.encode(hash_squared.digest())
 
         crc = b58_checksum[:3]
         return cls(pubkey, crc)
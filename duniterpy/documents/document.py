@@ -16,10 +16,11 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import base64
+import functools
 import hashlib
 import logging
 import re
-from typing import TypeVar, Type, Any, List
+from typing import Callable, TypeVar, Type, Any, List, Tuple
 
 from ..constants import SIGNATURE_REGEX
 
@@ -38,9 +39,101 @@ class MalformedDocumentError(Exception):
         super().__init__("Could not parse field {0}".format(field_name))
 
 
+class Immutable:
+    """
+    Base class of the small immutable values of documents, like BlockUID or InputSource
+
+    Subclasses declare their attributes in __slots__, set them in __init__ with
+    object.__setattr__ and return the tuple of their attributes from _hash_key. The
+    hash is computed once, on first use.
+    """
+
+    __slots__ = ("_hash",)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("{0} instances are immutable".format(type(self).__name__))
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("{0} instances are immutable".format(type(self).__name__))
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash  # type: ignore
+        except AttributeError:
+            value = hash(self._hash_key())
+            object.__setattr__(self, "_hash", value)
+            return value
+
+    def _hash_key(self) -> Tuple[Any, ...]:
+        """
+        Return the tuple of the values identifying the instance
+
+        :return:
+        """
+        raise NotImplementedError
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """
+        Return the pickle and copy state, as __setattr__ prevents the default restore
+        """
+        state = tuple(
+            (name, getattr(self, name))
+            for cls in type(self).__mro__
+            for name in cls.__dict__.get("__slots__", ())
+            if name != "_hash"
+        )
+        return restore_immutable, (type(self), state)
+
+
+def restore_immutable(cls: Type[Immutable], state: Tuple[Tuple[str, Any], ...]) -> Any:
+    """
+    Return the Immutable instance of cls with the attributes of state
+
+    :param cls: Immutable subclass
+    :param state: Tuple of (name, value) attributes
+    :return:
+    """
+    instance = object.__new__(cls)
+    for name, value in state:
+        object.__setattr__(instance, name, value)
+    return instance
+
+
 # required to type hint cls in classmethod
 DocumentType = TypeVar("DocumentType", bound="Document")
 
+# return type of the memoized methods
+MemoizedType = TypeVar("MemoizedType")
+
+
+def memoized(method: Callable[[Any], MemoizedType]) -> Callable[[Any], MemoizedType]:
+    """
+    Decorate a method without arguments of Document, to keep its result when the
+    memoize attribute of the document is True
+
+    Results are keyed by the qualified name of the method, so an override calling
+    the method of its parent class does not read the result of the parent.
+
+    :param method: Method to decorate
+    :return:
+    """
+    key = method.__qualname__
+
+    @functools.wraps(method)
+    def wrapper(self: "Document") -> MemoizedType:
+        if not self.memoize:
+            return method(self)
+        memo = self.__dict__.get("_memo")
+        if memo is None:
+            memo = self.__dict__["_memo"] = {}
+        try:
+            return memo[key]
+        except KeyError:
+            value = memo[key] = method(self)
+            return value
+
+    return wrapper
+
 
 class Document:
     re_version = re.compile("Version: ([0-9]+)\n")
@@ -55,6 +148,9 @@ class Document:
         "Signature": re_signature,
     }
 
+    # True to keep the results of the memoized methods, set by the Memoized mixin
+    memoize = False
+
     def __init__(self, version: int, currency: str, signatures: List[str]) -> None:
         """
         Init Document instance
@@ -108,6 +204,7 @@ class Document:
         """
         raise NotImplementedError("raw() is not implemented")
 
+    @memoized
     def signed_raw(self) -> str:
         """
         If keys are None, returns the raw + current signatures
@@ -120,6 +217,7 @@ class Document:
         return signed_raw
 
     @property
+    @memoized
     def sha_hash(self) -> str:
         """
         Return uppercase hex sha256 hash from signed raw document
@@ -127,3 +225,57 @@ class Document:
         :return:
         """
         return hashlib.sha256(self.signed_raw().encode("ascii")).hexdigest().upper()
+
+
+class Memoized:
+    """
+    Mixin of Document subclasses keeping raw, signed_raw, sha_hash and the other
+    memoized results after their first computation
+
+    Setting an attribute, like sign() does, drops the memoized results.
+
+    Limitation: changes made in place are not detected, so the memoized results are
+    stale after them until invalidate() is called. This covers the lists of the
+    documents, like signatures or the transactions of a block, and the documents
+    they hold, like the inputs and outputs of a transaction.
+
+    The memoized results are not copied nor pickled, each copy computes its own.
+
+    Usage:
+
+        class MemoizedBlock(Memoized, Block):
+            pass
+
+        blocks = sorted(MemoizedBlock.from_signed_raw(raw) for raw in raws)
+    """
+
+    memoize = True
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """
+        Set the attribute and drop the memoized results, computed from the old value
+        """
+        object.__setattr__(self, name, value)
+        memo = self.__dict__.get("_memo")
+        if memo:
+            memo.clear()
+
+    def invalidate(self) -> None:
+        """
+        Drop the memoized results
+
+        :return:
+        """
+        memo = self.__dict__.get("_memo")
+        if memo:
+            memo.clear()
+
+    def __getstate__(self) -> dict:
+        """
+        Return the copy and pickle state, without the memoized results
+
+        :return:
+        """
+        state = self.__dict__.copy()
+        state.pop("_memo", None)
+        return state
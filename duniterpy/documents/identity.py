@@ -20,7 +20,7 @@ from typing import Optional, TypeVar, Type
 
 from .block_uid import BlockUID
 from ..constants import PUBKEY_REGEX, SIGNATURE_REGEX, BLOCK_UID_REGEX, UID_REGEX
-from .document import Document, MalformedDocumentError
+from .document import Document, MalformedDocumentError, memoized
 
 # required to type hint cls in classmethod
 IdentityType = TypeVar("IdentityType", bound="Identity")
@@ -141,6 +141,7 @@ class Identity(Document):
 
         return cls(version, currency, pubkey, uid, ts, signature)
 
+    @memoized
     def raw(self) -> str:
         """
         Return a raw document of the Identity
@@ -19,7 +19,7 @@ import re
 from typing import TypeVar, Type, Optional
 
 from .block_uid import BlockUID
-from .document import Document, MalformedDocumentError
+from .document import Document, MalformedDocumentError, memoized
 from ..constants import BLOCK_UID_REGEX, SIGNATURE_REGEX, PUBKEY_REGEX
 
 # required to type hint cls in classmethod
@@ -195,6 +195,7 @@ class Membership(Document):
             signature,
         )
 
+    @memoized
     def raw(self) -> str:
         """
         Return signed raw format string of the Membership instance
@@ -19,7 +19,7 @@ import re
 from typing import TypeVar, List, Type
 
 from duniterpy.api.endpoint import endpoint, Endpoint
-from .document import Document, MalformedDocumentError
+from .document import Document, MalformedDocumentError, memoized
 from .block_uid import BlockUID
 from ..constants import BLOCK_HASH_REGEX, PUBKEY_REGEX
 
@@ -129,6 +129,7 @@ class Peer(Document):
 
         return cls(version, currency, pubkey, block_uid, endpoints, signature)
 
+    @memoized
     def raw(self) -> str:
         """
         Return a raw format string of the Peer document
@@ -20,7 +20,7 @@ import re
 from typing import Union, Type, TypeVar
 
 from ..constants import PUBKEY_REGEX, SIGNATURE_REGEX, BLOCK_UID_REGEX
-from .document import Document, MalformedDocumentError
+from .document import Document, MalformedDocumentError, memoized
 from .identity import Identity
 
 # required to type hint cls in classmethod
@@ -192,6 +192,7 @@ class Revocation(Document):
         """
         return "{0}:{1}".format(self.pubkey, self.signatures[0])
 
+    @memoized
     def raw(self) -> str:
         """
         Return Revocation raw document string
@@ -237,6 +238,7 @@ IdtySignature: {signature}
             signing = base64.b64encode(key.signature(bytes(self.raw(), "ascii")))
             self.signatures.append(signing.decode("ascii"))
 
+    @memoized
     def signed_raw(self) -> str:
         """
         Return Revocation signed raw document string
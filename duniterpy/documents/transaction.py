@@ -16,13 +16,11 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import re
-from typing import TypeVar, List, Any, Type, Optional, Dict, Union, Tuple
-
-import pypeg2
+from typing import TypeVar, List, Any, Type, Optional, Dict, Union, Tuple, Sequence
 
 from duniterpy.grammars.output import Condition
 from .block_uid import BlockUID
-from .document import Document, MalformedDocumentError
+from .document import Document, MalformedDocumentError, Immutable, memoized
 from ..constants import (
     PUBKEY_REGEX,
     TRANSACTION_HASH_REGEX,
@@ -63,7 +61,7 @@ def reduce_base(amount: int, base: int) -> Tuple[int, int]:
 InputSourceType = TypeVar("InputSourceType", bound="InputSource")
 
 
-class InputSource:
+class InputSource(Immutable):
     """
         A Transaction INPUT
 
@@ -81,6 +79,8 @@ class InputSource:
         )
     )
 
+    __slots__ = ("amount", "base", "source", "origin_id", "index")
+
     def __init__(
         self, amount: int, base: int, source: str, origin_id: str, index: int
     ) -> None:
@@ -94,11 +94,11 @@ class InputSource:
         :param index: a block id if a dividend, an tx index if a transaction
         :return:
         """
-        self.amount = amount
-        self.base = base
-        self.source = source
-        self.origin_id = origin_id
-        self.index = index
+        object.__setattr__(self, "amount", amount)
+        object.__setattr__(self, "base", base)
+        object.__setattr__(self, "source", source)
+        object.__setattr__(self, "origin_id", origin_id)
+        object.__setattr__(self, "index", index)
 
     def __eq__(self, other: Any) -> bool:
         """
@@ -114,8 +114,10 @@ class InputSource:
             and self.index == other.index
         )
 
-    def __hash__(self) -> int:
-        return hash((self.amount, self.base, self.source, self.origin_id, self.index))
+    __hash__ = Immutable.__hash__
+
+    def _hash_key(self) -> Tuple[Any, ...]:
+        return self.amount, self.base, self.source, self.origin_id, self.index
 
     @classmethod
     def from_inline(cls: Type[InputSourceType], inline: str) -> InputSourceType:
@@ -157,13 +159,15 @@ class InputSource:
 OutputSourceType = TypeVar("OutputSourceType", bound="OutputSource")
 
 
-class OutputSource:
+class OutputSource(Immutable):
     """
     A Transaction OUTPUT
     """
 
     re_inline = re.compile("([0-9]+):([0-9]):(.*)")
 
+    __slots__ = ("amount", "base", "condition")
+
     def __init__(self, amount: int, base: int, condition: str) -> None:
         """
         Init OutputSource instance
@@ -172,9 +176,9 @@ class OutputSource:
         :param base: Base number
         :param condition: Condition expression
         """
-        self.amount = amount
-        self.base = base
-        self.condition = self.condition_from_text(condition)
+        object.__setattr__(self, "amount", amount)
+        object.__setattr__(self, "base", base)
+        object.__setattr__(self, "condition", self.condition_from_text(condition))
 
     def __eq__(self, other: Any) -> bool:
         """
@@ -188,8 +192,10 @@ class OutputSource:
             and self.condition == other.condition
         )
 
-    def __hash__(self) -> int:
-        return hash((self.amount, self.base, self.condition))
+    __hash__ = Immutable.__hash__
+
+    def _hash_key(self) -> Tuple[Any, ...]:
+        return self.amount, self.base, self.condition
 
     @classmethod
     def from_inline(cls: Type[OutputSourceType], inline: str) -> OutputSourceType:
@@ -215,7 +221,7 @@ class OutputSource:
         :return:
         """
         return "{0}:{1}:{2}".format(
-            self.amount, self.base, pypeg2.compose(self.condition, output.Condition)
+            self.amount, self.base, output.compose_condition(self.condition)
         )
 
     def inline_condition(self) -> str:
@@ -224,18 +230,23 @@ class OutputSource:
 
         :return:
         """
-        return pypeg2.compose(self.condition, output.Condition)
+        return output.compose_condition(self.condition)
 
     @staticmethod
     def condition_from_text(text) -> Condition:
         """
-        Return a Condition instance with PEG grammar from text
+        Return a Condition instance from text
+
+        Valid conditions are frozen instances shared through output.condition_table,
+        assigning their attributes raises AttributeError. Use output.copy_condition
+        to get a mutable copy, or output.condition_table.resize(0) to get mutable
+        conditions not shared between outputs.
 
-        :param text: PEG parsable string
+        :param text: Condition string
         :return:
         """
         try:
-            condition = pypeg2.parse(text, output.Condition)
+            condition = output.condition_table.get(text)
         except SyntaxError:
             # Invalid conditions are possible, see https://github.com/duniter/duniter/issues/1156
             # In such a case, they are store as empty PEG grammar object and considered unlockable
@@ -247,20 +258,22 @@ class OutputSource:
 SIGParameterType = TypeVar("SIGParameterType", bound="SIGParameter")
 
 
-class SIGParameter:
+class SIGParameter(Immutable):
     """
     A Transaction UNLOCK SIG parameter
     """
 
     re_sig = re.compile("SIG\\(([0-9]+)\\)")
 
+    __slots__ = ("index",)
+
     def __init__(self, index: int) -> None:
         """
         Init SIGParameter instance
 
         :param index: Index in list
         """
-        self.index = index
+        object.__setattr__(self, "index", index)
 
     def __eq__(self, other: Any) -> bool:
         """
@@ -270,8 +283,10 @@ class SIGParameter:
             return NotImplemented
         return self.index == other.index
 
-    def __hash__(self) -> int:
-        return hash(self.index)
+    __hash__ = Immutable.__hash__
+
+    def _hash_key(self) -> Tuple[Any, ...]:
+        return (self.index,)
 
     @classmethod
     def from_parameter(
@@ -303,20 +318,22 @@ class SIGParameter:
 XHXParameterType = TypeVar("XHXParameterType", bound="XHXParameter")
 
 
-class XHXParameter:
+class XHXParameter(Immutable):
     """
     A Transaction UNLOCK XHX parameter
     """
 
     re_xhx = re.compile("XHX\\(([0-9]+)\\)")
 
+    __slots__ = ("integer",)
+
     def __init__(self, integer: int) -> None:
         """
         Init XHXParameter instance
 
         :param integer: XHX number
         """
-        self.integer = integer
+        object.__setattr__(self, "integer", integer)
 
     def __eq__(self, other: Any) -> bool:
         """
@@ -326,8 +343,10 @@ class XHXParameter:
             return NotImplemented
         return self.integer == other.integer
 
-    def __hash__(self) -> int:
-        return hash(self.integer)
+    __hash__ = Immutable.__hash__
+
+    def _hash_key(self) -> Tuple[Any, ...]:
+        return (self.integer,)
 
     @classmethod
     def from_parameter(
@@ -392,24 +411,26 @@ class UnlockParameter:
 UnlockType = TypeVar("UnlockType", bound="Unlock")
 
 
-class Unlock:
+class Unlock(Immutable):
     """
     A Transaction UNLOCK
     """
 
     re_inline = re.compile("([0-9]+):((?:SIG\\([0-9]+\\)|XHX\\([0-9]+\\)|\\s)+)")
 
+    __slots__ = ("index", "parameters")
+
     def __init__(
-        self, index: int, parameters: List[Union[SIGParameter, XHXParameter]]
+        self, index: int, parameters: Sequence[Union[SIGParameter, XHXParameter]]
     ) -> None:
         """
         Init Unlock instance
 
         :param index: Index number
-        :param parameters: List of UnlockParameter instances
+        :param parameters: List of UnlockParameter instances, stored as a tuple
         """
-        self.index = index
-        self.parameters = parameters
+        object.__setattr__(self, "index", index)
+        object.__setattr__(self, "parameters", tuple(parameters))
 
     def __eq__(self, other: Any) -> bool:
         """
@@ -424,8 +445,10 @@ class Unlock:
                 params_equals = False
         return self.index == other.index and params_equals
 
-    def __hash__(self) -> int:
-        return hash((self.index, self.parameters))
+    __hash__ = Immutable.__hash__
+
+    def _hash_key(self) -> Tuple[Any, ...]:
+        return self.index, self.parameters
 
     @classmethod
     def from_inline(cls: Type[UnlockType], inline: str) -> UnlockType:
@@ -660,7 +683,38 @@ Comment: {comment}
         :param compact: Compact format string
         :return:
         """
-        lines = compact.splitlines(True)
+        return cls.from_compact_lines(currency, compact.splitlines(True))
+
+    @staticmethod
+    def compact_lines_count(header_data: Any) -> int:
+        """
+        Return the number of lines of a compact transaction from its parsed header
+
+        :param header_data: Match object of the compact header regex
+        :return:
+        """
+        issuers_num = int(header_data.group(2))
+        inputs_num = int(header_data.group(3))
+        unlocks_num = int(header_data.group(4))
+        outputs_num = int(header_data.group(5))
+        has_comment = int(header_data.group(6))
+        # header and blockstamp lines, one line per issuer, input, unlock and output,
+        # the comment line if any, then one signature line per issuer
+        return (
+            2 + issuers_num * 2 + inputs_num + unlocks_num + outputs_num + has_comment
+        )
+
+    @classmethod
+    def from_compact_lines(
+        cls: Type[TransactionType], currency: str, lines: Sequence[str]
+    ) -> TransactionType:
+        """
+        Return Transaction instance from the lines of a compact string format
+
+        :param currency: Name of the currency
+        :param lines: Compact format lines, with their line endings
+        :return:
+        """
         n = 0
 
         header_data = Transaction.re_header.match(lines[n])
@@ -822,6 +876,7 @@ Comment: {comment}
             time,
         )
 
+    @memoized
     def raw(self) -> str:
         """
         Return raw string format from the instance
@@ -60,7 +60,7 @@ class HandshakeMessage(Document):
 
         if signature is not None:
             # verify signature
-            verifying_key = VerifyingKey(self.pubkey)
+            verifying_key = VerifyingKey.for_pubkey(self.pubkey)
             verifying_key.verify_document(self)
 
     def raw(self):
@@ -17,9 +17,11 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from typing import Optional, TypeVar, Type, Any, Union
 
+import pypeg2
 from pypeg2 import re, attr, Keyword, Enum, contiguous, maybe_some, whitespace, K
 
 from ..constants import PUBKEY_REGEX, HASH_REGEX
+from ..tools import LRUCache
 
 
 class Pubkey(str):
@@ -46,11 +48,36 @@ class Int(str):
     regex = re.compile(r"[0-9]+")
 
 
+class Freezable:
+    """
+    Transaction output condition element which can be made read-only
+
+    Frozen instances are shared by the outputs using the same condition.
+    """
+
+    frozen = False
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self.frozen:
+            raise AttributeError(
+                "Can not set {0} of a frozen {1}".format(name, type(self).__name__)
+            )
+        super().__setattr__(name, value)
+
+    def freeze(self) -> None:
+        """
+        Make the instance read-only
+
+        :return:
+        """
+        object.__setattr__(self, "frozen", True)
+
+
 # required to type hint cls in classmethod
 SIGType = TypeVar("SIGType", bound="SIG")
 
 
-class SIG:
+class SIG(Freezable):
     """
     SIGnature function in transaction output condition
     """
@@ -110,7 +137,7 @@ class SIG:
 CSVType = TypeVar("CSVType", bound="CSV")
 
 
-class CSV:
+class CSV(Freezable):
     """
     CSV function in transaction output condition
     """
@@ -169,7 +196,7 @@ class CSV:
 CLTVType = TypeVar("CLTVType", bound="CLTV")
 
 
-class CLTV:
+class CLTV(Freezable):
     """
     CLTV function in transaction output condition
     """
@@ -228,7 +255,7 @@ class CLTV:
 XHXType = TypeVar("XHXType", bound="XHX")
 
 
-class XHX:
+class XHX(Freezable):
     """
     XHX function in transaction output condition
     """
@@ -323,7 +350,7 @@ class Operator(Keyword):
 ConditionType = TypeVar("ConditionType", bound="Condition")
 
 
-class Condition:
+class Condition(Freezable):
     """
     Condition expression in transaction output
 
@@ -331,6 +358,9 @@ class Condition:
 
     grammar = None
 
+    # composed text, cached by compose_condition once the condition is frozen
+    composed = None  # type: Optional[str]
+
     def __init__(self, value: str = "") -> None:
         """
         Init Condition instance
@@ -356,7 +386,9 @@ class Condition:
         )
 
     def __hash__(self) -> int:
-        return hash((self.value, self.left, self.right, self.op))
+        # the PEG grammar stores the whitespaces around the operator as a list in value
+        value = tuple(self.value) if isinstance(self.value, list) else self.value
+        return hash((value, self.left, self.right, self.op))
 
     def __str__(self) -> str:
         return self.value
@@ -384,6 +416,17 @@ class Condition:
             condition.right = right
         return condition
 
+    def freeze(self) -> None:
+        """
+        Make the condition and all its elements read-only
+
+        :return:
+        """
+        for element in (self.left, self.right):
+            if isinstance(element, Freezable):
+                element.freeze()
+        super().freeze()
+
     def compose(self, parser: Any, grammar: Any = None, attr_of: str = None) -> str:
         """
         Return the Condition as string format
@@ -423,3 +466,180 @@ Condition.grammar = contiguous(
         attr("right", [SIG, XHX, CSV, CLTV, ("(", Condition, ")")]),
     ),
 )
+
+# Fast path of parse_condition for the common single function and two functions
+# conditions, as written by clients, like "SIG(pubkey)" or "SIG(pubkey) || XHX(hash)"
+re_function = (
+    "(?:SIG\\(({pubkey_regex})\\)|XHX\\(({hash_regex})\\)|CSV\\(([0-9]+)\\)"
+    "|CLTV\\(([0-9]+)\\))".format(pubkey_regex=PUBKEY_REGEX, hash_regex=HASH_REGEX)
+)
+re_fast_condition = re.compile(
+    "{function}(?: (&&|\\|\\||AND|OR) {function})?".format(function=re_function)
+)
+
+
+def _function_from_groups(
+    pubkey: Optional[str],
+    sha_hash: Optional[str],
+    time: Optional[str],
+    timestamp: Optional[str],
+) -> Union[SIG, XHX, CSV, CLTV]:
+    """
+    Return the function instance from the groups of re_function
+
+    :param pubkey: SIG group
+    :param sha_hash: XHX group
+    :param time: CSV group
+    :param timestamp: CLTV group
+    :return:
+    """
+    if pubkey is not None:
+        function = SIG()  # type: Union[SIG, XHX, CSV, CLTV]
+        function.pubkey = Pubkey(pubkey)
+    elif sha_hash is not None:
+        function = XHX()
+        function.sha_hash = Hash(sha_hash)
+    elif time is not None:
+        function = CSV()
+        function.time = Int(time)
+    else:
+        function = CLTV()
+        function.timestamp = Int(timestamp)
+    return function
+
+
+def parse_condition(text: str) -> Condition:
+    """
+    Return the Condition instance of a transaction output condition text
+
+    Common conditions are parsed with a regular expression, others with the PEG grammar.
+    Both give the same Condition instance.
+
+    :param text: Condition text
+    :return:
+    """
+    match = re_fast_condition.fullmatch(text)
+    if match is None:
+        return pypeg2.parse(text, Condition)
+
+    groups = match.groups()
+    condition = Condition()
+    condition.left = _function_from_groups(*groups[0:4])
+    if groups[4] is not None:
+        # the PEG grammar stores the whitespaces around the operator in value
+        condition.value = [" ", " "]  # type: ignore
+        condition.op = Operator(groups[4])
+        condition.right = _function_from_groups(*groups[5:9])
+    return condition
+
+
+def compose_condition(condition: Condition) -> str:
+    """
+    Return the text of a Condition instance
+
+    Conditions made of functions, operators and sub conditions are composed directly,
+    others with the PEG grammar.
+
+    :param condition: Condition instance
+    :return:
+    """
+    if condition.composed is not None:
+        return condition.composed
+    try:
+        text = _compose(condition)
+    except TypeError:
+        text = pypeg2.compose(condition, Condition)
+    if condition.frozen:
+        object.__setattr__(condition, "composed", text)
+    return text
+
+
+def _compose(thing: Any) -> str:
+    """
+    Return the text of a Condition instance or of one of its elements
+
+    Raise TypeError if thing is not composable without the PEG grammar
+
+    :param thing: Condition, function or operator instance
+    :return:
+    """
+    if type(thing) in (SIG, XHX, CSV, CLTV, Operator):
+        return thing.compose()
+    if type(thing) is not Condition:
+        raise TypeError("Can not compose {0}".format(type(thing)))
+
+    left = _compose(thing.left)
+    if type(thing.left) is Condition:
+        left = "({0})".format(left)
+    if not thing.op:
+        return left
+
+    right = _compose(thing.right)
+    if type(thing.right) is Condition:
+        right = "({0})".format(right)
+    return "{0} {1} {2}".format(left, _compose(thing.op), right)
+
+
+CONDITION_TABLE_SIZE = 65536
+
+
+def intern_condition(text: str) -> Condition:
+    """
+    Return the frozen Condition instance of text, with its composed text
+
+    Raise SyntaxError if text is not a valid condition.
+
+    :param text: Condition text
+    :return:
+    """
+    condition = parse_condition(text)
+    condition.freeze()
+    compose_condition(condition)
+    return condition
+
+
+def copy_condition(condition: Condition) -> Condition:
+    """
+    Return a mutable copy of a condition, like the frozen ones of the condition table
+
+    :param condition: Condition instance
+    :return:
+    """
+    return parse_condition(compose_condition(condition))
+
+
+class ConditionTable(LRUCache[Condition]):
+    """
+    Thread safe LRU intern table of frozen Condition instances by condition text
+
+    The outputs locked by the same condition share a single Condition instance, and
+    its composed text, instead of parsing their own. The shared instances are frozen:
+    assigning their attributes raises AttributeError. Use copy_condition to get a
+    mutable copy, or disable the table to parse a mutable condition for each output.
+    """
+
+    def __init__(self, maxsize: Optional[int] = CONDITION_TABLE_SIZE) -> None:
+        """
+        Init an empty ConditionTable instance
+
+        :param maxsize: Maximum number of conditions, None for no limit, 0 to disable
+        """
+        super().__init__(intern_condition, maxsize)
+
+    def get(self, text: str) -> Condition:
+        """
+        Return the frozen Condition instance of text, parsed if not in the table
+
+        When the table is disabled, a new mutable Condition instance is returned.
+        Raise SyntaxError if text is not a valid condition.
+
+        :param text: Condition text
+        :return:
+        """
+        if self.maxsize == 0:
+            return parse_condition(text)
+        return super().get(text)
+
+
+# shared table used by OutputSource.condition_from_text
+condition_table = ConditionTable()
@@ -0,0 +1,410 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import mmap
+import os
+import random
+import string
+import struct
+from typing import Iterable, Iterator, Optional, Tuple
+
+from duniterpy.api.client import Client, WSConnection, validate
+from duniterpy.api.ws2p import requests
+from duniterpy.documents.block import Block
+from duniterpy.helpers.blockchain import (
+    sync_parsed_json_blocks,
+    SYNC_CHUNK_SIZE,
+    SYNC_CONCURRENCY,
+)
+
+# Files of a block store directory
+BLOCKS_FILENAME = "blocks.raw"
+INDEX_FILENAME = "blocks.idx"
+
+# Index header: magic and number of the first block
+INDEX_MAGIC = b"DPYBLK01"
+INDEX_HEADER = struct.Struct("<8sQ")
+# Index record of each block: offset and length of its signed raw, binary hash
+INDEX_RECORD = struct.Struct("<QI32s")
+
+# WS2P nodes answer at most 5000 blocks by BLOCKS_CHUNK request
+WS2P_CHUNK_SIZE = 5000
+
+
+class BlockStore:
+    """
+    Append-only store of the signed raw blocks of a chain
+
+    The store is a directory of two files: the signed raw documents of the blocks one
+    after the other, and a fixed-width index mapping each block number to the offset,
+    length and hash of its document. The index is memory mapped, so opening a store
+    does not read the blocks and each block is read and parsed when requested.
+
+    Usage:
+
+        with BlockStore("/var/lib/g1") as store:
+            await store.sync(client, current["number"])
+            print(store[12345].issuer)
+    """
+
+    def __init__(self, path: str, readonly: bool = False) -> None:
+        """
+        Open the block store of the directory path, created if needed
+
+        Data of an interrupted append is dropped.
+
+        :param path: Directory of the store files
+        :param readonly: True to open the store in read only mode
+        """
+        self.path = path
+        self.readonly = readonly
+        mode = "rb" if readonly else "a+b"
+        if not readonly:
+            os.makedirs(path, exist_ok=True)
+        self._blocks_file = open(os.path.join(path, BLOCKS_FILENAME), mode)
+        self._index_file = open(os.path.join(path, INDEX_FILENAME), mode)
+
+        index_size = os.fstat(self._index_file.fileno()).st_size
+        if index_size < INDEX_HEADER.size:
+            if readonly:
+                raise ValueError("{0} is not a block store".format(path))
+            self._write_header(0)
+            index_size = INDEX_HEADER.size
+        self._index_file.seek(0)
+        magic, self.first_number = INDEX_HEADER.unpack(
+            self._index_file.read(INDEX_HEADER.size)
+        )
+        if magic != INDEX_MAGIC:
+            raise ValueError("{0} is not a block store".format(path))
+
+        self._count = (index_size - INDEX_HEADER.size) // INDEX_RECORD.size
+        self._index = None  # type: Optional[mmap.mmap]
+        self._mapped_count = 0
+        self._blocks_size = self._end_offset()
+        if not readonly:
+            self._recover(index_size)
+
+    def _write_header(self, first_number: int) -> None:
+        self._index_file.truncate(0)
+        self._index_file.write(INDEX_HEADER.pack(INDEX_MAGIC, first_number))
+        self._index_file.flush()
+
+    def _recover(self, index_size: int) -> None:
+        """
+        Drop the partial index record and the blocks data not indexed
+
+        :param index_size: Size of the index file
+        :return:
+        """
+        expected_size = INDEX_HEADER.size + self._count * INDEX_RECORD.size
+        if index_size != expected_size:
+            self._index_file.truncate(expected_size)
+        if os.fstat(self._blocks_file.fileno()).st_size != self._blocks_size:
+            self._blocks_file.truncate(self._blocks_size)
+
+    def _end_offset(self) -> int:
+        if self._count == 0:
+            return 0
+        offset, length, _ = self._record(self._count - 1)
+        return offset + length
+
+    def _record(self, index: int) -> Tuple[int, int, bytes]:
+        """
+        Return the index record of the index-th block of the store
+
+        :param index: Position of the block in the store
+        :return:
+        """
+        if index >= self._mapped_count:
+            # map again to see the records appended since the last mapping
+            if self._index is not None:
+                self._index.close()
+            self._index = mmap.mmap(
+                self._index_file.fileno(),
+                INDEX_HEADER.size + self._count * INDEX_RECORD.size,
+                access=mmap.ACCESS_READ,
+            )
+            self._mapped_count = self._count
+        return INDEX_RECORD.unpack_from(
+            self._index, INDEX_HEADER.size + index * INDEX_RECORD.size
+        )
+
+    def _position(self, number: int) -> int:
+        index = number - self.first_number
+        if not 0 <= index < self._count:
+            raise KeyError("Block {0} is not in the store".format(number))
+        return index
+
+    @property
+    def next_number(self) -> int:
+        """
+        Return the number of the next block to append
+
+        :return:
+        """
+        return self.first_number + self._count
+
+    @property
+    def current_number(self) -> Optional[int]:
+        """
+        Return the number of the last block of the store, None if it is empty
+
+        :return:
+        """
+        return self.next_number - 1 if self._count else None
+
+    def entry(self, number: int) -> Tuple[int, int, str]:
+        """
+        Return the offset, the length and the hash of the block number
+
+        Raise KeyError if the block is not in the store.
+
+        :param number: Block number
+        :return:
+        """
+        offset, length, block_hash = self._record(self._position(number))
+        return offset, length, block_hash.hex().upper()
+
+    def hash(self, number: int) -> str:
+        """
+        Return the hash of the block number
+
+        :param number: Block number
+        :return:
+        """
+        return self.entry(number)[2]
+
+    def signed_raw(self, number: int) -> str:
+        """
+        Return the signed raw document of the block number
+
+        :param number: Block number
+        :return:
+        """
+        offset, length, _ = self._record(self._position(number))
+        self._blocks_file.seek(offset)
+        return self._blocks_file.read(length).decode("ascii")
+
+    def block(self, number: int, lazy: bool = False) -> Block:
+        """
+        Return the Block instance of the block number
+
+        :param number: Block number
+        :param lazy: True to parse the block sections on first access, see
+        Block.from_signed_raw
+        :return:
+        """
+        return Block.from_signed_raw(self.signed_raw(number), lazy)
+
+    def blocks(
+        self, start: Optional[int] = None, end: Optional[int] = None, lazy: bool = False
+    ) -> Iterator[Block]:
+        """
+        Iterate on the Block instances from number start to end (included)
+
+        :param start: Number of the first block (optional, default first block)
+        :param end: Number of the last block (optional, default last block)
+        :param lazy: True to parse the block sections on first access
+        :return:
+        """
+        start = self.first_number if start is None else start
+        end = self.next_number - 1 if end is None else end
+        for number in range(start, end + 1):
+            yield self.block(number, lazy)
+
+    def append_signed_raw(
+        self,
+        number: int,
+        block_hash: str,
+        previous_hash: Optional[str],
+        signed_raw: str,
+    ) -> None:
+        """
+        Append the signed raw document of a block
+
+        Raise ValueError if the block does not follow the last block of the store.
+
+        :param number: Block number
+        :param block_hash: Block hash
+        :param previous_hash: Hash of the previous block, None for the root block
+        :param signed_raw: Signed raw document of the block
+        :return:
+        """
+        if self.readonly:
+            raise ValueError("Block store opened in read only mode")
+        if self._count == 0:
+            if number != self.first_number:
+                self._write_header(number)
+                self.first_number = number
+        elif number != self.next_number:
+            raise ValueError(
+                "Block {0} does not follow block {1}".format(
+                    number, self.current_number
+                )
+            )
+        elif previous_hash != self.hash(number - 1):
+            raise ValueError(
+                "Block {0} previous hash {1} does not match {2}".format(
+                    number, previous_hash, self.hash(number - 1)
+                )
+            )
+
+        data = signed_raw.encode("ascii")
+        self._blocks_file.write(data)
+        # the block is written before its index record, see _recover
+        self._blocks_file.flush()
+        self._index_file.write(
+            INDEX_RECORD.pack(self._blocks_size, len(data), bytes.fromhex(block_hash))
+        )
+        self._index_file.flush()
+        self._blocks_size += len(data)
+        self._count += 1
+
+    def append(self, block: Block) -> None:
+        """
+        Append a Block instance
+
+        :param block: Block instance
+        :return:
+        """
+        self.append_signed_raw(
+            block.number,
+            block.proof_of_work(),
+            block.prev_hash if block.number > 0 else None,
+            block.signed_raw(),
+        )
+
+    def extend_parsed_json(self, parsed_json_blocks: Iterable[dict]) -> None:
+        """
+        Append json blocks of BMA or WS2P, without parsing them
+
+        The hash of each block is computed from its document: raise ValueError if it
+        does not match the hash sent by the node.
+
+        :param parsed_json_blocks: Blocks as python dicts
+        :return:
+        """
+        for parsed_json_block in parsed_json_blocks:
+            signed_raw = Block.signed_raw_from_parsed_json(parsed_json_block)
+            block_hash = Block.proof_of_work_from_signed_raw(signed_raw)
+            if block_hash != parsed_json_block["hash"]:
+                raise ValueError(
+                    "Block {0} hash {1} does not match {2}".format(
+                        parsed_json_block["number"],
+                        parsed_json_block["hash"],
+                        block_hash,
+                    )
+                )
+            self.append_signed_raw(
+                parsed_json_block["number"],
+                block_hash,
+                parsed_json_block["previousHash"],
+                signed_raw,
+            )
+
+    def truncate(self, number: int) -> None:
+        """
+        Remove the blocks from number, to switch to another branch of the chain
+
+        :param number: Number of the first block removed
+        :return:
+        """
+        if self.readonly:
+            raise ValueError("Block store opened in read only mode")
+        count = max(0, min(self._count, number - self.first_number))
+        if count == self._count:
+            return
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+            self._mapped_count = 0
+        self._count = count
+        self._blocks_size = self._end_offset()
+        self._index_file.truncate(INDEX_HEADER.size + count * INDEX_RECORD.size)
+        self._blocks_file.truncate(self._blocks_size)
+
+    async def sync(
+        self,
+        client: Client,
+        end: int,
+        chunk_size: int = SYNC_CHUNK_SIZE,
+        concurrency: int = SYNC_CONCURRENCY,
+    ) -> None:
+        """
+        Append the blocks following the last block of the store up to end, fetched
+        with bma.blockchain.blocks
+
+        :param client: Client instance
+        :param end: Number of the last block
+        :param chunk_size: Number of blocks requested by window
+        :param concurrency: Maximum number of windows fetched in parallel
+        :return:
+        """
+        async for parsed_json_blocks in sync_parsed_json_blocks(
+            client, self.next_number, end, chunk_size, concurrency
+        ):
+            self.extend_parsed_json(parsed_json_blocks)
+
+    async def sync_ws2p(
+        self, ws: WSConnection, end: int, chunk_size: int = WS2P_CHUNK_SIZE
+    ) -> None:
+        """
+        Append the blocks following the last block of the store up to end, fetched
+        with WS2P getBlocks requests on a connection after handshake
+
+        :param ws: Web socket connection instance
+        :param end: Number of the last block
+        :param chunk_size: Number of blocks requested at once
+        :return:
+        """
+        while self.next_number <= end:
+            request_id = "".join(
+                random.choice(string.ascii_letters + string.digits) for _ in range(8)
+            )
+            count = min(chunk_size, end + 1 - self.next_number)
+            await ws.send_str(requests.get_blocks(request_id, self.next_number, count))
+            response = await ws.receive_json()
+            while response.get("resId") != request_id:
+                response = await ws.receive_json()
+            validate(response, requests.BLOCKS_RESPONSE_SCHEMA)
+            if not response["body"]:
+                raise ValueError("Node has no block from {0}".format(self.next_number))
+            self.extend_parsed_json(response["body"])
+
+    def close(self) -> None:
+        """
+        Close the store files
+
+        :return:
+        """
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        self._blocks_file.close()
+        self._index_file.close()
+
+    def __getitem__(self, number: int) -> Block:
+        return self.block(number)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "BlockStore":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
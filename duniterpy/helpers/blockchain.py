@@ -0,0 +1,294 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import functools
+import struct
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from duniterpy.api import bma
+from duniterpy.api.client import Client
+from duniterpy.documents.block import Block
+from duniterpy.tools import map_chunks
+
+# BMA nodes refuse blockchain/blocks requests above 5000 blocks
+SYNC_CHUNK_SIZE = 5000
+SYNC_CONCURRENCY = 4
+
+# Result forms of parse_blocks_parallel
+RESULT_BLOCK = "block"
+RESULT_SUMMARY = "summary"
+RESULT_STRUCT = "struct"
+
+# Number of signed raw blocks sent at once to a worker process
+PARSE_CHUNK_SIZE = 200
+
+# Packed BlockSummary: number, time, median time, members count, dividend, unit
+# base, transactions count, hash, previous hash, issuer (NUL padded ASCII)
+BLOCK_SUMMARY_STRUCT = struct.Struct("<IQQIQII64s64s44s")
+
+
+class BlockSummary(NamedTuple):
+    """
+    Header fields of a block, cheap to send between processes
+    """
+
+    number: int
+    hash: str
+    previous_hash: Optional[str]
+    issuer: str
+    time: int
+    median_time: int
+    members_count: int
+    ud: Optional[int]
+    unit_base: int
+    transactions_count: int
+
+    @classmethod
+    def from_block(cls, block: Block) -> "BlockSummary":
+        """
+        Return the BlockSummary instance of a Block instance
+
+        :param block: Block instance
+        :return:
+        """
+        return cls(
+            block.number,
+            block.proof_of_work(),
+            block.prev_hash if block.number > 0 else None,
+            block.issuer,
+            block.time,
+            block.mediantime,
+            block.members_count,
+            block.ud,
+            block.unit_base,
+            len(block.transactions),
+        )
+
+    def pack(self) -> bytes:
+        """
+        Return the summary packed with BLOCK_SUMMARY_STRUCT
+
+        :return:
+        """
+        return BLOCK_SUMMARY_STRUCT.pack(
+            self.number,
+            self.time,
+            self.median_time,
+            self.members_count,
+            self.ud or 0,
+            self.unit_base,
+            self.transactions_count,
+            self.hash.encode("ascii"),
+            (self.previous_hash or "").encode("ascii"),
+            self.issuer.encode("ascii"),
+        )
+
+    @classmethod
+    def unpack_from(cls, buffer: bytes, offset: int = 0) -> "BlockSummary":
+        """
+        Return the BlockSummary instance packed in buffer at offset
+
+        :param buffer: Packed summaries
+        :param offset: Position of the summary in buffer
+        :return:
+        """
+        (
+            number,
+            time,
+            median_time,
+            members_count,
+            ud,
+            unit_base,
+            transactions_count,
+            block_hash,
+            previous_hash,
+            issuer,
+        ) = BLOCK_SUMMARY_STRUCT.unpack_from(buffer, offset)
+        return cls(
+            number,
+            block_hash.rstrip(b"\x00").decode("ascii"),
+            previous_hash.rstrip(b"\x00").decode("ascii") or None,
+            issuer.rstrip(b"\x00").decode("ascii"),
+            time,
+            median_time,
+            members_count,
+            ud or None,
+            unit_base,
+            transactions_count,
+        )
+
+
+async def sync_blocks(
+    client: Client,
+    start: int,
+    end: int,
+    chunk_size: int = SYNC_CHUNK_SIZE,
+    concurrency: int = SYNC_CONCURRENCY,
+    lazy: bool = False,
+) -> AsyncIterator[Block]:
+    """
+    Iterate on the Block instances from number start to end (included)
+
+    The range is fetched by chunk_size windows with bma.blockchain.blocks, with at most
+    concurrency requests in flight. Windows are yielded in block number order, and a new
+    window is only requested once the consumer has taken a previous one.
+
+    Usage:
+
+        async for block in sync_blocks(client, 0, 10000):
+            print(block.number)
+
+    :param client: Client instance
+    :param start: Number of the first block
+    :param end: Number of the last block
+    :param chunk_size: Number of blocks requested by window
+    :param concurrency: Maximum number of windows fetched in parallel
+    :param lazy: True to parse the block sections on first access, see Block.from_signed_raw
+    :return:
+    """
+    async for parsed_json_blocks in sync_parsed_json_blocks(
+        client, start, end, chunk_size, concurrency
+    ):
+        for parsed_json_block in parsed_json_blocks:
+            yield Block.from_parsed_json(parsed_json_block, lazy)
+
+
+async def sync_parsed_json_blocks(
+    client: Client,
+    start: int,
+    end: int,
+    chunk_size: int = SYNC_CHUNK_SIZE,
+    concurrency: int = SYNC_CONCURRENCY,
+) -> AsyncIterator[List[dict]]:
+    """
+    Iterate on the windows of json blocks from number start to end (included), as
+    returned by bma.blockchain.blocks, see sync_blocks
+
+    :param client: Client instance
+    :param start: Number of the first block
+    :param end: Number of the last block
+    :param chunk_size: Number of blocks requested by window
+    :param concurrency: Maximum number of windows fetched in parallel
+    :return:
+    """
+    if chunk_size < 1 or concurrency < 1:
+        raise ValueError("chunk_size and concurrency must be positive")
+
+    windows = iter(range(start, end + 1, chunk_size))
+    pending = deque()  # type: Deque[asyncio.Future]
+
+    def fetch_next_window() -> None:
+        window_start = next(windows, None)
+        if window_start is not None:
+            count = min(chunk_size, end + 1 - window_start)
+            pending.append(
+                asyncio.ensure_future(
+                    client(bma.blockchain.blocks, count, window_start)
+                )
+            )
+
+    try:
+        for _ in range(concurrency):
+            fetch_next_window()
+
+        while pending:
+            parsed_json_blocks = await pending.popleft()
+            fetch_next_window()
+            yield parsed_json_blocks
+    finally:
+        # consumer stopped early or a request failed: drop the windows in flight
+        for future in pending:
+            future.cancel()
+
+
+def _parse_chunk(signed_raws: List[str], result: str) -> Any:
+    """
+    Parse signed raw blocks in a worker process
+
+    :param signed_raws: Signed raw blocks
+    :param result: RESULT_BLOCK, RESULT_SUMMARY or RESULT_STRUCT
+    :return: the list of Block or BlockSummary instances, or the packed summaries
+    """
+    blocks = (Block.from_signed_raw(signed_raw) for signed_raw in signed_raws)
+    if result == RESULT_BLOCK:
+        return list(blocks)
+    if result == RESULT_SUMMARY:
+        return [BlockSummary.from_block(block) for block in blocks]
+    return b"".join(BlockSummary.from_block(block).pack() for block in blocks)
+
+
+def _chunk_results(chunk_result: Any, result: str) -> Iterable[Any]:
+    if result != RESULT_STRUCT:
+        return chunk_result
+    return (
+        BlockSummary.unpack_from(chunk_result, offset)
+        for offset in range(0, len(chunk_result), BLOCK_SUMMARY_STRUCT.size)
+    )
+
+
+def parse_blocks_parallel(
+    signed_raws: Iterable[str],
+    workers: Optional[int] = None,
+    result: str = RESULT_BLOCK,
+    chunk_size: int = PARSE_CHUNK_SIZE,
+) -> Iterator[Any]:
+    """
+    Iterate on the blocks parsed from signed raw documents by a pool of processes, in
+    the order of signed_raws
+
+    Chunks of chunk_size documents are sent to the workers by map_chunks, so
+    signed_raws can be a lazy iterable of a whole chain.
+
+    Result forms:
+
+    - RESULT_BLOCK: Block instances
+    - RESULT_SUMMARY: BlockSummary instances, much smaller to send back
+    - RESULT_STRUCT: BlockSummary instances sent back packed in bytes
+
+    Usage:
+
+        with open("chain.raw") as file:
+            for summary in parse_blocks_parallel(read_blocks(file), result=RESULT_STRUCT):
+                print(summary.number, summary.hash)
+
+    :param signed_raws: Signed raw blocks
+    :param workers: Number of processes, default to the number of cores. With one
+    worker, the blocks are parsed in the calling process.
+    :param result: RESULT_BLOCK, RESULT_SUMMARY or RESULT_STRUCT
+    :param chunk_size: Number of documents sent at once to a worker
+    :return:
+    """
+    if result not in (RESULT_BLOCK, RESULT_SUMMARY, RESULT_STRUCT):
+        raise ValueError("Unknown result form {0}".format(result))
+    for _, chunk_result in map_chunks(
+        functools.partial(_parse_chunk, result=result),
+        signed_raws,
+        workers,
+        chunk_size,
+    ):
+        yield from _chunk_results(chunk_result, result)
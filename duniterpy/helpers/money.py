@@ -15,9 +15,20 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from typing import Union, Any
+from array import array
+from itertools import compress, repeat
+from operator import eq, and_, mul
+from typing import Union, Any, Dict, Iterable, List, Optional, Sequence
+
+from duniterpy.documents.transaction import InputSource
 from duniterpy.grammars.output import SIG, CSV, CLTV, XHX, Condition
 
+# source types stored in SourceTable.types, by code
+SOURCE_TYPES = ("D", "T")
+
+# maximum number of explored branches of the optimal coin selection
+OPTIMAL_SELECTION_MAX_TRIES = 100000
+
 
 def output_available(
     condition: Condition, comparison: Any, value: Union[str, int]
@@ -41,3 +52,287 @@ def output_available(
         return comparison(condition.left.sha_hash, value)
 
     return False
+
+
+class SourceTable:
+    """
+    Columnar table of the sources of a wallet, as returned by bma.tx.sources
+
+    Amounts, bases and offsets are stored in array('q') columns, source types in an
+    array('b') column of SOURCE_TYPES codes, and identifiers (pubkey of dividends, hash
+    of transactions) are interned and stored as indexes in an array('q') column.
+    InputSource instances are only built for the selected sources.
+
+    Usage:
+
+        response = await client(bma.tx.sources, pubkey)
+        table = SourceTable.from_bma_sources(response["sources"])
+        inputs = table.select(1500, 0, strategy="optimal")
+    """
+
+    def __init__(self) -> None:
+        """
+        Init an empty SourceTable instance
+        """
+        self.amounts = array("q")
+        self.bases = array("q")
+        self.types = array("b")
+        self.identifiers = array("q")
+        self.offsets = array("q")
+        # interned identifiers, by index and by value
+        self.identifiers_values = []  # type: List[str]
+        self._identifiers_indexes = {}  # type: Dict[str, int]
+
+    @classmethod
+    def from_bma_sources(cls, sources: Iterable[dict]) -> "SourceTable":
+        """
+        Return a SourceTable instance from the sources list of a bma.tx.sources response
+
+        :param sources: List of source dicts, with type, noffset, identifier, amount and
+        base keys
+        :return:
+        """
+        table = cls()
+        for source in sources:
+            table.append(
+                source["amount"],
+                source["base"],
+                source["type"],
+                source["identifier"],
+                source["noffset"],
+            )
+        return table
+
+    def append(
+        self, amount: int, base: int, source: str, origin_id: str, index: int
+    ) -> None:
+        """
+        Add a source to the table
+
+        :param amount: Amount of the source
+        :param base: Base of the source
+        :param source: D if dividend, T if transaction
+        :param origin_id: Public key if dividend, transaction hash if transaction
+        :param index: Block number if dividend, output index if transaction
+        :return:
+        """
+        identifier = self._identifiers_indexes.get(origin_id)
+        if identifier is None:
+            identifier = len(self.identifiers_values)
+            self._identifiers_indexes[origin_id] = identifier
+            self.identifiers_values.append(origin_id)
+
+        self.amounts.append(amount)
+        self.bases.append(base)
+        self.types.append(SOURCE_TYPES.index(source))
+        self.identifiers.append(identifier)
+        self.offsets.append(index)
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def input_source(self, row: int) -> InputSource:
+        """
+        Return the InputSource instance of a row
+
+        :param row: Index of the source in the table
+        :return:
+        """
+        return InputSource(
+            self.amounts[row],
+            self.bases[row],
+            SOURCE_TYPES[self.types[row]],
+            self.identifiers_values[self.identifiers[row]],
+            self.offsets[row],
+        )
+
+    def values(self) -> List[int]:
+        """
+        Return the list of the values of the sources, amount * 10^base
+
+        :return:
+        """
+        return list(map(mul, self.amounts, map(pow, repeat(10), self.bases)))
+
+    def total(self, source: Optional[str] = None) -> int:
+        """
+        Return the total value of the sources, in base 0 units
+
+        :param source: D or T to only count dividends or transactions, None for all
+        :return:
+        """
+        total = 0
+        for base in set(self.bases):
+            mask = map(eq, self.bases, repeat(base))
+            if source is not None:
+                mask = map(
+                    and_,
+                    mask,
+                    map(eq, self.types, repeat(SOURCE_TYPES.index(source))),
+                )
+            total += sum(compress(self.amounts, mask)) * 10**base
+        return total
+
+    def filter(self, source: str) -> "SourceTable":
+        """
+        Return a new SourceTable instance with the sources of a type
+
+        The interned identifiers are copied, so sources appended to either table do not
+        change the other.
+
+        :param source: D for dividends, T for transactions
+        :return:
+        """
+        code = SOURCE_TYPES.index(source)
+        mask = array("b", map(eq, self.types, repeat(code)))
+
+        table = SourceTable()
+        table.amounts = array("q", compress(self.amounts, mask))
+        table.bases = array("q", compress(self.bases, mask))
+        table.types = array("b", compress(self.types, mask))
+        table.identifiers = array("q", compress(self.identifiers, mask))
+        table.offsets = array("q", compress(self.offsets, mask))
+        table.identifiers_values = list(self.identifiers_values)
+        table._identifiers_indexes = dict(self._identifiers_indexes)
+        return table
+
+    def select(
+        self,
+        amount: int,
+        base: int = 0,
+        strategy: str = "greedy",
+        max_inputs: Optional[int] = None,
+    ) -> List[InputSource]:
+        """
+        Return the InputSource instances of sources covering amount * 10^base
+
+        The greedy strategy takes the largest sources first. The optimal strategy
+        searches the sources combination with the least change, exploring at most
+        OPTIMAL_SELECTION_MAX_TRIES branches, and falls back to the greedy one.
+
+        Raise ValueError if the sources can not cover the amount.
+
+        :param amount: Amount to cover
+        :param base: Base of the amount
+        :param strategy: "greedy" or "optimal"
+        :param max_inputs: Maximum number of selected sources, None for no limit
+        :return:
+        """
+        if strategy not in ("greedy", "optimal"):
+            raise ValueError("Unknown coin selection strategy {0}".format(strategy))
+
+        target = amount * 10**base
+        values = self.values()
+        rows = sorted(range(len(values)), key=values.__getitem__, reverse=True)
+        if max_inputs is None:
+            max_inputs = len(rows)
+
+        selected = None  # type: Optional[List[int]]
+        if strategy == "optimal":
+            selected = _branch_and_bound(
+                [values[row] for row in rows], target, max_inputs
+            )
+            if selected is not None:
+                selected = [rows[index] for index in selected]
+        if selected is None:
+            selected = _largest_first(values, rows, target, max_inputs)
+        if selected is None:
+            raise ValueError(
+                "Sources can not cover {0} with {1} inputs".format(target, max_inputs)
+            )
+
+        return [self.input_source(row) for row in selected]
+
+
+def _largest_first(
+    values: Sequence[int], rows: Sequence[int], target: int, max_inputs: int
+) -> Optional[List[int]]:
+    """
+    Return the rows of the largest values covering target, None if not possible
+
+    :param values: Values of the sources
+    :param rows: Rows sorted by decreasing value
+    :param target: Value to cover
+    :param max_inputs: Maximum number of rows
+    :return:
+    """
+    selected = []  # type: List[int]
+    total = 0
+    for row in rows[:max_inputs]:
+        if total >= target:
+            break
+        selected.append(row)
+        total += values[row]
+    return selected if total >= target else None
+
+
+def _branch_and_bound(
+    values: Sequence[int], target: int, max_inputs: int
+) -> Optional[List[int]]:
+    """
+    Return the indexes of the values with the smallest sum covering target
+
+    Depth first search including the largest values first, pruning branches which can
+    not reach target, and values whose inclusion can not give a smaller sum than the
+    best one. Return the best combination found within OPTIMAL_SELECTION_MAX_TRIES
+    steps, None if none found.
+
+    :param values: Values sorted by decreasing value
+    :param target: Value to cover
+    :param max_inputs: Maximum number of values
+    :return:
+    """
+    # remaining[index] is the sum of values[index:]
+    remaining = [0] * (len(values) + 1)
+    for index in range(len(values) - 1, -1, -1):
+        remaining[index] = remaining[index + 1] + values[index]
+
+    best = None  # type: Optional[List[int]]
+    best_total = None  # type: Optional[int]
+    selected = []  # type: List[int]
+    total = 0
+    index = 0
+    for _ in range(OPTIMAL_SELECTION_MAX_TRIES):
+        if total >= target:
+            if best_total is None or total < best_total:
+                best = list(selected)
+                best_total = total
+            if total == target:
+                break
+            backtrack = True
+        else:
+            backtrack = (
+                index == len(values)
+                or len(selected) == max_inputs
+                or total + remaining[index] < target
+            )
+
+        if (
+            not backtrack
+            and best_total is not None
+            and total + values[index] >= best_total
+        ):
+            # including values[index], or an equal value, can not improve the best sum,
+            # try the smaller ones
+            value = values[index]
+            while index < len(values) and values[index] == value:
+                index += 1
+            continue
+
+        if not backtrack:
+            selected.append(index)
+            total += values[index]
+            index += 1
+            continue
+
+        if not selected:
+            break
+        # exclude the last included value, and the following equal ones which would
+        # give the same combinations
+        last = selected.pop()
+        total -= values[last]
+        index = last + 1
+        while index < len(values) and values[index] == values[last]:
+            index += 1
+
+    return best
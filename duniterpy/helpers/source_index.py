@@ -0,0 +1,263 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from duniterpy.documents.block import Block
+from duniterpy.documents.transaction import InputSource, OutputSource
+from duniterpy.grammars.output import Condition, SIG
+from duniterpy.helpers.money import SourceTable
+
+# Number of blocks which can be rolled back, the blockchain does not fork deeper
+ROLLBACK_DEPTH = 100
+
+
+class BlockChanges:
+    """
+    Changes of the source index made by a block, to roll it back
+    """
+
+    __slots__ = ("number", "sources", "joined", "excluded")
+
+    def __init__(self, number: int) -> None:
+        """
+        Init an empty BlockChanges instance
+
+        :param number: Block number
+        """
+        self.number = number
+        # sources created, with None, or spent, with their output, in block order
+        self.sources = []  # type: List[Tuple[InputSource, Optional[OutputSource]]]
+        self.joined = []  # type: List[str]
+        self.excluded = []  # type: List[str]
+
+
+def condition_pubkey(condition: Condition) -> Optional[str]:
+    """
+    Return the public key of a SIG(pubkey) condition, None for other conditions
+
+    :param condition: Condition instance
+    :return:
+    """
+    while isinstance(condition, Condition) and not condition.op:
+        # unwrap parenthesized conditions
+        condition = condition.left
+    if isinstance(condition, SIG):
+        return condition.pubkey
+    return None
+
+
+class SourceIndex:
+    """
+    Unspent sources built from the blocks, applied in order
+
+    Universal dividends are created for the members of the block, after its joiners
+    and excluded members. Transaction outputs are created and transaction inputs
+    spent in the order of the block transactions. The sources locked by a single
+    SIG(pubkey) condition are indexed by public key, like bma.tx.sources.
+
+    The last max_rollback blocks can be rolled back on a fork.
+
+    Usage:
+
+        index = SourceIndex()
+        async for block in sync_blocks(client, 0, current["number"]):
+            index.apply(block)
+        print(index.balance(pubkey))
+    """
+
+    def __init__(
+        self, max_rollback: int = ROLLBACK_DEPTH, members: Iterable[str] = ()
+    ) -> None:
+        """
+        Init an empty SourceIndex instance
+
+        :param max_rollback: Number of blocks which can be rolled back
+        :param members: Public keys of the members, to start after the root block
+        """
+        self.sources = {}  # type: Dict[InputSource, OutputSource]
+        self.members = set(members)  # type: Set[str]
+        self.current_number = None  # type: Optional[int]
+        self._by_pubkey = {}  # type: Dict[str, Set[InputSource]]
+        self._balances = {}  # type: Dict[str, int]
+        self._changes = deque(maxlen=max_rollback)  # type: Deque[BlockChanges]
+
+    def _add(self, source: InputSource, output: OutputSource) -> None:
+        self.sources[source] = output
+        pubkey = condition_pubkey(output.condition)
+        if pubkey is not None:
+            self._by_pubkey.setdefault(pubkey, set()).add(source)
+            self._balances[pubkey] = (
+                self._balances.get(pubkey, 0) + output.amount * 10**output.base
+            )
+
+    def _remove(self, source: InputSource) -> OutputSource:
+        output = self.sources.pop(source)
+        pubkey = condition_pubkey(output.condition)
+        if pubkey is not None:
+            sources = self._by_pubkey[pubkey]
+            sources.discard(source)
+            if sources:
+                self._balances[pubkey] -= output.amount * 10**output.base
+            else:
+                del self._by_pubkey[pubkey]
+                del self._balances[pubkey]
+        return output
+
+    def apply(self, block: Block) -> None:
+        """
+        Apply the membership changes, the universal dividend and the transactions
+        of the block following the current block
+
+        Raise ValueError if the block does not follow the current block or spends a
+        source which is not in the index.
+
+        :param block: Block instance
+        :return:
+        """
+        if self.current_number is not None and block.number != self.current_number + 1:
+            raise ValueError(
+                "Block {0} does not follow block {1}".format(
+                    block.number, self.current_number
+                )
+            )
+        changes = BlockChanges(block.number)
+        try:
+            for joiner in block.joiners:
+                if joiner.issuer not in self.members:
+                    self.members.add(joiner.issuer)
+                    changes.joined.append(joiner.issuer)
+            for pubkey in block.excluded:
+                if pubkey in self.members:
+                    self.members.remove(pubkey)
+                    changes.excluded.append(pubkey)
+
+            if block.ud:
+                for pubkey in self.members:
+                    source = InputSource(
+                        block.ud, block.unit_base, "D", pubkey, block.number
+                    )
+                    self._add(
+                        source,
+                        OutputSource(
+                            block.ud, block.unit_base, "SIG({0})".format(pubkey)
+                        ),
+                    )
+                    changes.sources.append((source, None))
+
+            for transaction in block.transactions:
+                for source in transaction.inputs:
+                    if source not in self.sources:
+                        raise ValueError(
+                            "Block {0} spends unknown source {1}".format(
+                                block.number, source.inline()
+                            )
+                        )
+                    changes.sources.append((source, self._remove(source)))
+                tx_hash = transaction.sha_hash
+                for index, output in enumerate(transaction.outputs):
+                    source = InputSource(
+                        output.amount, output.base, "T", tx_hash, index
+                    )
+                    self._add(source, output)
+                    changes.sources.append((source, None))
+        except Exception:
+            # leave the index as before the block
+            self._undo(changes)
+            raise
+
+        self._changes.append(changes)
+        self.current_number = block.number
+
+    def _undo(self, changes: BlockChanges) -> None:
+        for source, output in reversed(changes.sources):
+            if output is None:
+                self._remove(source)
+            else:
+                self._add(source, output)
+        self.members.update(changes.excluded)
+        self.members.difference_update(changes.joined)
+
+    def rollback(self, count: int = 1) -> None:
+        """
+        Undo the last count blocks applied
+
+        Raise ValueError if less than count blocks can be rolled back.
+
+        :param count: Number of blocks
+        :return:
+        """
+        if count > len(self._changes):
+            raise ValueError(
+                "Only {0} blocks can be rolled back".format(len(self._changes))
+            )
+        for _ in range(count):
+            changes = self._changes.pop()
+            self._undo(changes)
+            self.current_number = changes.number - 1
+
+    def get(self, source: InputSource) -> Optional[OutputSource]:
+        """
+        Return the output of an unspent source, None if it is spent or unknown
+
+        :param source: InputSource instance
+        :return:
+        """
+        return self.sources.get(source)
+
+    def pubkey_sources(self, pubkey: str) -> List[InputSource]:
+        """
+        Return the unspent sources of pubkey
+
+        :param pubkey: Public key
+        :return:
+        """
+        return list(self._by_pubkey.get(pubkey, ()))
+
+    def balance(self, pubkey: str) -> int:
+        """
+        Return the total value of the unspent sources of pubkey, in base 0 units
+
+        :param pubkey: Public key
+        :return:
+        """
+        return self._balances.get(pubkey, 0)
+
+    def source_table(self, pubkey: str) -> SourceTable:
+        """
+        Return the SourceTable of the unspent sources of pubkey, to select inputs
+
+        :param pubkey: Public key
+        :return:
+        """
+        table = SourceTable()
+        for source in self._by_pubkey.get(pubkey, ()):
+            table.append(
+                source.amount,
+                source.base,
+                source.source,
+                source.origin_id,
+                source.index,
+            )
+        return table
+
+    def __contains__(self, source: InputSource) -> bool:
+        return source in self.sources
+
+    def __len__(self) -> int:
+        return len(self.sources)
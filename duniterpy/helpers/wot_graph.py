@@ -0,0 +1,371 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import heapq
+import math
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from duniterpy.documents.block import Block
+
+# G1 currency parameters used by the web of trust rules
+SIG_VALIDITY = 63115200
+SIG_QTY = 5
+X_PERCENT = 0.8
+STEP_MAX = 5
+
+# Positions of the parameters in the Parameters field of the root block
+PARAMETER_SIG_VALIDITY = 6
+PARAMETER_SIG_QTY = 7
+PARAMETER_X_PERCENT = 10
+PARAMETER_STEP_MAX = 12
+
+
+class WotGraph:
+    """
+    Web of trust graph built from the blocks, applied in order
+
+    Identities get an integer id in order of appearance. Each identity has the
+    adjacency dicts of its valid certifications, received and issued, mapping the
+    other identity id to the expiration time of the certification. Certifications
+    expire when the median time of a block reaches their expiration time.
+
+    The distance rule queries use, for each identity, the bitset of the sentries
+    reaching it in a number of steps. The bitsets are computed once for all the
+    queries, until the next block.
+
+    Usage:
+
+        graph = WotGraph()
+        async for block in sync_blocks(client, 0, current["number"]):
+            graph.apply(block)
+        print(graph.outdistanced(pubkey))
+    """
+
+    def __init__(
+        self,
+        sig_validity: int = SIG_VALIDITY,
+        sig_qty: int = SIG_QTY,
+        x_percent: float = X_PERCENT,
+        step_max: int = STEP_MAX,
+    ) -> None:
+        """
+        Init an empty WotGraph instance
+
+        The parameters are replaced by the ones of the root block, if applied.
+
+        :param sig_validity: Lifetime in seconds of the certifications
+        :param sig_qty: Minimum number of certifications received by a member
+        :param x_percent: Minimum part of the sentries at step_max steps of a member
+        :param step_max: Maximum distance between a member and the sentries
+        """
+        self.sig_validity = sig_validity
+        self.sig_qty = sig_qty
+        self.x_percent = x_percent
+        self.step_max = step_max
+        self.median_time = 0
+        self.pubkeys = []  # type: List[str]
+        self.uids = []  # type: List[str]
+        self.members = []  # type: List[bool]
+        self.revoked = []  # type: List[bool]
+        # certifications received and issued: other identity id -> expiration time
+        self.received = []  # type: List[Dict[int, int]]
+        self.issued = []  # type: List[Dict[int, int]]
+        self._ids = {}  # type: Dict[str, int]
+        # (expiration time, issuer id, receiver id), stale entries are skipped
+        self._expirations = []  # type: List[Tuple[int, int, int]]
+        # sentries bitsets by number of steps, reset by each block
+        self._reach = {}  # type: Dict[int, List[int]]
+        # sentry id -> sentry bit
+        self._sentries = None  # type: Optional[Dict[int, int]]
+
+    def node(self, pubkey: str) -> int:
+        """
+        Return the id of the identity pubkey, added if unknown
+
+        :param pubkey: Public key
+        :return:
+        """
+        node = self._ids.get(pubkey)
+        if node is None:
+            node = len(self.pubkeys)
+            self._ids[pubkey] = node
+            self.pubkeys.append(pubkey)
+            self.uids.append("")
+            self.members.append(False)
+            self.revoked.append(False)
+            self.received.append({})
+            self.issued.append({})
+        return node
+
+    def set_parameters(self, parameters: Sequence[str]) -> None:
+        """
+        Set the web of trust parameters from the Parameters field of the root block
+
+        :param parameters: Parameters of the currency
+        :return:
+        """
+        self.sig_validity = int(parameters[PARAMETER_SIG_VALIDITY])
+        self.sig_qty = int(parameters[PARAMETER_SIG_QTY])
+        self.x_percent = float(parameters[PARAMETER_X_PERCENT])
+        self.step_max = int(parameters[PARAMETER_STEP_MAX])
+
+    def certify(self, pubkey_from: str, pubkey_to: str, expires_on: int) -> None:
+        """
+        Add or renew the certification of pubkey_to by pubkey_from
+
+        :param pubkey_from: Public key of the issuer
+        :param pubkey_to: Public key of the receiver
+        :param expires_on: Expiration time of the certification
+        :return:
+        """
+        issuer, receiver = self.node(pubkey_from), self.node(pubkey_to)
+        self.received[receiver][issuer] = expires_on
+        self.issued[issuer][receiver] = expires_on
+        heapq.heappush(self._expirations, (expires_on, issuer, receiver))
+        self._reach.clear()
+        self._sentries = None
+
+    def expire(self, median_time: int) -> List[Tuple[str, str]]:
+        """
+        Remove the certifications expired at median_time
+
+        :param median_time: Median time of the blockchain
+        :return: the (issuer, receiver) public keys of the removed certifications
+        """
+        expired = []
+        while self._expirations and self._expirations[0][0] <= median_time:
+            expires_on, issuer, receiver = heapq.heappop(self._expirations)
+            # skip the renewed certifications
+            if self.received[receiver].get(issuer) == expires_on:
+                del self.received[receiver][issuer]
+                del self.issued[issuer][receiver]
+                expired.append((self.pubkeys[issuer], self.pubkeys[receiver]))
+        if expired:
+            self._reach.clear()
+            self._sentries = None
+        return expired
+
+    def apply(self, block: Block) -> None:
+        """
+        Apply the identities, memberships and certifications of the next block
+
+        :param block: Block instance
+        :return:
+        """
+        if block.parameters:
+            self.set_parameters(block.parameters)
+        self.median_time = block.mediantime
+        for identity in block.identities:
+            self.uids[self.node(identity.pubkey)] = identity.uid
+        for joiner in block.joiners:
+            self.members[self.node(joiner.issuer)] = True
+        for certification in block.certifications:
+            self.certify(
+                certification.pubkey_from,
+                certification.pubkey_to,
+                block.mediantime + self.sig_validity,
+            )
+        for revocation in block.revoked:
+            self.revoked[self.node(revocation.pubkey)] = True
+        for pubkey in block.excluded:
+            self.members[self.node(pubkey)] = False
+        self.expire(block.mediantime)
+        self._reach.clear()
+        self._sentries = None
+
+    def members_count(self) -> int:
+        return sum(self.members)
+
+    def y_sentries(self) -> int:
+        """
+        Return the number of certifications issued and received by a sentry
+
+        :return:
+        """
+        return math.ceil(self.members_count() ** (1 / self.step_max))
+
+    def sentries(self) -> Dict[int, int]:
+        """
+        Return the ids of the sentries, with their bit in the reach bitsets
+
+        :return:
+        """
+        if self._sentries is None:
+            y_sentries = self.y_sentries()
+            nodes = (
+                node
+                for node, member in enumerate(self.members)
+                if member
+                and len(self.issued[node]) >= y_sentries
+                and len(self.received[node]) >= y_sentries
+            )
+            self._sentries = {node: 1 << bit for bit, node in enumerate(nodes)}
+        return self._sentries
+
+    def is_sentry(self, pubkey: str) -> bool:
+        node = self._ids.get(pubkey)
+        return node is not None and node in self.sentries()
+
+    def reach(self, steps: int) -> List[int]:
+        """
+        Return for each identity the bitset of the sentries reaching it in at most
+        steps certifications, bit i standing for the i-th sentry
+
+        :param steps: Number of certifications
+        :return:
+        """
+        bitsets = self._reach.get(steps)
+        if bitsets is not None:
+            return bitsets
+        if steps == 0:
+            bitsets = [0] * len(self.pubkeys)
+            for node, bit in self.sentries().items():
+                bitsets[node] = bit
+        else:
+            previous = self.reach(steps - 1)
+            bitsets = list(previous)
+            for node, issuers in enumerate(self.received):
+                bitset = bitsets[node]
+                for issuer in issuers:
+                    # certifications issued by non members do not link the graph
+                    if self.members[issuer]:
+                        bitset |= previous[issuer]
+                bitsets[node] = bitset
+        self._reach[steps] = bitsets
+        return bitsets
+
+    def reachable(self, pubkey_from: str, pubkey_to: str, steps: int) -> bool:
+        """
+        Return True if pubkey_to is at most steps certifications from pubkey_from
+
+        :param pubkey_from: Public key of the first identity
+        :param pubkey_to: Public key of the last identity
+        :param steps: Maximum number of certifications
+        :return:
+        """
+        start, end = self._ids.get(pubkey_from), self._ids.get(pubkey_to)
+        if start is None or end is None:
+            return False
+        visited = {start}
+        frontier = [start]
+        for _ in range(steps):
+            if end in visited:
+                break
+            next_frontier = []
+            for node in frontier:
+                for receiver in self.issued[node]:
+                    if receiver not in visited:
+                        visited.add(receiver)
+                        next_frontier.append(receiver)
+            frontier = next_frontier
+        return end in visited
+
+    def outdistanced(self, pubkey: str, certifiers: Iterable[str] = ()) -> bool:
+        """
+        Return True if the identity breaks the distance rule: less than x_percent of
+        the sentries reach it in at most step_max certifications
+
+        :param pubkey: Public key of the identity
+        :param certifiers: Public keys of pending certifications of the identity
+        :return:
+        """
+        reach = self.reach(self.step_max - 1)
+        sentries = self.sentries()
+        node = self._ids.get(pubkey)
+        issuers = [] if node is None else list(self.received[node])
+        issuers += [self._ids[c] for c in certifiers if c in self._ids]
+
+        bitset = 0
+        for issuer in issuers:
+            if self.members[issuer]:
+                bitset |= reach[issuer]
+        sentries_count = len(sentries)
+        if node in sentries:
+            # the identity is not counted in its own sentries
+            bitset &= ~sentries[node]
+            sentries_count -= 1
+        if sentries_count <= 0:
+            return False
+        return bin(bitset).count("1") < self.x_percent * sentries_count
+
+    def certifiers_of(self, pubkey: str) -> Dict[str, int]:
+        """
+        Return the issuers of the valid certifications of pubkey, with their
+        expiration time
+
+        :param pubkey: Public key
+        :return:
+        """
+        node = self._ids.get(pubkey)
+        if node is None:
+            return {}
+        return {self.pubkeys[i]: expires for i, expires in self.received[node].items()}
+
+    def certified_by(self, pubkey: str) -> Dict[str, int]:
+        """
+        Return the receivers of the valid certifications of pubkey, with their
+        expiration time
+
+        :param pubkey: Public key
+        :return:
+        """
+        node = self._ids.get(pubkey)
+        if node is None:
+            return {}
+        return {self.pubkeys[i]: expires for i, expires in self.issued[node].items()}
+
+    def expiring(self, before: int) -> List[Tuple[int, str, str]]:
+        """
+        Return the valid certifications expiring before a time, by expiration time
+
+        :param before: Time
+        :return: the list of (expiration time, issuer, receiver)
+        """
+        return sorted(
+            (expires_on, self.pubkeys[issuer], self.pubkeys[receiver])
+            for expires_on, issuer, receiver in self._expirations
+            if expires_on < before and self.received[receiver].get(issuer) == expires_on
+        )
+
+    def requirements(
+        self, pending: Mapping[str, Iterable[str]]
+    ) -> Dict[str, Tuple[int, bool]]:
+        """
+        Return the requirements of identities, like bma.wot.requirements_of_pending
+
+        :param pending: Public keys of the identities with the public keys of their
+        pending certifications
+        :return: for each identity, its number of certifications, valid and pending,
+        and whether it is outdistanced
+        """
+        results = {}
+        for pubkey, certifiers in pending.items():
+            certifiers = set(certifiers)
+            node = self._ids.get(pubkey)
+            if node is not None:
+                certifiers.update(self.pubkeys[i] for i in self.received[node])
+            results[pubkey] = (
+                len(certifiers),
+                self.outdistanced(pubkey, certifiers),
+            )
+        return results
+
+    def __contains__(self, pubkey: str) -> bool:
+        return pubkey in self._ids
+
+    def __len__(self) -> int:
+        return len(self.pubkeys)
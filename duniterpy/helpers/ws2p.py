@@ -15,10 +15,9 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-import jsonschema
-from typing import Union
+from typing import Union, Optional
 from duniterpy.api import ws2p, bma
-from duniterpy.api.client import WSConnection, Client
+from duniterpy.api.client import WSConnection, Client, ClientPool, validate
 from duniterpy.api.endpoint import BMAEndpoint, SecuredBMAEndpoint, WS2PEndpoint
 from duniterpy.documents.ws2p.messages import Connect, Ack, Ok
 from duniterpy.key import SigningKey
@@ -51,7 +50,7 @@ async def handshake(ws: WSConnection, signing_key: SigningKey, currency: str):
         data = await ws.receive_json()
 
         if "auth" in data and data["auth"] == "CONNECT":
-            jsonschema.validate(data, ws2p.network.WS2P_CONNECT_MESSAGE_SCHEMA)
+            validate(data, ws2p.network.WS2P_CONNECT_MESSAGE_SCHEMA)
 
             logging.debug("Received a CONNECT message")
 
@@ -70,7 +69,7 @@ async def handshake(ws: WSConnection, signing_key: SigningKey, currency: str):
             await ws.send_str(ack_message)
 
         if "auth" in data and data["auth"] == "ACK":
-            jsonschema.validate(data, ws2p.network.WS2P_ACK_MESSAGE_SCHEMA)
+            validate(data, ws2p.network.WS2P_ACK_MESSAGE_SCHEMA)
 
             logging.debug("Received an ACK message")
 
@@ -93,7 +92,7 @@ async def handshake(ws: WSConnection, signing_key: SigningKey, currency: str):
             and "auth" in data
             and data["auth"] == "OK"
         ):
-            jsonschema.validate(data, ws2p.network.WS2P_OK_MESSAGE_SCHEMA)
+            validate(data, ws2p.network.WS2P_OK_MESSAGE_SCHEMA)
 
             logging.debug("Received an OK message")
 
@@ -114,15 +113,23 @@ async def handshake(ws: WSConnection, signing_key: SigningKey, currency: str):
 
 
 async def generate_ws2p_endpoint(
-    bma_endpoint: Union[str, BMAEndpoint, SecuredBMAEndpoint]
+    bma_endpoint: Union[str, BMAEndpoint, SecuredBMAEndpoint],
+    pool: Optional[ClientPool] = None,
 ) -> WS2PEndpoint:
     """
     Retrieve WS2P endpoints from BMA peering
     Take the first one found
+
+    :param bma_endpoint: BMA endpoint of the node
+    :param pool: ClientPool instance to reuse the node connection (optional, default
+    None opens and closes a Client)
     """
-    bma_client = Client(bma_endpoint)
-    peering = await bma_client(bma.network.peering)
-    await bma_client.close()
+    if pool is None:
+        bma_client = Client(bma_endpoint)
+        peering = await bma_client(bma.network.peering)
+        await bma_client.close()
+    else:
+        peering = await pool.client(bma_endpoint)(bma.network.peering)
 
     for endpoint in peering["endpoints"]:
         if endpoint.startswith("WS2P"):
@@ -424,7 +424,7 @@ class AsciiArmor:
                     continue
 
                 for pubkey in sender_pubkeys:
-                    verifier = VerifyingKey(pubkey)
+                    verifier = VerifyingKey.for_pubkey(pubkey)
                     signature = base64.b64decode(line)
                     parsed_result["signatures"][signatures_index]["pubkey"] = pubkey
                     try:
@@ -15,12 +15,54 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from typing import Union
-
-import base58
+from typing import Dict, Iterable, List, Optional, Union
 
 from ..tools import ensure_str, ensure_bytes
 
+ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+# Numbers are converted two digits at a time, with the 58 ** 2 two digits strings
+PAIR_BASE = 58**2
+PAIRS = [first + second for first in ALPHABET for second in ALPHABET]
+PAIR_VALUES = {pair: value for value, pair in enumerate(PAIRS)}  # type: Dict[str, int]
+
+# Size in bytes of an ed25519 public key
+PUBKEY_SIZE = 32
+
+
+def _to_int(data: str) -> int:
+    """
+    Return the number written in Base58 string data
+
+    Raise ValueError if data holds a character out of the Base58 alphabet.
+
+    :param data: Base58 string
+    :return:
+    """
+    # a leading zero digit does not change the number
+    digits = "1" + data if len(data) % 2 else data
+    number = 0
+    try:
+        for index in range(0, len(digits), 2):
+            number = number * PAIR_BASE + PAIR_VALUES[digits[index : index + 2]]
+    except KeyError:
+        raise ValueError("Invalid Base58 string {0}".format(data)) from None
+    return number
+
+
+def _from_int(number: int) -> str:
+    """
+    Return the Base58 string of number, without leading zero digits
+
+    :param number: Positive integer
+    :return:
+    """
+    pairs = []
+    while number:
+        number, pair = divmod(number, PAIR_BASE)
+        pairs.append(PAIRS[pair])
+    return "".join(reversed(pairs)).lstrip("1")
+
 
 class Base58Encoder:
     @staticmethod
@@ -30,7 +72,12 @@ class Base58Encoder:
 
         :param data: Bytes or string data
         """
-        return ensure_str(base58.b58encode(ensure_bytes(data)))
+        data = ensure_bytes(data)
+        stripped = data.lstrip(b"\x00")
+        # each leading zero byte is written as a leading zero digit
+        return "1" * (len(data) - len(stripped)) + _from_int(
+            int.from_bytes(stripped, "big")
+        )
 
     @staticmethod
     def decode(data: str) -> bytes:
@@ -39,4 +86,57 @@ class Base58Encoder:
 
         :param data: Base58 string
         """
-        return base58.b58decode(data)
+        data = ensure_str(data)
+        stripped = data.lstrip("1")
+        number = _to_int(stripped)
+        return b"\x00" * (len(data) - len(stripped)) + number.to_bytes(
+            (number.bit_length() + 7) // 8, "big"
+        )
+
+    @staticmethod
+    def encode_pubkey(data: bytes) -> str:
+        """
+        Return Base58 string of a 32 bytes public key
+
+        :param data: Public key bytes
+        """
+        if len(data) != PUBKEY_SIZE:
+            raise ValueError("Public key size is not {0} bytes".format(PUBKEY_SIZE))
+        return Base58Encoder.encode(data)
+
+    @staticmethod
+    def decode_pubkey(data: str) -> bytes:
+        """
+        Decode Base58 string of a 32 bytes public key
+
+        Raise ValueError if data is not the Base58 string of 32 bytes.
+
+        :param data: Base58 string
+        """
+        # leading zero digits, written for leading zero bytes, do not change the
+        # number, so the whole string is converted at once
+        try:
+            key = _to_int(data).to_bytes(PUBKEY_SIZE, "big")
+        except OverflowError:
+            raise ValueError("Public key {0} is too long".format(data)) from None
+        if len(data) - len(data.lstrip("1")) != PUBKEY_SIZE - len(key.lstrip(b"\x00")):
+            raise ValueError("Public key {0} is not 32 bytes".format(data))
+        return key
+
+    @staticmethod
+    def decode_many(
+        strings: Iterable[str], size: Optional[int] = PUBKEY_SIZE
+    ) -> List[bytes]:
+        """
+        Decode Base58 strings and return the list of bytes
+
+        :param strings: Base58 strings
+        :param size: Size in bytes of the decoded strings, to use the fast path of
+        public keys, None for strings of any size
+        """
+        if size == PUBKEY_SIZE:
+            return [Base58Encoder.decode_pubkey(data) for data in strings]
+        decoded = [Base58Encoder.decode(data) for data in strings]
+        if size is not None and any(len(data) != size for data in decoded):
+            raise ValueError("Decoded strings are not {0} bytes".format(size))
+        return decoded
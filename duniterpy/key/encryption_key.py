@@ -15,15 +15,19 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from typing import Union, Optional
+from concurrent.futures import Executor
+from typing import Union, Optional, Type, TypeVar
 
 import libnacl.public
-from hashlib import scrypt
 
+from .scrypt import scrypt_seed, scrypt_seed_async
 from .scrypt_params import ScryptParams
 from .base58 import Base58Encoder
 from ..tools import ensure_bytes
 
+# required to type hint cls in classmethod
+SecretKeyType = TypeVar("SecretKeyType", bound="SecretKey")
+
 
 class SecretKey(libnacl.public.SecretKey):
     """
@@ -46,20 +50,41 @@ class SecretKey(libnacl.public.SecretKey):
         if scrypt_params is None:
             scrypt_params = ScryptParams()
 
-        salt = ensure_bytes(salt)
-        password = ensure_bytes(password)
-        seed = scrypt(
-            password,
-            salt=salt,
-            n=scrypt_params.N,
-            r=scrypt_params.r,
-            p=scrypt_params.p,
-            dklen=scrypt_params.seed_length,
-        )
+        seed = scrypt_seed(ensure_bytes(salt), ensure_bytes(password), scrypt_params)
+        self._init_from_seed(seed)
 
+    def _init_from_seed(self, seed: bytes) -> None:
         super().__init__(seed)
         self.public_key = PublicKey(Base58Encoder.encode(self.pk))
 
+    @classmethod
+    async def from_credentials_async(
+        cls: Type[SecretKeyType],
+        salt: Union[str, bytes],
+        password: Union[str, bytes],
+        scrypt_params: Optional[ScryptParams] = None,
+        executor: Optional[Executor] = None,
+    ) -> SecretKeyType:
+        """
+        Create SecretKey key pair instance from salt and password credentials, with
+        the scrypt derivation run in an executor so the event loop is not blocked
+
+        :param salt: Salt credential
+        :param password: Password credential
+        :param scrypt_params: Optional ScryptParams instance
+        :param executor: Executor instance, default to the executor of the loop
+        """
+        if scrypt_params is None:
+            scrypt_params = ScryptParams()
+
+        seed = await scrypt_seed_async(
+            ensure_bytes(salt), ensure_bytes(password), scrypt_params, executor
+        )
+        # the seed is already derived, skip __init__
+        secret_key = cls.__new__(cls)
+        secret_key._init_from_seed(seed)
+        return secret_key
+
     def encrypt(
         self, pubkey: str, nonce: Union[str, bytes], text: Union[str, bytes]
     ) -> str:
@@ -109,7 +134,7 @@ class PublicKey(libnacl.public.PublicKey):
 
         :param pubkey: Base58 public key
         """
-        key = Base58Encoder.decode(pubkey)
+        key = Base58Encoder.decode_pubkey(pubkey)
         super().__init__(key)
 
     def base58(self) -> str:
@@ -0,0 +1,244 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import functools
+import hashlib
+import hmac
+import os
+from concurrent.futures import Executor
+from typing import (
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from ..tools import LRUCache, map_chunks
+from .scrypt_params import ScryptParams
+
+# default maximum number of seeds kept by a ScryptCache, the shared cache is disabled
+SCRYPT_CACHE_SIZE = 128
+
+# Number of derivations sent at once to a worker by bulk_scrypt_seeds
+BULK_CHUNK_SIZE = 32
+
+# items of bulk_scrypt_seeds
+ItemType = TypeVar("ItemType")
+
+
+class ScryptCache(LRUCache[bytearray]):
+    """
+    Thread safe LRU cache of the seeds derived by scrypt
+
+    Entries are keyed by a keyed hash of (salt, password, parameters), with a random
+    key drawn for each cache, so the keys reveal nothing of the credentials. The
+    seeds are kept in bytearrays, zeroed when they are evicted, replaced or cleared.
+
+    Only the copies held by the cache are zeroed: the seeds returned by lookup and
+    derived by hashlib.scrypt are immutable bytes, left to the garbage collector like
+    any key material handled by the caller. Disable the cache where keeping seeds in
+    memory between derivations is not acceptable.
+    """
+
+    def __init__(self, maxsize: Optional[int] = SCRYPT_CACHE_SIZE) -> None:
+        """
+        Init an empty ScryptCache instance
+
+        :param maxsize: Maximum number of seeds, None for no limit, 0 to disable the cache
+        """
+        super().__init__(maxsize=maxsize)
+        self._secret = os.urandom(32)
+
+    def lookup(self, key: Hashable) -> Optional[bytes]:  # type: ignore
+        """
+        Return a copy of the seed cached under key, None if not in the cache
+
+        The copy is made under the lock, so a concurrent eviction can not zero it.
+
+        :param key: Cache key
+        :return:
+        """
+        with self._lock:
+            seed = self._values.get(key)
+            if seed is None:
+                self.misses += 1
+                return None
+            self._values.move_to_end(key)
+            self.hits += 1
+            return bytes(seed)
+
+    def set(self, key: Hashable, value: bytes) -> None:  # type: ignore
+        """
+        Cache a copy of the seed under key
+
+        :param key: Cache key
+        :param value: Derived seed
+        :return:
+        """
+        super().set(key, bytearray(value))
+
+    def _release(self, value: bytearray) -> None:
+        value[:] = bytes(len(value))
+
+    def key(self, salt: bytes, password: bytes, scrypt_params: ScryptParams) -> bytes:
+        """
+        Return the cache key of a derivation
+
+        :param salt: Salt
+        :param password: Password
+        :param scrypt_params: ScryptParams instance
+        :return:
+        """
+        message = b"%d:%d:%d:%d:%d:" % (scrypt_params.astuple() + (len(salt),))
+        return hmac.new(
+            self._secret, message + salt + password, hashlib.sha256
+        ).digest()
+
+
+# shared cache used by the key derivations, disabled until resized
+scrypt_cache = ScryptCache(0)
+
+
+def scrypt_seed(
+    salt: bytes,
+    password: bytes,
+    scrypt_params: ScryptParams,
+    cache: Optional[ScryptCache] = None,
+) -> bytes:
+    """
+    Return the seed derived by scrypt from salt and password
+
+    :param salt: Salt
+    :param password: Password
+    :param scrypt_params: ScryptParams instance
+    :param cache: ScryptCache instance, default to the shared cache
+    :return:
+    """
+    if cache is None:
+        cache = scrypt_cache
+    if cache.maxsize == 0:
+        return _scrypt(salt, password, scrypt_params.astuple())
+
+    key = cache.key(salt, password, scrypt_params)
+    seed = cache.lookup(key)
+    if seed is None:
+        seed = _scrypt(salt, password, scrypt_params.astuple())
+        cache.set(key, seed)
+    return seed
+
+
+async def scrypt_seed_async(
+    salt: bytes,
+    password: bytes,
+    scrypt_params: ScryptParams,
+    executor: Optional[Executor] = None,
+    cache: Optional[ScryptCache] = None,
+) -> bytes:
+    """
+    Return the seed derived by scrypt from salt and password, computed in an executor
+    so the event loop is not blocked
+
+    hashlib.scrypt releases the GIL, so the default thread executor of the loop runs
+    derivations in parallel. A ProcessPoolExecutor can be given instead.
+
+    :param salt: Salt
+    :param password: Password
+    :param scrypt_params: ScryptParams instance
+    :param executor: Executor instance, default to the executor of the loop
+    :param cache: ScryptCache instance, default to the shared cache
+    :return:
+    """
+    if cache is None:
+        cache = scrypt_cache
+    key = None
+    if cache.maxsize != 0:
+        key = cache.key(salt, password, scrypt_params)
+        seed = cache.lookup(key)
+        if seed is not None:
+            return seed
+
+    loop = asyncio.get_event_loop()
+    seed = await loop.run_in_executor(
+        executor, _scrypt, salt, password, scrypt_params.astuple()
+    )
+    if key is not None:
+        cache.set(key, seed)
+    return seed
+
+
+def _scrypt(salt: bytes, password: bytes, params: Tuple[int, int, int, int]) -> bytes:
+    # module level function with plain arguments, to run in a process pool
+    n, r, p, dklen = params
+    return hashlib.scrypt(password, salt=salt, n=n, r=r, p=p, dklen=dklen)
+
+
+def scrypt_seeds_chunk(
+    credentials: List[Tuple[bytes, bytes]], params: Tuple[int, int, int, int]
+) -> List[bytes]:
+    """
+    Return the seeds derived by scrypt from (salt, password) credentials, in a worker
+    process of a bulk derivation
+
+    :param credentials: List of (salt, password)
+    :param params: (N, r, p, seed_length) scrypt parameters
+    :return:
+    """
+    return [_scrypt(salt, password, params) for salt, password in credentials]
+
+
+def bulk_scrypt_seeds(
+    items: Iterable[ItemType],
+    credentials: Callable[[ItemType], Tuple[bytes, bytes]],
+    scrypt_params: ScryptParams,
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[int], None]] = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> Iterator[Tuple[ItemType, bytes]]:
+    """
+    Iterate on the items with the seeds derived by scrypt from their (salt, password)
+    credentials, in the order of items
+
+    The derivations are spread on a pool of processes by map_chunks, by chunks of
+    chunk_size items, so items can be a lazy iterable.
+
+    :param items: Items to derive seeds for
+    :param credentials: Function returning the (salt, password) of an item
+    :param scrypt_params: ScryptParams instance
+    :param workers: Number of processes, default to the number of cores. With one
+    worker, the seeds are derived in the calling process.
+    :param progress: Function called with the number of seeds derived so far, after
+    each chunk
+    :param chunk_size: Number of items sent at once to a worker
+    :return:
+    """
+    done = 0
+    for chunk, seeds in map_chunks(
+        functools.partial(scrypt_seeds_chunk, params=scrypt_params.astuple()),
+        items,
+        workers,
+        chunk_size,
+        lambda chunk: [credentials(item) for item in chunk],
+    ):
+        done += len(seeds)
+        if progress is not None:
+            progress(done)
+        yield from zip(chunk, seeds)
@@ -15,6 +15,8 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from typing import Tuple
+
 from .constants import SCRYPT_PARAMS
 
 
@@ -42,3 +44,15 @@ class ScryptParams:
         self.r = r
         self.p = p
         self.seed_length = seed_length
+
+    def astuple(self) -> Tuple[int, int, int, int]:
+        """
+        Return the (N, r, p, seed_length) tuple of the parameters
+
+        :return:
+        """
+        return self.N, self.r, self.p, self.seed_length
+
+
+# scrypt parameters of the EWIF format
+EWIF_SCRYPT_PARAMS = ScryptParams(16384, 8, 8, 64)
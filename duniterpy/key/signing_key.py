@@ -16,15 +16,27 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import base64
+import os
 import re
-from typing import Optional, Union, TypeVar, Type
+from concurrent.futures import Executor
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    TypeVar,
+    Type,
+)
 
 import libnacl.sign
 import pyaes
 from libnacl.utils import load_key
-from hashlib import scrypt
 
-from .scrypt_params import ScryptParams
+from .scrypt import BULK_CHUNK_SIZE, bulk_scrypt_seeds, scrypt_seed, scrypt_seed_async
+from .scrypt_params import EWIF_SCRYPT_PARAMS, ScryptParams
 from .base58 import Base58Encoder
 from ..tools import (
     ensure_bytes,
@@ -36,6 +48,10 @@ from ..tools import (
 # required to type hint cls in classmethod
 SigningKeyType = TypeVar("SigningKeyType", bound="SigningKey")
 
+# File formats of SigningKey.bulk_save_files
+FORMAT_PUBSEC = "pubsec"
+FORMAT_WIF = "wif"
+
 
 class SigningKey(libnacl.sign.Signer):
     def __init__(self, seed: bytes) -> None:
@@ -64,19 +80,115 @@ class SigningKey(libnacl.sign.Signer):
         if scrypt_params is None:
             scrypt_params = ScryptParams()
 
-        salt = ensure_bytes(salt)
-        password = ensure_bytes(password)
-        seed = scrypt(
-            password,
-            salt=salt,
-            n=scrypt_params.N,
-            r=scrypt_params.r,
-            p=scrypt_params.p,
-            dklen=scrypt_params.seed_length,
-        )
+        seed = scrypt_seed(ensure_bytes(salt), ensure_bytes(password), scrypt_params)
+        return cls(seed)
+
+    @classmethod
+    async def from_credentials_async(
+        cls: Type[SigningKeyType],
+        salt: Union[str, bytes],
+        password: Union[str, bytes],
+        scrypt_params: Optional[ScryptParams] = None,
+        executor: Optional[Executor] = None,
+    ) -> SigningKeyType:
+        """
+        Create a SigningKey object from credentials, with the scrypt derivation run
+        in an executor so the event loop is not blocked
 
+        :param salt: Secret salt passphrase credential
+        :param password: Secret password credential
+        :param scrypt_params: ScryptParams instance or None
+        :param executor: Executor instance, default to the executor of the loop
+        """
+        if scrypt_params is None:
+            scrypt_params = ScryptParams()
+
+        seed = await scrypt_seed_async(
+            ensure_bytes(salt), ensure_bytes(password), scrypt_params, executor
+        )
         return cls(seed)
 
+    @classmethod
+    def bulk_from_credentials(
+        cls: Type[SigningKeyType],
+        credentials: Iterable[Tuple[Union[str, bytes], Union[str, bytes]]],
+        scrypt_params: Optional[ScryptParams] = None,
+        workers: Optional[int] = None,
+        progress: Optional[Callable[[int], None]] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> Iterator[SigningKeyType]:
+        """
+        Iterate on the SigningKey objects of (salt, password) credentials, in the
+        order of credentials
+
+        The scrypt derivations are spread on a pool of processes by
+        bulk_scrypt_seeds, on top of duniterpy.tools.map_chunks, so credentials can
+        be a lazy iterable. Stopping the iteration early cancels the derivations not
+        started yet.
+
+        Usage:
+
+            credentials = ((salt, password) for salt, password in read_sheet())
+            keys = SigningKey.bulk_from_credentials(credentials, progress=print)
+            SigningKey.bulk_save_files(keys, "wallets")
+
+        :param credentials: Iterable of (salt, password)
+        :param scrypt_params: ScryptParams instance or None
+        :param workers: Number of processes, default to the number of cores. With
+        one worker, the keys are derived in the calling process.
+        :param progress: Function called with the number of keys derived so far,
+        after each chunk
+        :param chunk_size: Number of credentials sent at once to a worker
+        :return:
+        """
+        if scrypt_params is None:
+            scrypt_params = ScryptParams()
+
+        for _, seed in bulk_scrypt_seeds(
+            credentials,
+            lambda item: (ensure_bytes(item[0]), ensure_bytes(item[1])),
+            scrypt_params,
+            workers,
+            progress,
+            chunk_size,
+        ):
+            yield cls(seed)
+
+    @staticmethod
+    def bulk_save_files(
+        signing_keys: Iterable["SigningKey"],
+        directory: str,
+        file_format: str = FORMAT_PUBSEC,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> List[str]:
+        """
+        Save each SigningKey in a file named after its public key, in directory
+
+        :param signing_keys: Iterable of SigningKey instances
+        :param directory: Directory of the files, created if missing
+        :param file_format: FORMAT_PUBSEC or FORMAT_WIF
+        :param progress: Function called with the number of files saved so far
+        :return: the paths of the files, in the order of signing_keys
+        """
+        if file_format == FORMAT_PUBSEC:
+            save = SigningKey.save_pubsec_file
+        elif file_format == FORMAT_WIF:
+            save = SigningKey.save_wif_file
+        else:
+            raise ValueError("Unknown file format {0}".format(file_format))
+
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for signing_key in signing_keys:
+            path = os.path.join(
+                directory, "{0}.{1}".format(signing_key.pubkey, file_format)
+            )
+            save(signing_key, path)
+            paths.append(path)
+            if progress is not None:
+                progress(len(paths))
+        return paths
+
     @classmethod
     def from_credentials_file(
         cls, path: str, scrypt_params: Optional[ScryptParams] = None
@@ -381,6 +493,108 @@ Data: {data}""".format(
         :param ewif_hex: EWIF string in hexadecimal format
         :param password: Password of the encrypted seed
         """
+        salt, encryptedhalf1, encryptedhalf2 = cls._decode_ewif(ewif_hex)
+        derived = scrypt_seed(salt, password.encode("utf-8"), EWIF_SCRYPT_PARAMS)
+        return cls._decrypt_ewif(salt, encryptedhalf1, encryptedhalf2, derived)
+
+    @classmethod
+    async def from_ewif_hex_async(
+        cls: Type[SigningKeyType],
+        ewif_hex: str,
+        password: str,
+        executor: Optional[Executor] = None,
+    ) -> SigningKeyType:
+        """
+        Return SigningKey instance from Duniter EWIF in hexadecimal format, with the
+        scrypt derivation run in an executor
+
+        :param ewif_hex: EWIF string in hexadecimal format
+        :param password: Password of the encrypted seed
+        :param executor: Executor instance, default to the executor of the loop
+        """
+        salt, encryptedhalf1, encryptedhalf2 = cls._decode_ewif(ewif_hex)
+        derived = await scrypt_seed_async(
+            salt, password.encode("utf-8"), EWIF_SCRYPT_PARAMS, executor
+        )
+        return cls._decrypt_ewif(salt, encryptedhalf1, encryptedhalf2, derived)
+
+    @classmethod
+    def bulk_from_ewif_hex(
+        cls: Type[SigningKeyType],
+        ewif_hexes: Iterable[str],
+        password: str,
+        workers: Optional[int] = None,
+        progress: Optional[Callable[[int], None]] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> Iterator[SigningKeyType]:
+        """
+        Iterate on the SigningKey instances of EWIF strings encrypted with the same
+        password, in the order of ewif_hexes
+
+        The scrypt derivations are spread on a pool of processes by
+        bulk_scrypt_seeds.
+
+        :param ewif_hexes: EWIF strings in hexadecimal format
+        :param password: Password of the encrypted seeds
+        :param workers: Number of processes, default to the number of cores
+        :param progress: Function called with the number of keys decrypted so far
+        :param chunk_size: Number of keys sent at once to a worker
+        :return:
+        """
+        password_bytes = password.encode("utf-8")
+        decoded = (cls._decode_ewif(ewif_hex) for ewif_hex in ewif_hexes)
+        for (salt, encryptedhalf1, encryptedhalf2), derived in bulk_scrypt_seeds(
+            decoded,
+            lambda parts: (parts[0], password_bytes),
+            EWIF_SCRYPT_PARAMS,
+            workers,
+            progress,
+            chunk_size,
+        ):
+            yield cls._decrypt_ewif(salt, encryptedhalf1, encryptedhalf2, derived)
+
+    @staticmethod
+    def bulk_to_ewif_hex(
+        signing_keys: Iterable["SigningKey"],
+        password: str,
+        workers: Optional[int] = None,
+        progress: Optional[Callable[[int], None]] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> Iterator[str]:
+        """
+        Iterate on the EWIF strings of SigningKey instances encrypted with the same
+        password, in the order of signing_keys
+
+        The scrypt derivations are spread on a pool of processes by
+        bulk_scrypt_seeds.
+
+        :param signing_keys: SigningKey instances
+        :param password: Password of the encrypted seeds
+        :param workers: Number of processes, default to the number of cores
+        :param progress: Function called with the number of keys encrypted so far
+        :param chunk_size: Number of keys sent at once to a worker
+        :return:
+        """
+        password_bytes = password.encode("utf-8")
+        salted = ((key, key._ewif_salt()) for key in signing_keys)
+        for (signing_key, salt), derived in bulk_scrypt_seeds(
+            salted,
+            lambda item: (item[1], password_bytes),
+            EWIF_SCRYPT_PARAMS,
+            workers,
+            progress,
+            chunk_size,
+        ):
+            yield signing_key._encrypt_ewif(salt, derived)
+
+    @staticmethod
+    def _decode_ewif(ewif_hex: str) -> Tuple[bytes, bytes, bytes]:
+        """
+        Return the salt and the encrypted halves of the seed of an EWIF string
+
+        :param ewif_hex: EWIF string in hexadecimal format
+        :return:
+        """
         ewif_bytes = Base58Encoder.decode(ewif_hex)
         if len(ewif_bytes) != 39:
             raise Exception("Error: the size of EWIF is invalid")
@@ -404,9 +618,25 @@ Data: {data}""".format(
         if checksum_from_ewif != checksum:
             raise Exception("Error: bad checksum of the EWIF")
 
-        # SCRYPT
-        password_bytes = password.encode("utf-8")
-        scrypt_seed = scrypt(password_bytes, salt=salt, n=16384, r=8, p=8, dklen=64)
+        return salt, encryptedhalf1, encryptedhalf2
+
+    @classmethod
+    def _decrypt_ewif(
+        cls: Type[SigningKeyType],
+        salt: bytes,
+        encryptedhalf1: bytes,
+        encryptedhalf2: bytes,
+        scrypt_seed: bytes,
+    ) -> SigningKeyType:
+        """
+        Return SigningKey instance from the decoded EWIF and the scrypt derivation of
+        the password
+
+        :param salt: Salt of the EWIF
+        :param encryptedhalf1: First encrypted half of the seed
+        :param encryptedhalf2: Second encrypted half of the seed
+        :param scrypt_seed: Seed derived by scrypt from the password and the salt
+        """
         derivedhalf1 = scrypt_seed[0:32]
         derivedhalf2 = scrypt_seed[32:64]
 
@@ -416,14 +646,12 @@ Data: {data}""".format(
         decryptedhalf2 = aes.decrypt(encryptedhalf2)
 
         # XOR
-        seed1 = xor_bytes(decryptedhalf1, derivedhalf1[0:16])
-        seed2 = xor_bytes(decryptedhalf2, derivedhalf1[16:32])
-        seed = bytes(seed1 + seed2)
+        seed = bytes(xor_bytes(decryptedhalf1 + decryptedhalf2, derivedhalf1))
 
         # Password Control
         signer = SigningKey(seed)
         salt_from_seed = libnacl.crypto_hash_sha256(
-            libnacl.crypto_hash_sha256(Base58Encoder.decode(signer.pubkey))
+            libnacl.crypto_hash_sha256(signer.vk)
         )[0:4]
         if salt_from_seed != salt:
             raise Exception("Error: bad Password of EWIF address")
@@ -437,30 +665,53 @@ Data: {data}""".format(
         :param path: Path to file
         :param password:
         """
-        # version
-        version = 1
+        salt = self._ewif_salt()
+        derived = scrypt_seed(salt, password.encode("utf-8"), EWIF_SCRYPT_PARAMS)
+        self._write_ewif_file(path, self._encrypt_ewif(salt, derived))
 
-        # add version to seed
-        salt = libnacl.crypto_hash_sha256(
-            libnacl.crypto_hash_sha256(Base58Encoder.decode(self.pubkey))
-        )[0:4]
+    async def save_ewif_file_async(
+        self, path: str, password: str, executor: Optional[Executor] = None
+    ) -> None:
+        """
+        Save an Encrypted Wallet Import Format file (WIF v2), with the scrypt
+        derivation run in an executor
 
-        # SCRYPT
-        password_bytes = password.encode("utf-8")
-        scrypt_seed = scrypt(password_bytes, salt=salt, n=16384, r=8, p=8, dklen=64)
+        :param path: Path to file
+        :param password:
+        :param executor: Executor instance, default to the executor of the loop
+        """
+        salt = self._ewif_salt()
+        derived = await scrypt_seed_async(
+            salt, password.encode("utf-8"), EWIF_SCRYPT_PARAMS, executor
+        )
+        self._write_ewif_file(path, self._encrypt_ewif(salt, derived))
+
+    def _ewif_salt(self) -> bytes:
+        """
+        Return the EWIF salt, from the double hash of the public key
+
+        :return:
+        """
+        return libnacl.crypto_hash_sha256(libnacl.crypto_hash_sha256(self.vk))[0:4]
+
+    def _encrypt_ewif(self, salt: bytes, scrypt_seed: bytes) -> str:
+        """
+        Return the EWIF string of the seed
+
+        :param salt: EWIF salt
+        :param scrypt_seed: Seed derived by scrypt from the password and the salt
+        :return:
+        """
         derivedhalf1 = scrypt_seed[0:32]
         derivedhalf2 = scrypt_seed[32:64]
 
         # XOR
-        seed1_xor_derivedhalf1_1 = bytes(xor_bytes(self.seed[0:16], derivedhalf1[0:16]))
-        seed2_xor_derivedhalf1_2 = bytes(
-            xor_bytes(self.seed[16:32], derivedhalf1[16:32])
-        )
+        seed_xor_derivedhalf1 = bytes(xor_bytes(self.seed, derivedhalf1))
 
         # AES
         aes = pyaes.AESModeOfOperationECB(derivedhalf2)
-        encryptedhalf1 = aes.encrypt(seed1_xor_derivedhalf1_1)
-        encryptedhalf2 = aes.encrypt(seed2_xor_derivedhalf1_2)
+        encryptedhalf1 = aes.encrypt(seed_xor_derivedhalf1[0:16])
+        encryptedhalf2 = aes.encrypt(seed_xor_derivedhalf1[16:32])
 
         # add format to final seed (1=WIF,2=EWIF)
         seed_bytes = b"\x02" + salt + encryptedhalf1 + encryptedhalf2
@@ -471,7 +722,19 @@ Data: {data}""".format(
         checksum = sha256_v2[0:2]
 
         # B58 encode final key string
-        ewif_key = Base58Encoder.encode(seed_bytes + checksum)
+        return Base58Encoder.encode(seed_bytes + checksum)
+
+    @staticmethod
+    def _write_ewif_file(path: str, ewif_key: str) -> None:
+        """
+        Save an EWIF string in an EWIF file
+
+        :param path: Path to file
+        :param ewif_key: EWIF string
+        :return:
+        """
+        # version
+        version = 1
 
         # save file
         with open(path, "w") as fh:
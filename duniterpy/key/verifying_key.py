@@ -16,14 +16,26 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import base64
-from typing import Any
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import libnacl.sign
 import libnacl.encode
 
 from duniterpy.documents import Document
 from duniterpy.documents.block import Block
+from duniterpy.documents.certification import Certification
+from duniterpy.documents.membership import Membership
+from duniterpy.documents.transaction import Transaction
 from .base58 import Base58Encoder
+from ..tools import LRUCache, ensure_bytes
+
+# (pubkey, message, base64 signature)
+SignedItem = Tuple[str, Union[str, bytes], str]
+
+# default maximum number of VerifyingKey instances kept by VerifyingKey.for_pubkey
+VERIFYING_KEY_CACHE_SIZE = 4096
 
 
 class VerifyingKey(libnacl.sign.Verifier):
@@ -36,9 +48,22 @@ class VerifyingKey(libnacl.sign.Verifier):
         Creates a Verify class from base58 pubkey
         :param pubkey:
         """
-        key = libnacl.encode.hex_encode(Base58Encoder.decode(pubkey))
+        key = libnacl.encode.hex_encode(Base58Encoder.decode_pubkey(pubkey))
         super().__init__(key)
 
+    @classmethod
+    def for_pubkey(cls, pubkey: str) -> "VerifyingKey":
+        """
+        Return the VerifyingKey instance of pubkey from the shared key cache
+
+        The instance is created on the first call and shared by the next ones, so it must
+        not be modified.
+
+        :param pubkey: Base58 public key
+        :return:
+        """
+        return verifying_key_cache.get(pubkey)
+
     def verify_document(self, document: Document) -> bool:
         """
         Check specified document
@@ -86,3 +111,156 @@ class VerifyingKey(libnacl.sign.Verifier):
         :return:
         """
         return self.verify(data)
+
+    @staticmethod
+    def verify_batch(
+        signed_items: Sequence[SignedItem], max_workers: Optional[int] = None
+    ) -> List[bool]:
+        """
+        Check a batch of (pubkey, message, base64 signature) tuples
+
+        Verifying keys come from the shared key cache, and the signature checks are
+        spread on a thread pool, as libnacl calls release the GIL.
+
+        :param signed_items: List of (pubkey, message, signature) tuples
+        :param max_workers: Number of threads, default to the number of cores
+        :return: List of the verification results, in the order of signed_items
+        """
+        keys = {}  # type: Dict[str, Optional[bytes]]
+        checks = []  # type: List[Tuple[Optional[bytes], bytes, bytes]]
+        for pubkey, message, signature in signed_items:
+            if pubkey not in keys:
+                try:
+                    keys[pubkey] = VerifyingKey.for_pubkey(pubkey).vk
+                except ValueError:
+                    keys[pubkey] = None
+            try:
+                signature_bytes = base64.b64decode(signature)
+            except ValueError:
+                signature_bytes = b""
+            checks.append((keys[pubkey], ensure_bytes(message), signature_bytes))
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        # one chunk per thread to keep the executor overhead low
+        chunk_size = max(1, -(-len(checks) // max_workers))
+        chunks = [
+            checks[index : index + chunk_size]
+            for index in range(0, len(checks), chunk_size)
+        ]
+        if len(chunks) < 2:
+            return _verify_chunk(checks)
+
+        results = []  # type: List[bool]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for chunk_results in executor.map(_verify_chunk, chunks):
+                results += chunk_results
+        return results
+
+    @staticmethod
+    def verify_documents(
+        documents: Sequence[Document], max_workers: Optional[int] = None
+    ) -> List[bool]:
+        """
+        Check the signatures of a batch of documents
+
+        A document is valid if it has one signature by issuer, and all of them are
+        valid.
+
+        :param documents: List of Document instances
+        :param max_workers: Number of threads, default to the number of cores
+        :return: List of the verification results, in the order of documents
+        """
+        signed_items = []  # type: List[SignedItem]
+        slices = []  # type: List[Tuple[int, int]]
+        for document in documents:
+            try:
+                document_items = document_signed_items(document)
+            except ValueError:
+                # missing or extra signatures, an empty slice is not valid
+                document_items = []
+            slices.append((len(signed_items), len(signed_items) + len(document_items)))
+            signed_items += document_items
+
+        results = VerifyingKey.verify_batch(signed_items, max_workers)
+        return [end > start and all(results[start:end]) for start, end in slices]
+
+
+class VerifyingKeyCache(LRUCache[VerifyingKey]):
+    """
+    Thread safe LRU cache of VerifyingKey instances by base58 pubkey
+    """
+
+    def __init__(self, maxsize: Optional[int] = VERIFYING_KEY_CACHE_SIZE) -> None:
+        """
+        Init an empty VerifyingKeyCache instance
+
+        :param maxsize: Maximum number of keys, None for no limit, 0 to disable the cache
+        """
+        super().__init__(VerifyingKey, maxsize)
+
+
+# shared cache used by VerifyingKey.for_pubkey
+verifying_key_cache = VerifyingKeyCache()
+
+
+def document_signed_items(document: Document) -> List[SignedItem]:
+    """
+    Return the (pubkey, message, signature) tuples to check for the document
+
+    Raise ValueError if the document has not one signature by issuer.
+
+    :param document: Document instance
+    :return:
+    """
+    if isinstance(document, Block):
+        content = "InnerHash: {0}\nNonce: {1}\n".format(
+            document.inner_hash, document.nonce
+        )
+        pubkeys = [document.issuer]
+    else:
+        content = document.raw()
+        if isinstance(document, Transaction):
+            pubkeys = document.issuers
+        elif isinstance(document, Certification):
+            pubkeys = [document.pubkey_from]
+        elif isinstance(document, Membership):
+            pubkeys = [document.issuer]
+        else:
+            pubkeys = [document.pubkey]  # type: ignore
+
+    if len(document.signatures) != len(pubkeys):
+        raise ValueError(
+            "{0} signatures for {1} issuers".format(
+                len(document.signatures), len(pubkeys)
+            )
+        )
+    return [
+        (pubkey, content, signature)
+        for pubkey, signature in zip(pubkeys, document.signatures)
+    ]
+
+
+def _verify_chunk(checks: List[Tuple[Optional[bytes], bytes, bytes]]) -> List[bool]:
+    """
+    Check a list of (verifying key, message, signature) tuples
+
+    :param checks: List of (verifying key, message, signature) tuples
+    :return:
+    """
+    results = []
+    for key, message, signature in checks:
+        # libnacl does not check buffer sizes
+        if (
+            key is None
+            or len(key) != libnacl.crypto_sign_PUBLICKEYBYTES
+            or len(signature) != libnacl.crypto_sign_BYTES
+        ):
+            results.append(False)
+            continue
+        try:
+            libnacl.crypto_sign_verify_detached(signature, message, key)
+            results.append(True)
+        except ValueError:
+            results.append(False)
+    return results
@@ -15,10 +15,34 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import os
+import threading
 import uuid
-from typing import Union
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 from libnacl.encode import hex_decode, hex_encode
 
+# values of LRUCache
+ValueType = TypeVar("ValueType")
+
+# items and results of map_chunks
+ItemType = TypeVar("ItemType")
+ResultType = TypeVar("ResultType")
+
 
 def ensure_bytes(data: Union[str, bytes]) -> bytes:
     """
@@ -54,10 +78,15 @@ def xor_bytes(b1: bytes, b2: bytes) -> bytearray:
     :param b2: Second bytes argument
     :rtype bytearray:
     """
-    result = bytearray()
-    for i1, i2 in zip(b1, b2):
-        result.append(i1 ^ i2)
-    return result
+    # like zip, the result has the length of the shortest argument
+    length = min(len(b1), len(b2))
+    if len(b1) != length:
+        b1 = b1[:length]
+    if len(b2) != length:
+        b2 = b2[:length]
+    # XOR the whole buffers at once as integers
+    number = int.from_bytes(b1, "big") ^ int.from_bytes(b2, "big")
+    return bytearray(number.to_bytes(length, "big"))
 
 
 def convert_seedhex_to_seed(seedhex: str) -> bytes:
@@ -87,3 +116,190 @@ def get_ws2p_challenge() -> str:
     :rtype str:
     """
     return str(uuid.uuid4()) + str(uuid.uuid4())
+
+
+class LRUCache(Generic[ValueType]):
+    """
+    Thread safe least recently used cache, with hit and miss counters
+
+    Missing values are created by the factory given to the constructor, called with
+    the key, or stored with set.
+    """
+
+    def __init__(
+        self,
+        factory: Optional[Callable[[Hashable], ValueType]] = None,
+        maxsize: Optional[int] = None,
+    ) -> None:
+        """
+        Init an empty LRUCache instance
+
+        :param factory: Function returning the value of a missing key (optional)
+        :param maxsize: Maximum number of values, None for no limit, 0 to disable the
+        cache
+        """
+        self.factory = factory
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._values = OrderedDict()  # type: OrderedDict[Hashable, ValueType]
+        self._lock = threading.Lock()
+
+    def lookup(self, key: Hashable) -> Optional[ValueType]:
+        """
+        Return the value of key, None if not in the cache
+
+        :param key: Key of the value
+        :return:
+        """
+        with self._lock:
+            value = self._values.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._values.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: ValueType) -> None:
+        """
+        Store the value of key, evicting the least recently used values if full
+
+        :param key: Key of the value
+        :param value: Value
+        :return:
+        """
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            previous = self._values.pop(key, None)
+            if previous is not None:
+                self._release(previous)
+            self._values[key] = value
+            self._evict()
+
+    def get(self, key: Hashable) -> ValueType:
+        """
+        Return the value of key, created by the factory if not in the cache
+
+        :param key: Key of the value
+        :return:
+        """
+        value = self.lookup(key)
+        if value is None:
+            # create outside the lock, a concurrent miss on the same key is harmless
+            value = self.factory(key)  # type: ignore
+            self.set(key, value)
+        return value
+
+    def resize(self, maxsize: Optional[int]) -> None:
+        """
+        Change the maximum number of values, evicting the least recently used ones
+
+        :param maxsize: Maximum number of values, None for no limit, 0 to disable the
+        cache
+        :return:
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        """
+        Remove all values and reset the hit and miss counters
+
+        :return:
+        """
+        with self._lock:
+            for value in self._values.values():
+                self._release(value)
+            self._values.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _evict(self) -> None:
+        """
+        Remove the least recently used values above maxsize, the lock must be held
+
+        :return:
+        """
+        if self.maxsize is None:
+            return
+        while len(self._values) > self.maxsize:
+            self._release(self._values.popitem(last=False)[1])
+
+    def _release(self, value: ValueType) -> None:
+        """
+        Called with each value removed from the cache, the lock being held
+
+        :param value: Removed value
+        :return:
+        """
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+def map_chunks(
+    function: Callable[[Any], ResultType],
+    items: Iterable[ItemType],
+    workers: Optional[int] = None,
+    chunk_size: int = 1,
+    prepare: Optional[Callable[[List[ItemType]], Any]] = None,
+) -> Iterator[Tuple[List[ItemType], ResultType]]:
+    """
+    Iterate on the chunks of items with the result of function on each chunk,
+    computed by a pool of processes, in the order of items
+
+    At most two chunks by worker are in flight, so items can be a lazy iterable. When
+    the iteration stops early, the chunks not started yet are cancelled.
+
+    :param function: Function of the argument of a chunk, picklable to run in the
+    worker processes: a module level function or a functools.partial of one
+    :param items: Items to split in chunks
+    :param workers: Number of processes, default to the number of cores. With one
+    worker, function is called in the calling process.
+    :param chunk_size: Number of items of a chunk
+    :param prepare: Function returning the argument of function from a chunk, called
+    in the calling process (optional, default the chunk itself)
+    :return:
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    def chunks() -> Iterator[List[ItemType]]:
+        chunk = []  # type: List[ItemType]
+        for item in items:
+            chunk.append(item)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def argument(chunk: List[ItemType]) -> Any:
+        return chunk if prepare is None else prepare(chunk)
+
+    if workers < 2:
+        for chunk in chunks():
+            yield chunk, function(argument(chunk))
+        return
+
+    # (chunk, future of its result)
+    pending = deque()  # type: Deque[Tuple[List[ItemType], Future]]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            for chunk in chunks():
+                pending.append((chunk, executor.submit(function, argument(chunk))))
+                if len(pending) >= 2 * workers:
+                    chunk, future = pending.popleft()
+                    yield chunk, future.result()
+            while pending:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        finally:
+            # consumer stopped early or a call failed
+            for _, future in pending:
+                future.cancel()
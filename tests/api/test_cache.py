@@ -0,0 +1,156 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import tempfile
+import time
+import unittest
+
+from duniterpy.api.cache import (
+    ResponseCache,
+    MemoryBackend,
+    DiskBackend,
+    FOREVER,
+    NO_CACHE,
+    SHORT_TTL,
+)
+from duniterpy.api.client import Client, ClientPool
+from duniterpy.api.endpoint import BMAEndpoint
+from tests.api.webserver import WebFunctionalSetupMixin, find_unused_port, web
+
+
+class TestResponseCache(WebFunctionalSetupMixin, unittest.TestCase):
+    def test_ttl(self):
+        cache = ResponseCache(fork_depth=100)
+        self.assertEqual(cache.ttl("blockchain/parameters"), FOREVER)
+        self.assertEqual(cache.ttl("network/peers"), NO_CACHE)
+        # current block unknown
+        self.assertEqual(cache.ttl("blockchain/block/10"), SHORT_TTL)
+
+        cache.set("blockchain/current", None, {"number": 1000})
+        self.assertEqual(cache.current_numbers, {"": 1000})
+        # the current block of a node does not change the lifetimes of the others
+        self.assertEqual(cache.ttl("/blockchain/block/900", "node"), SHORT_TTL)
+        self.assertEqual(cache.ttl("/blockchain/block/900"), FOREVER)
+        self.assertEqual(cache.ttl("blockchain/block/901"), SHORT_TTL)
+        self.assertEqual(cache.ttl("blockchain/blocks/50/850"), FOREVER)
+        self.assertEqual(cache.ttl("blockchain/blocks/52/850"), SHORT_TTL)
+        self.assertEqual(cache.ttl("tx/history/pubkey/blocks/0/900"), FOREVER)
+        self.assertEqual(cache.ttl("tx/history/pubkey/blocks/0/950"), SHORT_TTL)
+        self.assertEqual(cache.ttl("tx/sources/pubkey"), SHORT_TTL)
+
+    def test_expiration(self):
+        cache = ResponseCache(MemoryBackend(maxsize=2))
+        cache.backend.set("tx/sources/a", time.time() - 1, {"sources": []})
+        self.assertIsNone(cache.get("tx/sources/a"))
+        self.assertEqual(len(cache.backend), 0)
+
+        cache.set("tx/sources/a", None, {"sources": []})
+        cache.set("tx/sources/b", {"c": 1, "a": 2}, {"sources": []})
+        self.assertEqual(cache.get("tx/sources/a"), {"sources": []})
+        self.assertEqual(cache.get("tx/sources/b", {"a": 2, "c": 1}), {"sources": []})
+        self.assertIsNone(cache.get("tx/sources/b"))
+        # least recently used entry evicted
+        cache.set("tx/sources/c", None, {"sources": []})
+        self.assertIsNone(cache.get("tx/sources/a"))
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+
+    def test_hit_copies(self):
+        for backend in (MemoryBackend(), None):
+            with tempfile.TemporaryDirectory() as path:
+                cache = ResponseCache(backend or DiskBackend(path))
+                data = {"sources": [{"amount": 100}]}
+                cache.set("tx/sources/a", None, data)
+                data["sources"].clear()
+                response = cache.get("tx/sources/a")
+                self.assertEqual(response, {"sources": [{"amount": 100}]})
+                # changing a response does not change the next hit
+                response["sources"][0]["amount"] = 0
+                self.assertEqual(
+                    cache.get("tx/sources/a"), {"sources": [{"amount": 100}]}
+                )
+
+    def test_disk_backend(self):
+        with tempfile.TemporaryDirectory() as path:
+            cache = ResponseCache(DiskBackend(path))
+            cache.set("blockchain/parameters", None, {"currency": "g1"})
+            cache.set("network/peers", None, {"peers": []})
+
+            cache = ResponseCache(DiskBackend(path))
+            self.assertEqual(cache.get("blockchain/parameters"), {"currency": "g1"})
+            self.assertEqual(len(cache.backend), 1)
+            cache.clear()
+            self.assertEqual(len(cache.backend), 0)
+
+    def test_client_cache(self):
+        paths = []
+
+        async def handler(request):
+            paths.append(request.path)
+            return web.json_response({"number": int(request.match_info["number"])})
+
+        async def go():
+            _, port, _ = await self.create_server(
+                "GET", "/blockchain/block/{number}", handler
+            )
+            cache = ResponseCache(fork_depth=10)
+            client = Client(BMAEndpoint("127.0.0.1", "", "", port), cache=cache)
+            for _ in range(3):
+                await client.get("blockchain/block/50")
+                response = await client.get("blockchain/block/5")
+                self.assertEqual(response, {"number": 5})
+                # a caller changing its response does not change the next hits
+                response["number"] = 0
+            self.assertEqual(paths, ["/blockchain/block/50", "/blockchain/block/5"])
+            self.assertEqual(
+                cache.ttl("blockchain/block/5", client.cache_namespace), FOREVER
+            )
+            await client.close()
+
+        self.loop.run_until_complete(go())
+
+    def test_pool_cache(self):
+        async def handler(request):
+            # each node answers with its own port
+            return web.json_response({"number": request.url.port})
+
+        async def go():
+            _, port_a, _ = await self.create_server(
+                "GET", "/blockchain/current", handler
+            )
+            # second node, serving the same routes on another port
+            port_b = find_unused_port()
+            await web.TCPSite(self.runner, "127.0.0.1", port_b).start()
+
+            cache = ResponseCache()
+            pool = ClientPool(cache=cache)
+            client_a = pool.client(BMAEndpoint("127.0.0.1", "", "", port_a))
+            client_b = pool.client(BMAEndpoint("127.0.0.1", "", "", port_b))
+            for _ in range(2):
+                self.assertEqual(
+                    await client_a.get("blockchain/current"), {"number": port_a}
+                )
+                self.assertEqual(
+                    await client_b.get("blockchain/current"), {"number": port_b}
+                )
+            self.assertEqual((cache.hits, cache.misses), (2, 2))
+            self.assertEqual(
+                cache.current_numbers,
+                {client_a.cache_namespace: port_a, client_b.cache_namespace: port_b},
+            )
+            await pool.close()
+
+        self.loop.run_until_complete(go())
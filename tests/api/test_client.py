@@ -0,0 +1,412 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import math
+import json
+import unittest
+from unittest import mock
+
+import jsonschema
+from aiohttp import ClientConnectorError
+
+from duniterpy.api import client as client_module
+from duniterpy.api.client import (
+    CircuitOpenError,
+    Client,
+    ClientPool,
+    RequestPolicy,
+    MultiClient,
+    NodeStats,
+    STRATEGY_FIRST,
+    STRATEGY_HEDGED,
+    STRATEGY_QUORUM,
+    RESPONSE_TEXT,
+    RESPONSE_AIOHTTP,
+    get_validator,
+    sample,
+    validate,
+    iter_json_array,
+)
+from duniterpy.api import bma
+from duniterpy.api.bma.blockchain import BLOCK_NUMBERS_SCHEMA
+from duniterpy.api.endpoint import BMAEndpoint
+from duniterpy.api.errors import HTTP_LIMITATION
+from tests.api.webserver import WebFunctionalSetupMixin, web, find_unused_port
+
+
+class TestClientPool(WebFunctionalSetupMixin, unittest.TestCase):
+    def test_client_pool(self):
+        peers = []
+
+        async def handler(request):
+            peers.append(request.transport.get_extra_info("peername"))
+            return web.json_response({"path": request.path})
+
+        async def go():
+            _, port, _ = await self.create_server("GET", "/node/{name}", handler)
+            pool = ClientPool(limit_per_host=1)
+            client = pool.client(BMAEndpoint("127.0.0.1", "", "", port))
+            self.assertIs(
+                pool.client("BASIC_MERKLED_API 127.0.0.1 {0}".format(port)), client
+            )
+            self.assertIsNot(
+                pool.client(BMAEndpoint("127.0.0.1", "", "", port + 1)), client
+            )
+            self.assertEqual(len(pool), 2)
+
+            api = client.api()
+            for name in ("summary", "sandboxes", "summary"):
+                response = await client.get("node/" + name)
+                self.assertEqual(response, {"path": "/node/" + name})
+            self.assertIs(client.api(), api)
+            # the connection is kept alive between the requests
+            self.assertEqual(len(set(peers)), 1)
+
+            # closing a pooled client keeps the shared session open
+            await client.close()
+            self.assertFalse(pool.session.closed)
+            await pool.close()
+            self.assertEqual(len(pool), 0)
+
+        self.loop.run_until_complete(go())
+
+    def test_session_loop_change(self):
+        pool = ClientPool()
+
+        async def get_session():
+            return pool.session
+
+        other_loop = asyncio.new_event_loop()
+        try:
+            session = other_loop.run_until_complete(get_session())
+            # a session of another loop is replaced, and closed in its loop
+            self.assertIsNot(self.loop.run_until_complete(get_session()), session)
+            self.assertFalse(session.closed)
+            other_loop.run_until_complete(asyncio.sleep(0))
+            self.assertTrue(session.closed)
+        finally:
+            other_loop.close()
+        self.loop.run_until_complete(pool.close())
+
+
+class TestClientResponse(WebFunctionalSetupMixin, unittest.TestCase):
+    def test_decode_once(self):
+        schema = {"type": "object", "required": ["version"]}
+
+        async def handler(request):
+            return web.json_response({"version": 11})
+
+        async def go():
+            _, port, _ = await self.create_server("GET", "/node/summary", handler)
+            pool = ClientPool()
+            client = pool.client(BMAEndpoint("127.0.0.1", "", "", port))
+            decoder = mock.Mock(side_effect=json.loads)
+            with mock.patch.object(client_module, "json_loads", decoder):
+                self.assertEqual(
+                    await client.get("node/summary", schema=schema), {"version": 11}
+                )
+                self.assertEqual(decoder.call_count, 1)
+
+                text = await client.get(
+                    "node/summary", rtype=RESPONSE_TEXT, schema=schema
+                )
+                self.assertEqual(json.loads(text), {"version": 11})
+
+                response = await client.get(
+                    "node/summary", rtype=RESPONSE_AIOHTTP, schema=schema
+                )
+                self.assertEqual(await response.json(), {"version": 11})
+
+            with self.assertRaises(jsonschema.ValidationError):
+                await client.get("node/summary", schema={"required": ["software"]})
+            await pool.close()
+
+        self.loop.run_until_complete(go())
+
+
+class TestValidation(unittest.TestCase):
+    def test_get_validator(self):
+        validator = get_validator(BLOCK_NUMBERS_SCHEMA)
+        self.assertIs(get_validator(BLOCK_NUMBERS_SCHEMA), validator)
+        with self.assertRaises(jsonschema.SchemaError):
+            get_validator({"type": 12})
+
+    def test_sample(self):
+        data = {"result": {"blocks": list(range(100))}, "nested": [[1, 2, 3]] * 20}
+        sampled = sample(data, 5)
+        self.assertEqual(sampled["result"]["blocks"], [0, 25, 50, 74, 99])
+        self.assertEqual(sampled["nested"], [[1, 2, 3]] * 5)
+        self.assertEqual(len(data["result"]["blocks"]), 100)
+        self.assertEqual(sample([1, 2, 3], 1), [1])
+
+    def test_validate_sample(self):
+        data = {"result": {"blocks": list(range(100))}}
+        data["result"]["blocks"][1] = "invalid"
+        with self.assertRaises(jsonschema.ValidationError):
+            validate(data, BLOCK_NUMBERS_SCHEMA)
+        # the invalid item is not in the sample
+        validate(data, BLOCK_NUMBERS_SCHEMA, 10)
+
+
+class TestJSONStream(WebFunctionalSetupMixin, unittest.TestCase):
+    def test_iter_json_array(self):
+        document = {
+            "skipped": {"a": [1, {"b": 'x]}"\\'}, "\u00e9"], "n": -1.5e3, "t": None},
+            "history": {
+                "sent": [{"hash": "A]", "amount": 12345}, "ü€", -0.25, [1, [2]], True],
+                "received": [],
+            },
+        }
+        body = json.dumps(document, ensure_ascii=False).encode("utf-8")
+
+        async def chunks(size):
+            for index in range(0, len(body), size):
+                yield body[index : index + size]
+
+        async def items(size, json_path):
+            return [item async for item in iter_json_array(chunks(size), json_path)]
+
+        async def go():
+            # split the document everywhere, in strings, numbers and utf-8 chars
+            for size in range(1, 20):
+                self.assertEqual(
+                    await items(size, ("history", "sent")), document["history"]["sent"]
+                )
+                self.assertEqual(await items(size, ("history", "received")), [])
+            with self.assertRaises(ValueError):
+                await items(7, ("history", "pending"))
+
+        self.loop.run_until_complete(go())
+
+    def test_client_stream(self):
+        tx = {
+            "version": 10,
+            "issuers": ["HnFcSms8jzwngtVomTTnzudZx7SHUQY8sVE1y8yBmULk"],
+            "inputs": [],
+            "outputs": [],
+            "comment": "",
+            "signatures": [],
+            "hash": "FC7BAC2D94AC9C16AFC5C0150C2C9E7FBB2E2A09",
+            "block_number": 173,
+            "time": 1421932545,
+        }
+
+        async def handler(request):
+            history = {"sent": [tx] * 3, "received": [{"version": 10}]}
+            return web.json_response({"currency": "g1", "history": history})
+
+        async def go():
+            _, port, _ = await self.create_server(
+                "GET", "/tx/history/{pubkey}", handler
+            )
+            pool = ClientPool()
+            client = pool.client(BMAEndpoint("127.0.0.1", "", "", port))
+            sent = [item async for item in client(bma.tx.iter_history, "pubkey")]
+            self.assertEqual(sent, [tx] * 3)
+            # items are validated one by one
+            with self.assertRaises(jsonschema.ValidationError):
+                async for _ in client(bma.tx.iter_history, "pubkey", "received"):
+                    pass
+            await pool.close()
+
+        self.loop.run_until_complete(go())
+
+
+class FakeClient(Client):
+    def __init__(self, name, delay, result=None, error=False):
+        self.name = name
+        self.delay = delay
+        self.result = name if result is None else result
+        self.error = error
+        self.calls = 0
+        self.close_session = False
+
+
+async def fake_request(client):
+    client.calls += 1
+    await asyncio.sleep(client.delay)
+    if client.error:
+        raise ValueError(client.name)
+    return client.result
+
+
+class TestMultiClient(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_first(self):
+        slow, fast, failing = (
+            FakeClient("slow", 0.2),
+            FakeClient("fast", 0.01),
+            FakeClient("failing", 0, error=True),
+        )
+        multi_client = MultiClient([slow, fast, failing], STRATEGY_FIRST)
+        self.assertEqual(
+            self.loop.run_until_complete(multi_client(fake_request)), "fast"
+        )
+        self.assertEqual(multi_client.stats[failing].failures, 1)
+        self.assertEqual(multi_client.ranked()[-1], failing)
+
+        multi_client = MultiClient([failing], STRATEGY_FIRST)
+        with self.assertRaises(ValueError):
+            self.loop.run_until_complete(multi_client(fake_request))
+
+    def test_hedged(self):
+        slow, fast = FakeClient("slow", 0.3), FakeClient("fast", 0.01)
+        multi_client = MultiClient([slow, fast], STRATEGY_HEDGED, hedge_delay=0.05)
+        # no statistics yet, the slow node is requested first then hedged
+        self.assertEqual(
+            self.loop.run_until_complete(multi_client(fake_request)), "fast"
+        )
+        self.assertEqual((slow.calls, fast.calls), (1, 1))
+        # the cancelled request of the slow node is not a latency sample
+        self.assertEqual(len(multi_client.stats[slow].latencies), 0)
+        self.assertEqual(multi_client.stats[slow].cancelled, 1)
+        # the fast node is now ranked first and answers before its hedge delay
+        self.assertEqual(multi_client.ranked(), [fast, slow])
+        self.assertEqual(
+            self.loop.run_until_complete(multi_client(fake_request)), "fast"
+        )
+        self.assertEqual((slow.calls, fast.calls), (1, 2))
+
+        # failing nodes are hedged at once
+        failing = FakeClient("failing", 0, error=True)
+        multi_client = MultiClient([failing, slow], STRATEGY_HEDGED, hedge_delay=10)
+        self.assertEqual(
+            self.loop.run_until_complete(multi_client(fake_request)), "slow"
+        )
+        self.assertEqual(multi_client.ranked(), [slow, failing])
+
+    def test_quorum(self):
+        clients = [
+            FakeClient("a", 0.01, result={"number": 1}),
+            FakeClient("b", 0.02, result={"number": 2}),
+            FakeClient("c", 0.03, result={"number": 1}),
+            FakeClient("d", 1, result={"number": 1}),
+        ]
+        multi_client = MultiClient(clients, STRATEGY_QUORUM, quorum=2)
+        self.assertEqual(
+            self.loop.run_until_complete(multi_client(fake_request)), {"number": 1}
+        )
+        self.assertEqual(clients[3].calls, 1)
+
+        multi_client = MultiClient(clients[:3], STRATEGY_QUORUM, quorum=3)
+        with self.assertRaises(ValueError):
+            self.loop.run_until_complete(multi_client(fake_request))
+
+        with self.assertRaises(ValueError):
+            MultiClient(clients, STRATEGY_QUORUM, quorum=3, quorum_size=2)
+
+    def test_node_stats(self):
+        stats = NodeStats(maxlen=4)
+        self.assertIsNone(stats.percentile(50))
+        self.assertEqual(stats.score(), (0, 0.0))
+        for latency in (0.5, 0.1, 0.2, 0.3, 0.4):
+            stats.record(latency)
+        self.assertEqual(stats.percentile(50), 0.2)
+        self.assertEqual(stats.percentile(95), 0.4)
+        stats.record_failure(1)
+        self.assertEqual(stats.score(), (1, 0.3))
+        stats.record(0.1)
+        self.assertEqual(stats.score(), (0, 0.3))
+
+        # nodes only cancelled come after the measured ones
+        stats = NodeStats()
+        stats.record_cancelled()
+        self.assertEqual(stats.score(), (0, math.inf))
+        stats.record(0.5)
+        self.assertEqual((stats.cancelled, stats.score()), (0, (0, 0.5)))
+
+
+class TestRequestPolicy(WebFunctionalSetupMixin, unittest.TestCase):
+    def test_retries(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(request.method)
+            if len(calls) < 3:
+                return web.json_response(
+                    {"ucode": HTTP_LIMITATION, "message": "Too many requests"},
+                    status=400,
+                )
+            return web.json_response({"version": 11})
+
+        async def slow_handler(request):
+            await asyncio.sleep(1)
+            return web.json_response({})
+
+        async def go():
+            self.app.router.add_route("POST", "/node/summary", handler)
+            self.app.router.add_route("GET", "/node/slow", slow_handler)
+            _, port, _ = await self.create_server("GET", "/node/summary", handler)
+            policy = RequestPolicy(retries=2, backoff_base=0.01, total_timeout=0.1)
+            client = Client(BMAEndpoint("127.0.0.1", "", "", port), policy=policy)
+
+            self.assertEqual(await client.get("node/summary"), {"version": 11})
+            self.assertEqual(len(calls), 3)
+
+            # POST requests are not retried
+            calls.clear()
+            response = await client.post("node/summary", rtype=RESPONSE_AIOHTTP)
+            self.assertEqual((response.status, calls), (400, ["POST"]))
+            response.release()
+
+            with self.assertRaises(asyncio.TimeoutError):
+                await client.get("node/slow")
+            await client.close()
+
+        self.loop.run_until_complete(go())
+
+    def test_circuit_breaker(self):
+        async def go():
+            policy = RequestPolicy(
+                retries=0, failure_threshold=2, recovery_timeout=0.05
+            )
+            # nothing listens on this port
+            client = Client(
+                BMAEndpoint("127.0.0.1", "", "", find_unused_port()), policy=policy
+            )
+            for _ in range(2):
+                with self.assertRaises(ClientConnectorError):
+                    await client.get("node/summary")
+            breaker = policy.breaker(client.api().node)
+            self.assertFalse(breaker.closed)
+            with self.assertRaises(CircuitOpenError):
+                await client.get("node/summary")
+
+            # a single trial request after the recovery timeout
+            await asyncio.sleep(0.05)
+            breaker.check()
+            with self.assertRaises(CircuitOpenError):
+                breaker.check()
+            breaker.success()
+            self.assertTrue(breaker.closed)
+            await client.close()
+
+        self.loop.run_until_complete(go())
+
+    def test_backoff(self):
+        policy = RequestPolicy(backoff_base=0.1, backoff_max=1)
+        for attempt, maximum in ((0, 0.1), (2, 0.4), (10, 1)):
+            delays = [policy.backoff(attempt) for _ in range(100)]
+            self.assertTrue(all(0 <= delay <= maximum for delay in delays))
+            self.assertGreater(len(set(delays)), 1)
@@ -15,10 +15,13 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import copy
+import pickle
 import unittest
 
-from duniterpy.documents.block import Block
+from duniterpy.documents.block import Block, MalformedSectionError
 from duniterpy.documents.block_uid import BlockUID, block_uid
+from duniterpy.documents.document import MalformedDocumentError, Memoized
 
 raw_block = """Version: 11
 Type: Block
@@ -245,6 +248,74 @@ Nonce: 137387
 GmgYhWrwCtsK7t2B/omPpxZ8EfJgv9UYzJIFo++Za+A0Mo70xRfZG7kywxbQTTxDk/V7r90P946N89vdVjv1Bg==
 """
 
+parsed_json_block_with_excluded = {
+    "version": 11,
+    "nonce": 137387,
+    "number": 33365,
+    "powMin": 76,
+    "time": 1472075456,
+    "medianTime": 1472072569,
+    "membersCount": 128,
+    "monetaryMass": 0,
+    "unitbase": 3,
+    "issuersCount": 9,
+    "issuersFrame": 50,
+    "issuersFrameVar": 0,
+    "currency": "test_net",
+    "issuer": "HnFcSms8jzwngtVomTTnzudZx7SHUQY8sVE1y8yBmULk",
+    "signature": "GmgYhWrwCtsK7t2B/omPpxZ8EfJgv9UYzJIFo++Za+A0Mo70xRfZG7kywxbQTTxDk/V7r90P946N89vdVjv1Bg==",
+    "hash": "0000C3AD8D4C3B2D8EF3A3DDEC88DCAA3FA8E7E9DB3A1C6DA7EE49E7D1C41BA6",
+    "parameters": "",
+    "previousHash": "0000338C775613399FA508A8F8B22EB60F525884730639E2A707299E373F43C0",
+    "previousIssuer": "DesHja7gonANRJB7YUkfCgQpnDjgGeDXAeArdhcbXPmJ",
+    "inner_hash": "EB2926354963AA21E99E4D304B7765811BA385C9A1976B9A5FACBBCB12F4C969",
+    "dividend": None,
+    "identities": [],
+    "joiners": [],
+    "actives": [],
+    "leavers": [],
+    "revoked": [
+        "2VAxjr8QoJtSzhE7APno4AkR2RAQNySpNNvDzMgPotSF:DGXpXwnxIP+j6fyLeaa8Toys9TN/fzumIrAslzAf+Tv50PTIrzBkxjE5oHGtI4AvytApW14rFWgWljmbtrVDAw=="
+    ],
+    "excluded": ["2VAxjr8QoJtSzhE7APno4AkR2RAQNySpNNvDzMgPotSF"],
+    "certifications": [],
+    "transactions": [
+        {
+            "version": 10,
+            "currency": "test_net",
+            "comment": "REMU:30244:30411",
+            "locktime": 0,
+            "blockstamp": "33363-000021C4B5BE2DA996F953DC09482F4FA2FA68774B1A38FAB03B2AAB4A08EBE0",
+            "issuers": ["TENGx7WtzFsTXwnbrPEvb6odX2WnqYcnnrjiiLvp1mS"],
+            "inputs": [
+                "5:0:T:D25272F1D778B52798B7A51CF0CE21F7C5812F841374508F4367872D4A47F0F7:0",
+                "6:1:T:D25272F1D778B52798B7A51CF0CE21F7C5812F841374508F4367872D4A47F0F7:1",
+                "7:2:T:D25272F1D778B52798B7A51CF0CE21F7C5812F841374508F4367872D4A47F0F7:2",
+                "2300962:3:T:D25272F1D778B52798B7A51CF0CE21F7C5812F841374508F4367872D4A47F0F7:10",
+            ],
+            "unlocks": ["0:SIG(0)", "1:SIG(0)", "2:SIG(0)", "3:SIG(0)"],
+            "outputs": [
+                "5:0:SIG(TENGx7WtzFsTXwnbrPEvb6odX2WnqYcnnrjiiLvp1mS)",
+                "6:1:SIG(TENGx7WtzFsTXwnbrPEvb6odX2WnqYcnnrjiiLvp1mS)",
+                "7:2:SIG(TENGx7WtzFsTXwnbrPEvb6odX2WnqYcnnrjiiLvp1mS)",
+                "10000:3:SIG(5ocqzyDMMWf1V8bsoNhWb1iNwax1e9M7VTUN6navs8of)",
+                "13000:3:SIG(XeBpJwRLkF5J4mnwyEDriEcNB13iFpe1MAKR4mH3fzN)",
+                "8000:3:SIG(9bZEATXBGPUSsk8oAYi4KAChg3rHKwNt67hVdErbNGCW)",
+                "2250:3:SIG(J78bPUvLjxmjaEkdjxWLeENQtcfXm7iobqB49uT1Bgp3)",
+                "4750:3:SIG(HnFcSms8jzwngtVomTTnzudZx7SHUQY8sVE1y8yBmULk)",
+                "3000:3:SIG(6KXBjAFceD1gp8RBVZfy5YQyKFXG8GaX8tKaLAyPWHrj)",
+                "500:3:SIG(ACkHkjDj1SPUu8LhtSAWJLRLoWEXWFuzFPL65zFbe7Yb)",
+                "500:3:SIG(5bxtdmC7RGGJEmcdnJ3ut5zg7KdUH2pYZepSHbwNYs7z)",
+                "2258962:3:SIG(TENGx7WtzFsTXwnbrPEvb6odX2WnqYcnnrjiiLvp1mS)",
+            ],
+            "signatures": [
+                "Yo5waBymzDRd0AAMPH8dBj/GnSjtCJUn4EKWaze/4CaU39lf7JAysYmc6yoQGSnGUKZwKT0P0/FvJr9kzX6RBA=="
+            ],
+            "time": None,
+        }
+    ],
+}
+
 negative_issuers_frame_var = """Version: 11
 Type: Block
 Currency: test_net
@@ -289,6 +360,10 @@ WnJvw204wccmSBQK9UE2rCFw0EG34zf+b58n2KTLwSIhTpgmGsnr5ohkSyYZYcLEKjisLXKNCmMl7D1Q
 """
 
 
+class MemoizedBlock(Memoized, Block):
+    pass
+
+
 class TestBlock(unittest.TestCase):
     def test_fromraw(self):
         block = Block.from_signed_raw(raw_block)
@@ -495,12 +570,66 @@ class TestBlock(unittest.TestCase):
         from_rendered_raw = block.from_signed_raw(rendered_raw)
         self.assertEqual(from_rendered_raw.signed_raw(), raw_block_with_excluded)
 
+    def test_from_parsed_json(self):
+        block = Block.from_parsed_json(parsed_json_block_with_excluded)
+        self.assertEqual(block.signed_raw(), raw_block_with_excluded)
+
     def test_parse_negative_issuers_frame_var(self):
         block = Block.from_signed_raw(negative_issuers_frame_var)
         rendered_raw = block.signed_raw()
         from_rendered_raw = block.from_signed_raw(rendered_raw)
         self.assertEqual(from_rendered_raw.signed_raw(), negative_issuers_frame_var)
 
+    def test_lazy_from_signed_raw(self):
+        block = Block.from_signed_raw(raw_block_with_tx, lazy=True)
+        self.assertEqual(block.number, 34436)
+        self.assertEqual(block.issuer, "HnFcSms8jzwngtVomTTnzudZx7SHUQY8sVE1y8yBmULk")
+        self.assertNotIn("transactions", block.__dict__)
+
+        self.assertEqual(len(block.transactions), 2)
+        self.assertIn("transactions", block.__dict__)
+        self.assertNotIn("certifications", block.__dict__)
+        self.assertEqual(block.signed_raw(), raw_block_with_tx)
+        self.assertEqual(
+            block.transactions, Block.from_signed_raw(raw_block_with_tx).transactions
+        )
+        with self.assertRaises(AttributeError):
+            block.unknown_attribute  # pylint: disable=pointless-statement
+
+    def test_lazy_from_signed_raw_error_on_access(self):
+        # a malformed inline document line is rejected up front
+        signed_raw = raw_block_with_tx.replace(":urodelus\n", "\n")
+        with self.assertRaises(MalformedDocumentError):
+            Block.from_signed_raw(signed_raw, lazy=True)
+
+        # the errors found when decoding a section are raised on first access
+        signed_raw = raw_block_with_tx.replace("5200:0:T:", "5200:0:X:", 1)
+        block = Block.from_signed_raw(signed_raw, lazy=True)
+        self.assertEqual(block.number, 34436)
+        self.assertFalse(hasattr(block, "transactions"))
+        self.assertIsNone(getattr(block, "transactions", None))
+        with self.assertRaises(MalformedSectionError):
+            block.transactions  # pylint: disable=pointless-statement
+        with self.assertRaises(MalformedDocumentError):
+            block.transactions  # pylint: disable=pointless-statement
+        self.assertEqual(len(block.actives), 1)
+
+    def test_lazy_from_signed_raw_version(self):
+        # a transaction version above the block version is rejected up front
+        signed_raw = raw_block_with_tx.replace("TX:10:", "TX:99:", 1)
+        self.assertNotEqual(signed_raw, raw_block_with_tx)
+        for lazy in (False, True):
+            with self.assertRaises(MalformedDocumentError):
+                Block.from_signed_raw(signed_raw, lazy)
+
+    def test_parse_line_outside_section(self):
+        signed_raw = raw_block.replace(
+            "Identities:\n",
+            "HnFcSms8jzwngtVomTTnzudZx7SHUQY8sVE1y8yBmULk\nIdentities:\n",
+        )
+        with self.assertRaises(MalformedDocumentError):
+            Block.from_signed_raw(signed_raw)
+
     def test_block_uid_converter(self):
         buid = block_uid(
             "1345-0000338C775613399FA508A8F8B22EB60F525884730639E2A707299E373F43C0"
@@ -570,6 +699,42 @@ AywstQpC0S5iaA/YQvbz2alpP6zTYG3tjkWpxy1jgeCo028Te2V327bBZbfDGDzsjxOrF4UVmEBiGsgb
             "00000A84839226046082E2B1AD49664E382D98C845644945D133D4A90408813A",
         )
 
+    def test_memoized(self):
+        block = MemoizedBlock.from_signed_raw(raw_block_with_tx)
+        self.assertIs(block.signed_raw(), block.signed_raw())
+        self.assertIs(block.sha_hash, block.sha_hash)
+        self.assertIs(block.blockUID, block.blockUID)
+        self.assertEqual(block, Block.from_signed_raw(raw_block_with_tx))
+        self.assertEqual(block.signed_raw(), raw_block_with_tx)
+        # plain documents are not memoized
+        plain_block = Block.from_signed_raw(raw_block_with_tx)
+        self.assertIsNot(plain_block.signed_raw(), plain_block.signed_raw())
+
+        # setting a field drops the results
+        proof_of_work = block.proof_of_work()
+        block.nonce += 1
+        self.assertNotEqual(block.proof_of_work(), proof_of_work)
+        self.assertNotEqual(block.signed_raw(), raw_block_with_tx)
+        block.signatures = ["signature"]
+        self.assertTrue(block.signed_raw().endswith("signature\n"))
+
+        # changes in place need invalidate()
+        raw = block.raw()
+        block.transactions.pop()
+        self.assertEqual(block.raw(), raw)
+        block.invalidate()
+        self.assertNotEqual(block.raw(), raw)
+
+        # copies have their own results
+        sha_hash = block.sha_hash
+        block_copy = copy.copy(block)
+        block_copy.nonce += 1
+        self.assertNotEqual(block_copy.sha_hash, sha_hash)
+        self.assertEqual(block.sha_hash, sha_hash)
+        block_load = pickle.loads(pickle.dumps(block))
+        self.assertNotIn("_memo", block_load.__dict__)
+        self.assertEqual(block_load.sha_hash, sha_hash)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -14,6 +14,8 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+import copy
+import pickle
 import unittest
 import pypeg2
 from duniterpy.grammars import output
@@ -365,6 +367,12 @@ class TestTransaction(unittest.TestCase):
             "2XiBDpuUdu6zCPWGzHXXy8c4ATSscfFQG9DjmqMZUxDZVt1Dp4m2N5oHYVUfoPdrU9SLk4qxi65RNrfCVnvQtQJk",
         )
 
+    def test_fromcompact_lines(self):
+        tx = Transaction.from_compact_lines(
+            "zeta_brousouf", tx_compact.splitlines(True)
+        )
+        self.assertEqual(tx, Transaction.from_compact("zeta_brousouf", tx_compact))
+
     def test_compact_change(self):
         tx = Transaction.from_compact("gtest", compact_change)
         rendered_tx = tx.signed_raw()
@@ -452,3 +460,26 @@ class TestTransaction(unittest.TestCase):
         unlock1 = Unlock(0, [SIGParameter(0)])
         unlock2 = Unlock.from_inline("0:SIG(0)")
         self.assertEqual(unlock1, unlock2)
+
+    def test_immutable_primitives(self):
+        primitives = [
+            InputSource.from_inline(input_source_str),
+            OutputSource.from_inline(output_source_str),
+            Unlock.from_inline("0:SIG(0) XHX(1)"),
+            SIGParameter(0),
+            BlockUID(
+                8979, "000041DF0CCA173F09B5FBA48F619D4BC934F12ADF1D0B798639EB2149C4A8CC"
+            ),
+        ]
+        for primitive in primitives:
+            self.assertFalse(hasattr(primitive, "__dict__"))
+            with self.assertRaises(AttributeError):
+                primitive.index = 1
+            self.assertEqual(hash(primitive), hash(primitive))
+            self.assertEqual(pickle.loads(pickle.dumps(primitive)), primitive)
+            self.assertEqual(copy.deepcopy(primitive), primitive)
+            self.assertEqual(
+                hash(pickle.loads(pickle.dumps(primitive))), hash(primitive)
+            )
+
+        self.assertEqual(len(set(primitives + copy.copy(primitives))), len(primitives))
@@ -19,7 +19,18 @@ import unittest
 
 import pypeg2
 
-from duniterpy.grammars.output import SIG, CLTV, CSV, XHX, Operator, Condition
+from duniterpy.grammars.output import (
+    SIG,
+    CLTV,
+    CSV,
+    XHX,
+    Operator,
+    Condition,
+    parse_condition,
+    compose_condition,
+    ConditionTable,
+    copy_condition,
+)
 
 pubkey = "DNann1Lh55eZMEDXeYt59bzHbA3NJR46DeQYCS2qQdLV"
 
@@ -162,3 +173,65 @@ class TestOutputgrammar(unittest.TestCase):
 
     def test_HXH_token_and_compose(self):
         self.assertEqual(XHX.token(pubkey).compose(), "XHX(" + pubkey + ")")
+
+    def test_parse_condition(self):
+        for condition in (
+            "SIG(HgTTJLAQ5sqfknMq7yLPZbehtuLSsKj9CxWN7k8QvYJd)",
+            "XHX(309BC5E644F797F53E5A2065EAF38A173437F2E6)",
+            "(SIG(DNann1Lh55eZMEDXeYt59bzHbA3NJR46DeQYCS2qQdLV) && CLTV(2594024))",
+            "(SIG(DNann1Lh55eZMEDXeYt59bzHbA3NJR46DeQYCS2qQdLV) || CSV(1654300))",
+            # nested conditions go through the pypeg2 grammar
+            "(CSV(1654300) || (SIG(DNann1Lh55eZMEDXeYt59bzHbA3NJR46DeQYCS2qQdLV) && CLTV(2594024)))",
+        ):
+            result = parse_condition(condition)
+            self.assertEqual(result, pypeg2.parse(condition, Condition))
+            self.assertEqual(compose_condition(result), condition)
+            self.assertEqual(pypeg2.compose(result, Condition), condition)
+
+    def test_parse_condition_error(self):
+        with self.assertRaises(SyntaxError):
+            parse_condition("SIG(HgTTJLAQ5sqfknMq7yLPZbehtuLSsKj9CxWN7k8QvYJd) ||")
+
+    def test_condition_table(self):
+        texts = [
+            "SIG(HgTTJLAQ5sqfknMq7yLPZbehtuLSsKj9CxWN7k8QvYJd)",
+            "(SIG(DNann1Lh55eZMEDXeYt59bzHbA3NJR46DeQYCS2qQdLV) && CLTV(2594024))",
+            "XHX(309BC5E644F797F53E5A2065EAF38A173437F2E6)",
+        ]
+        table = ConditionTable(maxsize=2)
+        condition = table.get(texts[0])
+        self.assertEqual(condition, parse_condition(texts[0]))
+        self.assertEqual(condition.composed, texts[0])
+        self.assertEqual(compose_condition(condition), texts[0])
+        self.assertIs(table.get(texts[0]), condition)
+
+        binary_condition = table.get(texts[1])
+        with self.assertRaises(AttributeError):
+            binary_condition.op = Operator("||")
+        with self.assertRaises(AttributeError):
+            binary_condition.left.pubkey = pubkey
+
+        # evicts the least recently used condition, texts[0]
+        table.get(texts[2])
+        self.assertEqual(len(table), 2)
+        self.assertIsNot(table.get(texts[0]), condition)
+        self.assertEqual((table.hits, table.misses), (1, 4))
+
+        with self.assertRaises(SyntaxError):
+            table.get("SIG(HgTTJLAQ5sqfknMq7yLPZbehtuLSsKj9CxWN7k8QvYJd) ||")
+        table.clear()
+        self.assertEqual((len(table), table.hits, table.misses), (0, 0, 0))
+
+    def test_mutable_conditions(self):
+        text = "(SIG(DNann1Lh55eZMEDXeYt59bzHbA3NJR46DeQYCS2qQdLV) && CLTV(2594024))"
+        condition = ConditionTable().get(text)
+        mutable_condition = copy_condition(condition)
+        self.assertEqual(mutable_condition, condition)
+        mutable_condition.op = Operator("||")
+        mutable_condition.left.pubkey = pubkey
+        self.assertEqual(compose_condition(condition), text)
+
+        # a disabled table returns a new mutable condition on each call
+        table = ConditionTable(maxsize=0)
+        self.assertIsNot(table.get(text), table.get(text))
+        table.get(text).op = Operator("||")
@@ -0,0 +1,119 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import hashlib
+from typing import Iterable, Optional, Sequence, Tuple
+
+from duniterpy.documents import (
+    Block,
+    BlockUID,
+    Certification,
+    Identity,
+    Membership,
+    Revocation,
+    Transaction,
+)
+from duniterpy.key.base58 import Base58Encoder
+
+# sigValidity 1000, sigQty 1, xpercent 0.8, stepMax 2
+PARAMETERS = (
+    "0.0488:86400:1000:432000:100:5259600:1000:1:5259600:5259600:0.8:31557600:2:24:300"
+    ":12:0.67:1488970800:1490094000:15778800"
+).split(":")
+
+# signatures are not checked by the helpers
+SIGNATURE = "A" * 86 + "=="
+
+
+def pubkey(name: str) -> str:
+    """
+    Return a public key made from name
+
+    :param name: Name of the member
+    :return:
+    """
+    return Base58Encoder.encode(hashlib.sha256(name.encode("utf-8")).digest())
+
+
+def block(
+    number: int,
+    mediantime: int = 0,
+    ud: Optional[int] = None,
+    parameters: Optional[Sequence[str]] = None,
+    members: Iterable[str] = (),
+    joiners: Iterable[str] = (),
+    certifications: Iterable[Tuple[str, str]] = (),
+    revoked: Iterable[str] = (),
+    excluded: Iterable[str] = (),
+    transactions: Iterable[Transaction] = (),
+    lazy: bool = False,
+) -> Block:
+    """
+    Return a Block instance parsed by Block.from_signed_raw from the signed raw
+    document of a block with these documents
+
+    :param number: Block number
+    :param mediantime: Median time of the block
+    :param ud: Universal dividend (optional)
+    :param parameters: Currency parameters of the root block, default PARAMETERS
+    :param members: Public keys of new members, with their identity and joiner
+    :param joiners: Public keys of joiners without identity in the block
+    :param certifications: (pubkey_from, pubkey_to) of the certifications
+    :param revoked: Public keys of the revoked identities
+    :param excluded: Public keys of the excluded members
+    :param transactions: Transaction instances
+    :param lazy: True to parse the sections on first access
+    :return:
+    """
+    members = list(members)
+    blockstamp = BlockUID.empty()
+    document = Block(
+        11,
+        "g1",
+        number,
+        1,
+        mediantime,
+        mediantime,
+        ud,
+        0,
+        pubkey("issuer"),
+        1,
+        0,
+        1,
+        "0" * 64 if number > 0 else None,
+        pubkey("issuer") if number > 0 else None,
+        (parameters or PARAMETERS) if number == 0 else None,
+        len(members),
+        [Identity(10, "g1", key, key[:8], blockstamp, SIGNATURE) for key in members],
+        [
+            Membership(10, "g1", key, blockstamp, "IN", key[:8], blockstamp, SIGNATURE)
+            for key in members + list(joiners)
+        ],
+        [],
+        [],
+        [Revocation(10, "g1", key, SIGNATURE) for key in revoked],
+        list(excluded),
+        [
+            Certification(10, "g1", pubkey_from, pubkey_to, blockstamp, SIGNATURE)
+            for pubkey_from, pubkey_to in certifications
+        ],
+        list(transactions),
+        "0" * 64,
+        0,
+        SIGNATURE,
+    )
+    return Block.from_signed_raw(document.signed_raw(), lazy)
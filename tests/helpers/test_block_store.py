@@ -0,0 +1,119 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import tempfile
+import unittest
+
+from duniterpy.api.client import Client
+from duniterpy.api.endpoint import BMAEndpoint
+from duniterpy.documents.block import Block
+from duniterpy.helpers.block_store import BlockStore, INDEX_FILENAME
+from tests.api.webserver import WebFunctionalSetupMixin, web
+from tests.documents.test_block import parsed_json_block_with_excluded
+
+
+def block_hash(number):
+    # the fixture blocks only differ by their number and nonce
+    return Block.proof_of_work_from_signed_raw(
+        Block.signed_raw_from_parsed_json(
+            dict(parsed_json_block_with_excluded, number=number, nonce=number)
+        )
+    )
+
+
+def parsed_json_block(number):
+    return dict(
+        parsed_json_block_with_excluded,
+        number=number,
+        nonce=number,
+        hash=block_hash(number),
+        previousHash=block_hash(number - 1),
+    )
+
+
+class TestBlockStore(WebFunctionalSetupMixin, unittest.TestCase):
+    def test_block_store(self):
+        with tempfile.TemporaryDirectory() as path:
+            with BlockStore(path) as store:
+                self.assertIsNone(store.current_number)
+                store.extend_parsed_json(parsed_json_block(n) for n in range(10, 20))
+                self.assertEqual((store.first_number, store.current_number), (10, 19))
+                with self.assertRaises(ValueError):
+                    store.extend_parsed_json([parsed_json_block(21)])
+                with self.assertRaises(ValueError):
+                    store.extend_parsed_json(
+                        [dict(parsed_json_block(20), previousHash="00" * 32)]
+                    )
+                # a hash not matching the block document is rejected
+                with self.assertRaises(ValueError):
+                    store.extend_parsed_json(
+                        [dict(parsed_json_block(20), hash=block_hash(21))]
+                    )
+                self.assertEqual(store.current_number, 19)
+
+            with BlockStore(path, readonly=True) as store:
+                self.assertEqual(len(store), 10)
+                block = store[15]
+                self.assertEqual(block, Block.from_parsed_json(parsed_json_block(15)))
+                self.assertEqual(store.hash(15), block_hash(15))
+                self.assertEqual(block.proof_of_work(), block_hash(15))
+                self.assertEqual(
+                    [block.number for block in store.blocks(17, lazy=True)],
+                    [17, 18, 19],
+                )
+                with self.assertRaises(KeyError):
+                    store.block(20)
+                block = store[18]
+
+            with BlockStore(path) as store:
+                store.truncate(18)
+                self.assertEqual(store.current_number, 17)
+                store.append(block)
+                self.assertEqual(store.hash(18), block.proof_of_work())
+                self.assertEqual(store.signed_raw(18), block.signed_raw())
+
+            # a partial index record written by an interrupted append is dropped
+            with open(os.path.join(path, INDEX_FILENAME), "ab") as index_file:
+                index_file.write(b"\x00" * 10)
+            with BlockStore(path) as store:
+                self.assertEqual(store.current_number, 18)
+                store.extend_parsed_json([parsed_json_block(19)])
+                self.assertEqual(store[19].number, 19)
+
+    def test_sync(self):
+        async def handler(request):
+            count = int(request.match_info["count"])
+            start = int(request.match_info["start"])
+            return web.json_response(
+                [parsed_json_block(number) for number in range(start, start + count)]
+            )
+
+        async def go():
+            _, port, _ = await self.create_server(
+                "GET", "/blockchain/blocks/{count}/{start}", handler
+            )
+            client = Client(BMAEndpoint("127.0.0.1", "", "", port))
+            with tempfile.TemporaryDirectory() as path:
+                with BlockStore(path) as store:
+                    store.extend_parsed_json([parsed_json_block(1)])
+                    await store.sync(client, 12, chunk_size=5)
+                    self.assertEqual(len(store), 12)
+                    self.assertEqual(store[12].number, 12)
+            await client.close()
+
+        self.loop.run_until_complete(go())
@@ -0,0 +1,94 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import unittest
+
+from duniterpy.api.client import Client
+from duniterpy.api.endpoint import BMAEndpoint
+from duniterpy.documents.block import Block
+from duniterpy.helpers.blockchain import (
+    BlockSummary,
+    RESULT_STRUCT,
+    RESULT_SUMMARY,
+    parse_blocks_parallel,
+    sync_blocks,
+)
+from tests.api.webserver import WebFunctionalSetupMixin, web
+from tests.documents.test_block import (
+    parsed_json_block_with_excluded,
+    raw_block,
+    raw_block_with_tx,
+    raw_block_zero,
+)
+
+
+class TestHelpersBlockchain(WebFunctionalSetupMixin, unittest.TestCase):
+    def test_sync_blocks(self):
+        in_flight = []
+        max_in_flight = []
+
+        async def handler(request):
+            count = int(request.match_info["count"])
+            start = int(request.match_info["start"])
+            in_flight.append(start)
+            max_in_flight.append(len(in_flight))
+            # answer the last windows first to check blocks are reordered
+            await asyncio.sleep(0.01 * (10 - start // count))
+            in_flight.remove(start)
+            return web.json_response(
+                [
+                    dict(parsed_json_block_with_excluded, number=number)
+                    for number in range(start, start + count)
+                ]
+            )
+
+        async def go():
+            _, port, _ = await self.create_server(
+                "GET", "/blockchain/blocks/{count}/{start}", handler
+            )
+            client = Client(BMAEndpoint("127.0.0.1", "", "", port))
+            numbers = [
+                block.number
+                async for block in sync_blocks(
+                    client, 3, 22, chunk_size=3, concurrency=3
+                )
+            ]
+            await client.close()
+            self.assertEqual(numbers, list(range(3, 23)))
+            self.assertLessEqual(max(max_in_flight), 3)
+
+        self.loop.run_until_complete(go())
+
+    def test_parse_blocks_parallel(self):
+        signed_raws = [raw_block_zero, raw_block, raw_block_with_tx] * 3
+        blocks = [Block.from_signed_raw(signed_raw) for signed_raw in signed_raws]
+        summaries = [BlockSummary.from_block(block) for block in blocks]
+        self.assertIsNone(summaries[0].previous_hash)
+        self.assertEqual(summaries[2].transactions_count, 2)
+
+        self.assertEqual(
+            list(parse_blocks_parallel(iter(signed_raws), 2, chunk_size=2)), blocks
+        )
+        for workers in (1, 2):
+            for result in (RESULT_SUMMARY, RESULT_STRUCT):
+                self.assertEqual(
+                    list(parse_blocks_parallel(signed_raws, workers, result, 4)),
+                    summaries,
+                )
+        with self.assertRaises(ValueError):
+            next(parse_blocks_parallel(signed_raws, result="dict"))
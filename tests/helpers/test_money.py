@@ -0,0 +1,140 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+from operator import eq, ne, lt, ge
+from duniterpy.helpers.money import output_available, SourceTable, _branch_and_bound
+from duniterpy.grammars.output import SIG, XHX, CLTV, CSV
+from duniterpy.documents.transaction import OutputSource, InputSource
+
+
+class TestHelpersMoney(unittest.TestCase):
+    def test_output_available(self):
+        """
+        Only tests for single condition without operators
+        """
+        # SIG
+        pubkey = "GB8iMAzq1DNmFe3ZxFTBQkGhq4fszTg1gZvx3XCkZXYH"
+        sig_condition = SIG.token(pubkey).compose()
+        condition = OutputSource.condition_from_text(sig_condition)
+
+        self.assertTrue(output_available(condition, eq, pubkey))
+        self.assertFalse(output_available(condition, ne, pubkey))
+
+        # XHX
+        sha_hash = "309BC5E644F797F53E5A2065EAF38A173437F2E6"
+        xhx_condition = XHX.token(sha_hash).compose()
+        condition = OutputSource.condition_from_text(xhx_condition)
+
+        self.assertTrue(output_available(condition, eq, sha_hash))
+        self.assertFalse(output_available(condition, ne, sha_hash))
+
+        # CSV
+        time = 1654300
+        csv_condition = CSV.token(time).compose()
+        condition = OutputSource.condition_from_text(csv_condition)
+
+        self.assertTrue(output_available(condition, ge, time))
+        self.assertFalse(output_available(condition, lt, time))
+
+        # CLTV
+        timestamp = 2594024
+        cltv_condition = CLTV.token(timestamp).compose()
+        condition = OutputSource.condition_from_text(cltv_condition)
+
+        self.assertTrue(output_available(condition, ge, timestamp))
+        self.assertFalse(output_available(condition, lt, timestamp))
+
+    def test_source_table(self):
+        pubkey = "GB8iMAzq1DNmFe3ZxFTBQkGhq4fszTg1gZvx3XCkZXYH"
+        tx_hash = "6991C993631BED4733972ED7538E41CCC33660F554E3C51963E2A0AC4D6453D3"
+        table = SourceTable.from_bma_sources(
+            [
+                {
+                    "type": "D",
+                    "noffset": 100,
+                    "identifier": pubkey,
+                    "amount": 1000,
+                    "base": 0,
+                },
+                {
+                    "type": "D",
+                    "noffset": 101,
+                    "identifier": pubkey,
+                    "amount": 100,
+                    "base": 1,
+                },
+                {
+                    "type": "T",
+                    "noffset": 0,
+                    "identifier": tx_hash,
+                    "amount": 300,
+                    "base": 0,
+                },
+                {
+                    "type": "T",
+                    "noffset": 1,
+                    "identifier": tx_hash,
+                    "amount": 250,
+                    "base": 0,
+                },
+            ]
+        )
+        self.assertEqual(len(table), 4)
+        self.assertEqual(table.identifiers_values, [pubkey, tx_hash])
+        self.assertEqual(table.values(), [1000, 1000, 300, 250])
+        self.assertEqual(table.total(), 2550)
+        self.assertEqual(table.total("D"), 2000)
+        self.assertEqual(table.total("T"), 550)
+        self.assertEqual(table.filter("T").total(), 550)
+        # the filtered table has its own interned identifiers
+        dividends = table.filter("D")
+        dividends.append(10, 0, "D", "other", 102)
+        self.assertEqual(table.identifiers_values, [pubkey, tx_hash])
+        self.assertNotIn("other", table._identifiers_indexes)
+        self.assertEqual(table.input_source(1), InputSource(100, 1, "D", pubkey, 101))
+
+        # largest sources first
+        self.assertEqual(
+            table.select(1200),
+            [
+                InputSource(1000, 0, "D", pubkey, 100),
+                InputSource(100, 1, "D", pubkey, 101),
+            ],
+        )
+        # least change
+        self.assertEqual(
+            table.select(1250, strategy="optimal"),
+            [
+                InputSource(1000, 0, "D", pubkey, 100),
+                InputSource(250, 0, "T", tx_hash, 1),
+            ],
+        )
+        self.assertEqual(len(table.select(155, 1, strategy="optimal")), 3)
+        with self.assertRaises(ValueError):
+            table.select(2000, max_inputs=1)
+        with self.assertRaises(ValueError):
+            table.select(2551)
+
+    def test_branch_and_bound(self):
+        # the exact sum is found
+        self.assertEqual(_branch_and_bound([50, 40, 30, 20, 5], 55, 3), [0, 4])
+        self.assertEqual(_branch_and_bound([50, 40, 30, 20, 5], 65, 3), [1, 3, 4])
+        # least change, within max_inputs
+        self.assertEqual(_branch_and_bound([50, 40, 30, 20], 58, 2), [1, 3])
+        self.assertEqual(_branch_and_bound([50, 40, 30], 58, 1), None)
+        self.assertIsNone(_branch_and_bound([5, 4], 10, 2))
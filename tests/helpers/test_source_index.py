@@ -0,0 +1,106 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+
+from duniterpy.documents import BlockUID
+from duniterpy.documents.transaction import (
+    InputSource,
+    OutputSource,
+    Transaction,
+    Unlock,
+)
+from duniterpy.helpers.source_index import SourceIndex, condition_pubkey
+from tests.helpers.blocks import block
+
+ALICE = "HnFcSms8jzwngtVomTTnzudZx7SHUQY8sVE1y8yBmULk"
+BOB = "8Fi1VSTbjkXguwThF4v2ZxC5whK7pwG2vcGTkPUPjPGU"
+
+
+def transaction(inputs, outputs):
+    return Transaction(
+        10,
+        "g1",
+        BlockUID.empty(),
+        0,
+        [ALICE],
+        inputs,
+        [Unlock.from_inline("{0}:SIG(0)".format(i)) for i in range(len(inputs))],
+        [OutputSource.from_inline(output) for output in outputs],
+        "",
+        ["signature"],
+    )
+
+
+class TestSourceIndex(unittest.TestCase):
+    def test_apply_and_rollback(self):
+        index = SourceIndex(max_rollback=2)
+        index.apply(block(0, joiners=[ALICE]))
+        index.apply(block(1, ud=100, joiners=[BOB]))
+        self.assertEqual((index.balance(ALICE), index.balance(BOB)), (100, 100))
+
+        ud_source = InputSource(100, 0, "D", ALICE, 1)
+        tx1 = transaction(
+            [ud_source],
+            ["30:0:SIG({0})".format(BOB), "70:0:SIG({0})".format(ALICE)],
+        )
+        change = InputSource(70, 0, "T", tx1.sha_hash, 1)
+        # the change is spent in the same block
+        tx2 = transaction(
+            [change],
+            ["7:1:(SIG({0}))".format(BOB), "0:0:SIG({0}) || XHX(00)".format(ALICE)],
+        )
+        # lazy blocks parse their sections when the index reads them
+        index.apply(
+            block(2, ud=100, excluded=[BOB], transactions=[tx1, tx2], lazy=True)
+        )
+        self.assertEqual(index.balance(ALICE), 100)
+        self.assertEqual(index.balance(BOB), 200)
+        self.assertEqual(len(index.pubkey_sources(BOB)), 3)
+        self.assertNotIn(ud_source, index)
+        self.assertEqual(
+            index.get(InputSource(30, 0, "T", tx1.sha_hash, 0)),
+            OutputSource.from_inline("30:0:SIG({0})".format(BOB)),
+        )
+        self.assertEqual(len(index), 5)
+        self.assertEqual(index.source_table(BOB).total(), 200)
+
+        with self.assertRaises(ValueError):
+            # ud source already spent
+            index.apply(block(3, transactions=[tx1]))
+        self.assertEqual(index.current_number, 2)
+        self.assertEqual(len(index), 5)
+
+        index.rollback()
+        self.assertEqual(index.current_number, 1)
+        self.assertEqual(index.members, {ALICE, BOB})
+        self.assertEqual((index.balance(ALICE), index.balance(BOB)), (100, 100))
+        self.assertIn(ud_source, index)
+        index.rollback()
+        self.assertEqual((len(index), index.members), (0, {ALICE}))
+        with self.assertRaises(ValueError):
+            index.rollback()
+
+    def test_condition_pubkey(self):
+        for text, pubkey in (
+            ("SIG({0})".format(ALICE), ALICE),
+            ("((SIG({0})))".format(ALICE), ALICE),
+            ("SIG({0}) && CSV(10)".format(ALICE), None),
+            ("XHX(00)", None),
+        ):
+            condition = OutputSource.condition_from_text(text)
+            self.assertEqual(condition_pubkey(condition), pubkey)
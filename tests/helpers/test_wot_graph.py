@@ -0,0 +1,82 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+
+from duniterpy.helpers.wot_graph import WotGraph
+from tests.helpers.blocks import PARAMETERS, block, pubkey
+
+A, B, C, D, E, F = (pubkey(name) for name in "abcdef")
+
+
+class TestWotGraph(unittest.TestCase):
+    def setUp(self):
+        # a ring a -> b -> c -> d -> a, with a and c certifying each other
+        self.graph = WotGraph()
+        self.graph.apply(
+            block(
+                0,
+                parameters=PARAMETERS,
+                members=[A, B, C, D],
+                certifications=[(A, B), (B, C), (C, D), (D, A), (A, C), (C, A)],
+            )
+        )
+
+    def test_graph(self):
+        graph = self.graph
+        self.assertEqual((graph.sig_validity, graph.step_max), (1000, 2))
+        self.assertEqual(graph.certifiers_of(C), {B: 1000, A: 1000})
+        self.assertEqual(graph.certified_by(C), {D: 1000, A: 1000})
+        # y_sentries = ceil(4 ** (1 / 2)) = 2
+        self.assertEqual(graph.y_sentries(), 2)
+        self.assertTrue(graph.is_sentry(A))
+        self.assertFalse(graph.is_sentry(B))
+        self.assertEqual(len(graph.sentries()), 2)
+
+        self.assertTrue(graph.reachable(A, D, 2))
+        self.assertFalse(graph.reachable(B, D, 1))
+        self.assertTrue(graph.reachable(B, D, 2))
+        self.assertFalse(graph.reachable(B, pubkey("z"), 5))
+
+    def test_distance(self):
+        graph = self.graph
+        # sentries a and c reach every member in 2 steps
+        self.assertFalse(graph.outdistanced(B))
+        # e is certified by d only, a reaches it in 3 steps
+        graph.certify(D, E, 1000)
+        self.assertTrue(graph.outdistanced(E))
+        self.assertFalse(graph.outdistanced(E, [A]))
+        self.assertEqual(
+            graph.requirements({E: [C], F: []}),
+            {E: (2, False), F: (0, True)},
+        )
+
+    def test_expiration(self):
+        graph = self.graph
+        # lazy blocks parse their sections when the graph reads them
+        graph.apply(block(1, 500, certifications=[(A, B)], lazy=True))
+        # the certification a -> b is renewed
+        expiring = graph.expiring(1001)
+        self.assertEqual(len(expiring), 5)
+        self.assertIn((1000, A, C), expiring)
+        self.assertNotIn((1000, A, B), expiring)
+        self.assertEqual(len(graph.expiring(2000)), 6)
+
+        graph.apply(block(2, 1200, excluded=[D], lazy=True))
+        self.assertEqual(graph.certifiers_of(B), {A: 1500})
+        self.assertEqual(graph.certified_by(A), {B: 1500})
+        self.assertEqual(graph.members_count(), 3)
@@ -0,0 +1,60 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+
+from duniterpy.key.base58 import Base58Encoder
+
+PUBKEY = "HnFcSms8jzwngtVomTTnzudZx7SHUQY8sVE1y8yBmULk"
+
+
+class TestBase58Encoder(unittest.TestCase):
+    def test_encode_decode(self):
+        for data, text in (
+            (b"", ""),
+            (b"\x00", "1"),
+            (b"\x00\x00\x01", "112"),
+            (b"hello world", "StV1DL6CwTryKyV"),
+            (b"\x00\xff" * 3, "1Vmf2KGA"),
+        ):
+            self.assertEqual(Base58Encoder.encode(data), text)
+            self.assertEqual(Base58Encoder.decode(text), data)
+        with self.assertRaises(ValueError):
+            Base58Encoder.decode("0OIl")
+
+    def test_pubkey(self):
+        key = Base58Encoder.decode(PUBKEY)
+        self.assertEqual(Base58Encoder.decode_pubkey(PUBKEY), key)
+        self.assertEqual(Base58Encoder.encode_pubkey(key), PUBKEY)
+        zero_key = b"\x00" * 2 + key[2:]
+        self.assertEqual(
+            Base58Encoder.decode_pubkey(Base58Encoder.encode(zero_key)), zero_key
+        )
+        for text in ("1" + PUBKEY, PUBKEY[:-3], PUBKEY + "1"):
+            with self.assertRaises(ValueError):
+                Base58Encoder.decode_pubkey(text)
+
+    def test_decode_many(self):
+        self.assertEqual(
+            Base58Encoder.decode_many([PUBKEY, PUBKEY]),
+            [Base58Encoder.decode(PUBKEY)] * 2,
+        )
+        self.assertEqual(
+            Base58Encoder.decode_many(["1", "2"], None), [b"\x00", b"\x01"]
+        )
+        with self.assertRaises(ValueError):
+            Base58Encoder.decode_many(["2", "11"], 1)
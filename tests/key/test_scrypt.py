@@ -0,0 +1,70 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import unittest
+
+from duniterpy.key.scrypt import ScryptCache, scrypt_seed, scrypt_seed_async
+from duniterpy.key.scrypt_params import ScryptParams
+
+# cheap parameters for the tests
+PARAMS = ScryptParams(16, 1, 1, 32)
+
+
+class TestScryptCache(unittest.TestCase):
+    def test_cache(self):
+        cache = ScryptCache(2)
+        seed = scrypt_seed(b"salt", b"password", PARAMS, cache)
+        self.assertEqual(scrypt_seed(b"salt", b"password", PARAMS, cache), seed)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        # the key depends on each part of the derivation
+        self.assertNotEqual(
+            cache.key(b"salt", b"password", PARAMS),
+            cache.key(b"saltp", b"assword", PARAMS),
+        )
+        long_seed = scrypt_seed(b"salt", b"password", ScryptParams(16, 1, 1, 64), cache)
+        self.assertEqual(long_seed[:32], seed)
+
+        stored = list(cache._values.values())
+        scrypt_seed(b"salt", b"other", PARAMS, cache)
+        self.assertEqual(len(cache), 2)
+        # the least recently used seed is evicted and zeroed
+        self.assertEqual(stored[0], bytearray(32))
+        self.assertIsNone(cache.lookup(cache.key(b"salt", b"password", PARAMS)))
+        # the seeds returned are copies
+        self.assertEqual(
+            seed, scrypt_seed(b"salt", b"password", PARAMS, ScryptCache(0))
+        )
+
+        cache.clear()
+        self.assertEqual(stored[1], bytearray(64))
+        self.assertEqual(len(cache), 0)
+
+    def test_async(self):
+        cache = ScryptCache()
+        seed = asyncio.new_event_loop().run_until_complete(
+            scrypt_seed_async(b"salt", b"password", PARAMS, cache=cache)
+        )
+        self.assertEqual(
+            seed, scrypt_seed(b"salt", b"password", PARAMS, ScryptCache(0))
+        )
+        self.assertEqual(len(cache), 1)
+
+    def test_disabled(self):
+        cache = ScryptCache(0)
+        scrypt_seed(b"salt", b"password", PARAMS, cache)
+        self.assertEqual(len(cache), 0)
@@ -15,9 +15,12 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import asyncio
 import os
+import tempfile
 
 from duniterpy.key import VerifyingKey, SigningKey, PublicKey
+from duniterpy.key.signing_key import FORMAT_WIF
 from duniterpy.key.scrypt_params import ScryptParams
 import unittest
 
@@ -46,6 +49,44 @@ class TestSigningKey(unittest.TestCase):
         verify_key = VerifyingKey(sign_key.pubkey)
         self.assertEqual(verify_key.vk, sign_key.vk)
 
+    def test_from_credentials_async(self):
+        async def go():
+            return await asyncio.gather(
+                SigningKey.from_credentials_async("alice", "password"),
+                SigningKey.from_credentials_async("bob", "password"),
+            )
+
+        alice, bob = asyncio.new_event_loop().run_until_complete(go())
+        self.assertEqual(alice.sk, SigningKey.from_credentials("alice", "password").sk)
+        self.assertNotEqual(alice.sk, bob.sk)
+
+    def test_bulk_from_credentials(self):
+        credentials = [("alice{0}".format(i), "password") for i in range(5)]
+        progress = []
+        sign_keys = list(
+            SigningKey.bulk_from_credentials(
+                iter(credentials), workers=2, progress=progress.append, chunk_size=2
+            )
+        )
+        self.assertEqual(
+            [sign_key.sk for sign_key in sign_keys],
+            [SigningKey.from_credentials(*c).sk for c in credentials],
+        )
+        self.assertEqual(progress, [2, 4, 5])
+        # stop early, the pending chunks are cancelled
+        keys = SigningKey.bulk_from_credentials(
+            iter(credentials), workers=2, chunk_size=1
+        )
+        self.assertEqual(next(keys).sk, sign_keys[0].sk)
+        keys.close()
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = SigningKey.bulk_save_files(sign_keys, directory, FORMAT_WIF)
+            self.assertEqual(len(os.listdir(directory)), 5)
+            self.assertEqual(SigningKey.from_wif_file(paths[3]).sk, sign_keys[3].sk)
+            with self.assertRaises(ValueError):
+                SigningKey.bulk_save_files(sign_keys, directory, "seedhex")
+
     def test_save_and_load_from_seedhex_file(self):
         sign_key_save = SigningKey.from_credentials("alice", "password", ScryptParams())
         sign_key_save.save_seedhex_file(TEST_FILE_PATH)
@@ -81,6 +122,41 @@ class TestSigningKey(unittest.TestCase):
         sign_key_load = SigningKey.from_ewif_file(TEST_FILE_PATH, "password")
         self.assertEqual(sign_key_save.sk, sign_key_load.sk)
 
+    def test_save_and_load_from_ewif_hex_async(self):
+        sign_key_save = SigningKey.from_credentials("alice", "password", ScryptParams())
+
+        async def go():
+            await sign_key_save.save_ewif_file_async(TEST_FILE_PATH, "password")
+            with open(TEST_FILE_PATH) as fh:
+                ewif_hex = fh.read().split("Data: ")[1]
+            return await SigningKey.from_ewif_hex_async(ewif_hex, "password")
+
+        sign_key_load = asyncio.new_event_loop().run_until_complete(go())
+        self.assertEqual(sign_key_save.sk, sign_key_load.sk)
+
+    def test_bulk_ewif(self):
+        sign_keys = [SigningKey.from_credentials(str(i), "password") for i in range(3)]
+        ewif_hexes = list(SigningKey.bulk_to_ewif_hex(sign_keys, "secret", workers=2))
+        sign_keys[1].save_ewif_file(TEST_FILE_PATH, "secret")
+        self.assertEqual(
+            SigningKey.from_ewif_file(TEST_FILE_PATH, "secret").sk, sign_keys[1].sk
+        )
+        self.assertEqual(
+            SigningKey.from_ewif_hex(ewif_hexes[1], "secret").sk, sign_keys[1].sk
+        )
+
+        progress = []
+        sign_keys_load = SigningKey.bulk_from_ewif_hex(
+            ewif_hexes, "secret", workers=1, progress=progress.append, chunk_size=2
+        )
+        self.assertEqual(
+            [sign_key.sk for sign_key in sign_keys_load],
+            [sign_key.sk for sign_key in sign_keys],
+        )
+        self.assertEqual(progress, [2, 3])
+        with self.assertRaises(Exception):
+            list(SigningKey.bulk_from_ewif_hex(ewif_hexes, "wrong", workers=1))
+
     def test_save_ewif_and_load_from_ewif_or_wif_file(self):
         sign_key_save = SigningKey.from_credentials("alice", "password", ScryptParams())
         sign_key_save.save_ewif_file(TEST_FILE_PATH, "password")
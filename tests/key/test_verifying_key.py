@@ -15,11 +15,14 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import base64
+
 from duniterpy.key import VerifyingKey, SigningKey
+from duniterpy.key.verifying_key import VerifyingKeyCache
 from duniterpy.key.scrypt_params import ScryptParams
 from duniterpy.documents.peer import Peer
 from duniterpy.documents.ws2p.heads import HeadV0, HeadV1, HeadV2
-from duniterpy.documents import Block
+from duniterpy.documents import Block, BlockUID, Identity
 from duniterpy.documents.transaction import Transaction
 import unittest
 
@@ -149,3 +152,102 @@ rgjOmzFH5h+hkDbJLk1b88X7Z83HMgTa5rBckeMSdF/yZtItN3zMn09MphcXjffdrKcK+MebwoisLJqV
         tx = Transaction.from_compact("g1", transaction_document)
         verifying_key = VerifyingKey(tx.issuers[0])
         self.assertTrue(verifying_key.verify_document(tx))
+
+    def test_verify_batch(self):
+        sign_key = SigningKey.from_credentials("alice", "password", ScryptParams())
+        messages = ["message {0}".format(index) for index in range(10)]
+        signed_items = [
+            (
+                sign_key.pubkey,
+                message,
+                base64.b64encode(sign_key.signature(message.encode("ascii"))).decode(
+                    "ascii"
+                ),
+            )
+            for message in messages
+        ]
+        # wrong message, wrong pubkey, malformed pubkey and malformed signature
+        signed_items[1] = (sign_key.pubkey, "forged", signed_items[1][2])
+        signed_items[3] = (
+            "8Fi1VSTbjkXguwThF4v2ZxC5whK7pwG2vcGTkPUPjPGU",
+            messages[3],
+            signed_items[3][2],
+        )
+        signed_items[5] = ("0OIl", messages[5], signed_items[5][2])
+        signed_items[7] = (sign_key.pubkey, messages[7], "c2lnbmF0dXJl")
+
+        results = VerifyingKey.verify_batch(signed_items, max_workers=3)
+        self.assertEqual(
+            results, [True, False, True, False, True, False, True, False, True, True]
+        )
+
+    def test_verify_documents(self):
+        sign_key = SigningKey.from_credentials("alice", "password", ScryptParams())
+        identities = []
+        for uid in ("alice", "bob", "carol"):
+            identity = Identity(10, "g1", sign_key.pubkey, uid, BlockUID.empty(), None)
+            identity.sign([sign_key])
+            identities.append(identity)
+        identities[1].uid = "mallory"
+
+        results = VerifyingKey.verify_documents(identities, max_workers=2)
+        self.assertEqual(results, [True, False, True])
+
+    def test_verify_documents_signatures_count(self):
+        alice = SigningKey.from_credentials("alice", "password", ScryptParams())
+        bob = SigningKey.from_credentials("bob", "password", ScryptParams())
+        tx = Transaction(
+            10,
+            "g1",
+            BlockUID.empty(),
+            0,
+            [alice.pubkey, bob.pubkey],
+            [],
+            [],
+            [],
+            "",
+            [],
+        )
+        tx.sign([alice, bob])
+        self.assertEqual(VerifyingKey.verify_documents([tx]), [True])
+
+        # a signature is missing
+        tx.sign([alice])
+        self.assertEqual(VerifyingKey.verify_documents([tx]), [False])
+
+        # an extra signature
+        identity = Identity(10, "g1", alice.pubkey, "alice", BlockUID.empty(), None)
+        identity.sign([alice, alice])
+        self.assertEqual(VerifyingKey.verify_documents([identity]), [False])
+
+    def test_for_pubkey(self):
+        pubkey = "8Fi1VSTbjkXguwThF4v2ZxC5whK7pwG2vcGTkPUPjPGU"
+        verifying_key = VerifyingKey.for_pubkey(pubkey)
+        self.assertIs(VerifyingKey.for_pubkey(pubkey), verifying_key)
+        self.assertEqual(verifying_key.vk, VerifyingKey(pubkey).vk)
+
+    def test_verifying_key_cache(self):
+        pubkeys = [
+            "8Fi1VSTbjkXguwThF4v2ZxC5whK7pwG2vcGTkPUPjPGU",
+            "HnFcSms8jzwngtVomTTnzudZx7SHUQY8sVE1y8yBmULk",
+            "BMAVuMDcGhYAV4wA27DL1VXX2ZARZGJYaMwpf7DJFMYH",
+        ]
+        cache = VerifyingKeyCache(maxsize=2)
+        first_key = cache.get(pubkeys[0])
+        cache.get(pubkeys[1])
+        self.assertIs(cache.get(pubkeys[0]), first_key)
+        # evicts the least recently used key, pubkeys[1]
+        cache.get(pubkeys[2])
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.get(pubkeys[0]), first_key)
+        cache.get(pubkeys[1])
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+        cache.resize(1)
+        self.assertEqual(len(cache), 1)
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+
+        cache.resize(0)
+        cache.get(pubkeys[0])
+        self.assertEqual(len(cache), 0)
@@ -0,0 +1,58 @@
+"""
+Copyright  2014-2020 Vincent Texier <vit@free.fr>
+
+DuniterPy is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+DuniterPy is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+
+from duniterpy.tools import LRUCache, map_chunks, xor_bytes
+
+
+class TestTools(unittest.TestCase):
+    def test_xor_bytes(self):
+        self.assertEqual(xor_bytes(b"\x0f\xf0\x00", b"\xff\xff\x01"), b"\xf0\x0f\x01")
+        # the result has the length of the shortest argument
+        self.assertEqual(
+            xor_bytes(b"\x01\x02\x03", b"\x01\x01"), bytearray(b"\x00\x03")
+        )
+        self.assertEqual(xor_bytes(b"", b"\x01"), bytearray())
+        self.assertIsInstance(xor_bytes(b"\x01", b"\x01"), bytearray)
+
+    def test_lru_cache(self):
+        cache = LRUCache(str, maxsize=2)
+        self.assertEqual(cache.get(1), "1")
+        self.assertIs(cache.get(2), cache.get(2))
+        self.assertIsNone(cache.lookup(3))
+        cache.set(3, "three")
+        # the least recently used value, 1, is evicted
+        self.assertEqual((len(cache), cache.lookup(1)), (2, None))
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+        cache.resize(1)
+        self.assertEqual(cache.lookup(3), "three")
+        cache.resize(0)
+        cache.set(4, "four")
+        self.assertEqual(len(cache), 0)
+        cache.clear()
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+
+    def test_map_chunks(self):
+        for workers in (1, 2):
+            items = range(7)
+            chunks = list(map_chunks(sum, items, workers, chunk_size=3))
+            self.assertEqual(chunks, [([0, 1, 2], 3), ([3, 4, 5], 12), ([6], 6)])
+        chunks = list(map_chunks(len, iter("abcde"), 1, chunk_size=2, prepare="".join))
+        self.assertEqual(chunks, [(["a", "b"], 2), (["c", "d"], 2), (["e"], 1)])
+        with self.assertRaises(ValueError):
+            list(map_chunks(sum, items, chunk_size=0))